@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the TMA LaTeX Generator core.
+
+Runs ``python -X importtime -c "import tma_generator"`` in fresh
+interpreters and checks the median cumulative import time of the package
+against a regression budget. It also checks that importing the core never
+pulls in tkinter.
+
+Usage:
+    python benchmarks/import_time.py [--runs N] [--budget-ms MS]
+
+Exits non-zero if the budget is exceeded or tkinter is imported.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Cold-start budget for "import tma_generator", in milliseconds
+DEFAULT_BUDGET_MS = 50.0
+DEFAULT_RUNS = 7
+
+# Modules that must never be imported by the generation core
+FORBIDDEN_MODULES = ("tkinter", "_tkinter")
+
+
+def measure_import(module: str) -> Dict[str, int]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+    
+    Args:
+        module: Module name to import
+    
+    Returns:
+        Mapping of imported module name to cumulative import time in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    
+    timings = {}
+    for line in result.stderr.splitlines():
+        # Format: "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def main() -> int:
+    """Run the benchmark and report against the budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args()
+    
+    samples = []
+    for _ in range(args.runs):
+        timings = measure_import("tma_generator")
+        imported = set(timings)
+        forbidden = [name for name in FORBIDDEN_MODULES if name in imported]
+        if forbidden:
+            print(f"FAIL: importing tma_generator loaded {', '.join(forbidden)}")
+            return 1
+        samples.append(timings["tma_generator"] / 1000)
+    
+    median_ms = statistics.median(samples)
+    print(f"import tma_generator: median {median_ms:.1f} ms over {args.runs} runs "
+          f"(min {min(samples):.1f} ms, budget {args.budget_ms:.1f} ms)")
+    
+    if median_ms > args.budget_ms:
+        print("FAIL: import time budget exceeded")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Filesystem operation budget for a generation run.
+
+Generates a sample project into a temporary directory with I/O accounting
+enabled and checks the counts against upper bounds: at most one open per
+generated file, no stat calls while writing, and no renames for a fresh
+output directory. Prints the full per-phase statistics as JSON.
+
+Usage:
+    python benchmarks/io_budget.py [--questions N] [--parts N] [--subparts N]
+
+Exits non-zero if any budget is exceeded.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tma_generator.batch import ManifestLoader  # noqa: E402
+from tma_generator.core import DEFAULT_CONFIG, LaTeXFileGenerator  # noqa: E402
+from tma_generator.iostats import (  # noqa: E402
+    OP_OPEN, OP_RENAME, OP_STAT, IOStats
+)
+
+
+def main() -> int:
+    """Run the budget check."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--parts", type=int, default=4)
+    parser.add_argument("--subparts", type=int, default=3)
+    args = parser.parse_args()
+    
+    parts = [chr(ord('a') + i) for i in range(args.parts)]
+    subparts = ",".join(str(i) for i in range(1, args.subparts + 1))
+    questions = [
+        {"marks": 10, "parts": parts, "subparts": f"{parts[0]}:{subparts}"}
+        for _ in range(args.questions)
+    ]
+    structure = ManifestLoader.build_structure(questions)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = dict(DEFAULT_CONFIG, output=os.path.join(temp_dir, "project"))
+        io_stats = IOStats()
+        generator = LaTeXFileGenerator(config, fs=io_stats)
+        generator.generate_project(structure)
+        files = generator.files_written
+    
+    print(io_stats.to_json())
+    print(f"{files} files generated")
+    
+    checks = [
+        (OP_OPEN, files, "write"),
+        (OP_STAT, 0, "write"),
+        (OP_RENAME, 0, None),
+    ]
+    failed = False
+    for op, limit, phase in checks:
+        try:
+            io_stats.assert_at_most(op, limit, phase)
+        except AssertionError as error:
+            print(f"FAIL: {error}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Preamble format benchmark for the TMA LaTeX Generator.
+
+Generates the same sample project twice, once as usual and once with a
+precompiled preamble format (%&tma-preamble on the first line of the main
+file), compiles each several times with the engine directly, and reports
+the median compile times and the saving. The one-off cost of building the
+format is reported separately; it is paid once per style version and
+engine, not once per project.
+
+Usage:
+    python benchmarks/preamble_format.py [--engine ENGINE] [--runs N] [--min-saving S]
+
+Needs a local TeX installation with the mylatexformat package. Exits 0
+with a message if the engine is not installed, and non-zero if either
+project fails to compile or the median saving is below --min-saving
+(a fraction, default 0.3).
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tma_generator.batch import ManifestLoader  # noqa: E402
+from tma_generator.compile import ENGINE_PDFLATEX, ENGINES, ProjectCompiler  # noqa: E402
+from tma_generator.core import DEFAULT_CONFIG, LaTeXFileGenerator  # noqa: E402
+from tma_generator.formats import FormatCache  # noqa: E402
+
+DEFAULT_RUNS = 5
+DEFAULT_MIN_SAVING = 0.3
+
+
+def time_compiles(compiler: ProjectCompiler, folder: str, runs: int) -> float:
+    """
+    Compile a project several times.
+    
+    Args:
+        compiler: Compiler to use
+        folder: Project folder
+        runs: Number of compiles
+    
+    Returns:
+        Median compile time in seconds
+    
+    Raises:
+        RuntimeError: If a compile fails
+    """
+    times = []
+    for _ in range(runs):
+        result = compiler.compile(folder, DEFAULT_CONFIG["basename"])
+        if not result.ok:
+            raise RuntimeError(f"{folder} failed to compile: {result.error}")
+        times.append(result.seconds)
+    return statistics.median(times)
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--engine", choices=ENGINES, default=ENGINE_PDFLATEX)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--min-saving", type=float, default=DEFAULT_MIN_SAVING)
+    args = parser.parse_args()
+    
+    if shutil.which(args.engine) is None:
+        print(f"{args.engine} is not installed; nothing to benchmark")
+        return 0
+    
+    structure = ManifestLoader.build_structure([
+        {"marks": 25, "parts": "a,b,c,d", "subparts": "a:i,ii"} for _ in range(4)
+    ])
+    compiler = ProjectCompiler(engine=args.engine, use_latexmk=False)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        plain = os.path.join(temp_dir, "plain")
+        LaTeXFileGenerator(dict(DEFAULT_CONFIG, output=plain)).generate_project(structure)
+        
+        formats = FormatCache(args.engine, directory=os.path.join(temp_dir, "formats"))
+        start_time = time.perf_counter()
+        precompiled = os.path.join(temp_dir, "precompiled")
+        try:
+            LaTeXFileGenerator(
+                dict(DEFAULT_CONFIG, output=precompiled), formats=formats
+            ).generate_project(structure)
+        except Exception as error:
+            print(error)
+            return 1
+        build_seconds = time.perf_counter() - start_time
+        
+        try:
+            plain_seconds = time_compiles(compiler, plain, args.runs)
+            format_seconds = time_compiles(compiler, precompiled, args.runs)
+        except RuntimeError as error:
+            print(error)
+            return 1
+    
+    saving = 1 - format_seconds / plain_seconds
+    print(f"Format build (once): {build_seconds:.2f}s")
+    print(f"Median compile, full preamble:  {plain_seconds:.2f}s")
+    print(f"Median compile, precompiled:    {format_seconds:.2f}s")
+    print(f"Saving per compile: {plain_seconds - format_seconds:.2f}s ({saving:.0%})")
+    
+    if saving < args.min_saving:
+        print(f"FAIL: saving below {args.min_saving:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
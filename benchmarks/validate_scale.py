@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Validation scaling benchmark for the TMA LaTeX Generator.
+
+Validates a synthetic structure of 10,000 questions with 10 parts each
+(100,000 parts, a quarter of them with subparts), then the same structure
+at a tenth of the size, and checks that validation time grows roughly
+linearly. A structure with errors in every question is also validated to
+check that collecting every error stays linear too.
+
+Usage:
+    python benchmarks/validate_scale.py [--questions N] [--parts N] [--max-ratio R]
+
+Exits non-zero if the time per part at full size exceeds the small-size
+time per part by more than --max-ratio.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tma_generator.validation import StructureValidator  # noqa: E402
+
+DEFAULT_QUESTIONS = 10000
+DEFAULT_PARTS = 10
+DEFAULT_RUNS = 3
+
+# Allowed growth of the per-part cost between the small and full sizes
+DEFAULT_MAX_RATIO = 2.0
+
+
+def make_questions(questions: int, parts: int, broken: bool = False) -> List[Tuple[str, str, str]]:
+    """
+    Build raw GUI-style input for a synthetic structure.
+    
+    Args:
+        questions: Number of questions
+        parts: Parts per question
+        broken: Give every question a duplicate part and a bad subpart reference
+    
+    Returns:
+        Raw (marks, parts, subparts) for each question
+    """
+    names = [f"p{index}" for index in range(parts)]
+    if broken:
+        names.append(names[0].upper())
+    parts_text = ",".join(names)
+    subparts_text = ";".join(f"{name}:i,ii,iii" for name in names[:max(1, parts // 4)])
+    if broken:
+        subparts_text += ";missing:i"
+    return [("5", parts_text, subparts_text) for _ in range(questions)]
+
+
+def time_validation(raw_questions: List[Tuple[str, str, str]], runs: int) -> Tuple[float, int]:
+    """
+    Validate a structure several times.
+    
+    Args:
+        raw_questions: Raw input for each question
+        runs: Number of runs
+    
+    Returns:
+        Best time in seconds and the number of issues found
+    """
+    validator = StructureValidator()
+    best = float("inf")
+    issues = 0
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        report = validator.validate(raw_questions)
+        best = min(best, time.perf_counter() - start_time)
+        issues = len(report.issues)
+    return best, issues
+
+
+def main() -> int:
+    """Run the benchmark and report the scaling ratio."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=DEFAULT_QUESTIONS)
+    parser.add_argument("--parts", type=int, default=DEFAULT_PARTS)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--max-ratio", type=float, default=DEFAULT_MAX_RATIO)
+    args = parser.parse_args()
+    
+    failed = False
+    for broken in (False, True):
+        label = "invalid" if broken else "valid"
+        small, _ = time_validation(make_questions(args.questions // 10, args.parts, broken), args.runs)
+        full, issues = time_validation(make_questions(args.questions, args.parts, broken), args.runs)
+        total_parts = args.questions * args.parts
+        ratio = (full / 10) / small if small else 0.0
+        print(f"{label}: {args.questions} questions, {total_parts} parts in {full:.3f}s "
+              f"({total_parts / full:.0f} parts/sec, {issues} issues); "
+              f"per-part cost x{ratio:.2f} vs {args.questions // 10} questions")
+        if ratio > args.max_ratio:
+            print(f"FAIL: {label} validation does not scale linearly")
+            failed = True
+    
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Tests for the live project preview's per-question cache.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from tma_generator.core import DEFAULT_CONFIG, LaTeXFileGenerator
+from tma_generator.preview import ProjectPreview
+from tma_generator.structure import Question
+from tma_generator.templates import _bundled_source
+
+
+class ProjectPreviewCacheTest(unittest.TestCase):
+    """Cached question files must match a fresh render after settings change."""
+    
+    def setUp(self) -> None:
+        """Create a template directory whose part.tex uses {{course}}."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        part_source = _bundled_source("part").rstrip("\n") + "\n% course {{course}}\n"
+        Path(self.directory.name, "part.tex").write_text(part_source, encoding='utf-8')
+        
+        self.config = dict(
+            DEFAULT_CONFIG, course="M208", templates=self.directory.name,
+            output=str(Path(self.directory.name, "out"))
+        )
+        self.question = Question.parse(1, 100, "a,b", "a:i,ii")
+    
+    def question_files(self, preview: ProjectPreview, config: dict) -> dict:
+        """Render the preview with a configuration and return question 1's files."""
+        preview.render(config, [self.question])
+        return {entry.path: entry.data for entry in preview.question(self.question).entries}
+    
+    def expected_files(self, config: dict) -> dict:
+        """Render question 1 directly, without any cache."""
+        return {
+            entry.path: entry.data
+            for entry in LaTeXFileGenerator(config).render_question(self.question)
+        }
+    
+    def test_setting_used_by_question_template_refreshes_cache(self) -> None:
+        preview = ProjectPreview()
+        self.assertIn(b"% course M208", self.question_files(preview, self.config)["q1a.tex"])
+        
+        changed = dict(self.config, course="MST210")
+        files = self.question_files(preview, changed)
+        self.assertIn(b"% course MST210", files["q1a.tex"])
+        self.assertEqual(files, self.expected_files(changed))
+    
+    def test_setting_unused_by_question_templates_keeps_cache(self) -> None:
+        preview = ProjectPreview()
+        self.question_files(preview, self.config)
+        rendered = preview.rendered
+        
+        changed = dict(self.config, name="Someone Else")
+        self.assertEqual(self.question_files(preview, changed), self.expected_files(changed))
+        self.assertEqual(preview.rendered, rendered)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+TMA LaTeX Generator.
+
+Creates structured LaTeX files for academic TMA assignments. The package
+root only exposes the generation core; the tkinter interface lives in
+tma_generator.gui and is imported on demand by tma_generator.cli.main().
+
+Author: Generated for academic TMA workflow
+Version: 2.0
+Licence: MIT
+"""
+
+from .core import (
+    CONFIG_FILE,
+    DEFAULT_CONFIG,
+    MAIN_TEX_PROGRAM,
+    QUESTION_PREFIX,
+    TEX_EXTENSION,
+    ConfigManager,
+    LaTeXFileGenerator,
+)
+from .structure import Part, Question, Structure, parse_subparts_string
+
+__version__ = "2.0"
+
+__all__ = [
+    "CONFIG_FILE",
+    "DEFAULT_CONFIG",
+    "MAIN_TEX_PROGRAM",
+    "QUESTION_PREFIX",
+    "TEX_EXTENSION",
+    "ConfigManager",
+    "LaTeXFileGenerator",
+    "Part",
+    "Question",
+    "Structure",
+    "parse_subparts_string",
+]
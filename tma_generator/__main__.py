@@ -0,0 +1,5 @@
+"""Allow ``python -m tma_generator``."""
+
+from .cli import main
+
+main()
@@ -0,0 +1,574 @@
+"""
+Headless batch generation for the TMA LaTeX Generator.
+
+Loads generation jobs from a JSON manifest and drives LaTeXFileGenerator
+directly, without any GUI.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .compile import run_compile_stage
+from .core import DEFAULT_CONFIG, LaTeXFileGenerator
+from .formats import FormatCache
+from .iostats import IOStats
+from .log import LOG_FORMAT_TEXT, LogSink, StreamLogSink, make_log_sink
+from .spec import SpecCache, SpecLoader
+from .store import BlobStore, dedup_ratio
+from .structure import Structure
+from .styles import StyleCache
+from .validation import SEVERITY_ERROR, Issue, StructureValidator, ValidationReport
+
+
+class ManifestLoader:
+    """
+    Load headless generation jobs from a JSON manifest.
+    
+    A manifest holds shared defaults and a shared question structure, plus a
+    list of jobs that may override either of them::
+    
+        {
+          "defaults": {"course": "MATH101", "tma_ref": "04"},
+          "structure": [{"marks": 25, "parts": "a,b,c,d", "subparts": "a:i,ii"}],
+          "jobs": [{"config": {"name": "Alex Taylor", "pin": "S1234567",
+                               "output": "./out/S1234567"}}]
+        }
+    
+    Parts may be given as "a,b,c" or as a list; subparts as "a:i,ii;c:1,2"
+    or as a mapping of part to list of subparts. Instead of a list of
+    questions, "structure" may name a JSON, TOML or YAML spec file, relative
+    to the manifest (see tma_generator.spec).
+    """
+    
+    @staticmethod
+    def read(manifest_path: str) -> List[Tuple[Dict[str, str], Union[str, List[Dict]]]]:
+        """
+        Read every job in a manifest file without building its structure.
+        
+        Args:
+            manifest_path: Path to the JSON manifest
+            
+        Returns:
+            List of (config, questions) tuples, one per job, where questions
+            is a list of question mappings or the path of a spec file
+            
+        Raises:
+            ValueError: If the manifest is malformed
+        """
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as file:
+                manifest = json.load(file)
+        except (json.JSONDecodeError, IOError) as error:
+            raise ValueError(f"Could not read manifest {manifest_path}: {error}")
+        
+        if not isinstance(manifest, dict):
+            raise ValueError("Manifest must be a JSON object")
+        
+        if not isinstance(manifest.get("defaults", {}), dict):
+            raise ValueError("Manifest 'defaults' must be an object")
+        defaults = DEFAULT_CONFIG.copy()
+        defaults.update(manifest.get("defaults", {}))
+        shared_questions = manifest.get("structure")
+        
+        # A manifest without a job list describes a single job
+        raw_jobs = manifest.get("jobs", [{}])
+        if not isinstance(raw_jobs, list) or not raw_jobs:
+            raise ValueError("Manifest 'jobs' must be a non-empty list")
+        
+        jobs = []
+        for index, raw_job in enumerate(raw_jobs, start=1):
+            if not isinstance(raw_job, dict):
+                raise ValueError(f"Job {index}: must be an object")
+            if not isinstance(raw_job.get("config", {}), dict):
+                raise ValueError(f"Job {index}: 'config' must be an object")
+            config = defaults.copy()
+            config.update(raw_job.get("config", {}))
+            config = {key: str(value) for key, value in config.items()}
+            
+            questions = raw_job.get("structure", shared_questions)
+            if not questions:
+                raise ValueError(f"Job {index}: No questions specified")
+            if not isinstance(questions, (str, list)):
+                raise ValueError(
+                    f"Job {index}: 'structure' must be a list of questions or the path of a spec file"
+                )
+            if isinstance(questions, str):
+                questions = str(Path(manifest_path).parent / questions)
+            jobs.append((config, questions))
+        
+        return jobs
+    
+    @staticmethod
+    def load(
+        manifest_path: str,
+        spec_cache: Optional[SpecCache] = None
+    ) -> List[Tuple[Dict[str, str], Structure]]:
+        """
+        Load and normalise every job in a manifest file.
+        
+        Each spec file is loaded once however many jobs use it.
+        
+        Args:
+            manifest_path: Path to the JSON manifest
+            spec_cache: Parse cache for spec files (default: the user cache directory)
+            
+        Returns:
+            List of (config, structure) tuples, one per job
+            
+        Raises:
+            ValueError: If the manifest is malformed
+        """
+        if spec_cache is None:
+            spec_cache = SpecCache()
+        specs: Dict[str, Structure] = {}
+        
+        jobs = []
+        for index, (config, questions) in enumerate(ManifestLoader.read(manifest_path), start=1):
+            try:
+                if isinstance(questions, str):
+                    spec_path = questions
+                    if spec_path not in specs:
+                        specs[spec_path] = SpecLoader.load(spec_path, cache=spec_cache)
+                    structure = specs[spec_path]
+                else:
+                    structure = ManifestLoader.build_structure(questions)
+            except ValueError as error:
+                raise ValueError(f"Job {index}: {error}")
+            jobs.append((config, structure))
+        
+        return jobs
+    
+    @staticmethod
+    def build_structure(questions: List[Dict]) -> Structure:
+        """
+        Build a question structure from manifest questions.
+        
+        Args:
+            questions: List of question mappings with marks, parts and subparts
+            
+        Returns:
+            Validated question structure
+            
+        Raises:
+            ValueError: If a question is invalid
+        """
+        return Structure.parse(ManifestLoader.raw_questions(questions))
+    
+    @staticmethod
+    def raw_questions(questions: List[Dict]) -> List[Tuple[object, object, object]]:
+        """
+        Extract raw (marks, parts, subparts) input from manifest questions.
+        
+        Args:
+            questions: List of question mappings with marks, parts and subparts
+            
+        Returns:
+            Raw input for each question, in order
+            
+        Raises:
+            ValueError: If a question is not a mapping, has unknown keys or
+                has a value of the wrong type
+        """
+        # Inline structures follow the same schema as spec files
+        return SpecLoader.check_questions(questions, "structure")
+
+
+class BatchGenerator:
+    """
+    Generate many TMA projects headlessly.
+    
+    Drives LaTeXFileGenerator directly for every job in a manifest and
+    reports throughput, so nightly jobs can run without a display server.
+    """
+    
+    def __init__(
+        self,
+        quiet: bool = False,
+        io_stats: Optional[IOStats] = None,
+        options: Optional[Dict[str, bool]] = None,
+        link_styles: bool = False,
+        style_dir: Optional[str] = None,
+        log: Optional[LogSink] = None,
+        preamble_format: Optional[str] = None,
+        dedup_store: Optional[str] = None
+    ) -> None:
+        """
+        Initialize batch generator.
+        
+        Args:
+            quiet: Suppress per-project progress lines
+            io_stats: Account every filesystem operation into these statistics
+            options: Keyword options for LaTeXFileGenerator.generate_project
+                (e.g. archive, incremental)
+            link_styles: Deploy repeated style files as hardlinks
+            style_dir: Ship the .sty files in this directory instead of the bundled ones
+            log: Destination for progress lines and warnings (default: text on stdout/stderr)
+            preamble_format: Precompile the preamble into a format for this
+                TeX engine and ship it with every project
+            dedup_store: Keep each distinct file once in this content-addressed
+                store and hardlink the projects' files to it
+        
+        Raises:
+            ValueError: If the engine is unknown
+        """
+        self.quiet = quiet
+        self.log = log or StreamLogSink()
+        self.io_stats = io_stats
+        self.options = options or {}
+        self.styles = StyleCache(fs=io_stats, link=link_styles, style_dir=style_dir)
+        self.formats = FormatCache(preamble_format, fs=io_stats) if preamble_format else None
+        self.store = BlobStore(dedup_store, fs=io_stats) if dedup_store else None
+    
+    def run(self, jobs: List[Tuple[Dict[str, str], Structure]]) -> Dict[str, Union[int, float, List[str]]]:
+        """
+        Generate every job and collect a summary.
+        
+        A failing job is reported and skipped; the remaining jobs still run.
+        
+        Args:
+            jobs: List of (config, structure) tuples
+            
+        Returns:
+            Summary with project, file and error counts and timings
+        """
+        errors = []
+        outputs = []
+        projects = 0
+        files = 0
+        skipped = 0
+        start = time.perf_counter()
+        
+        for index, (config, structure) in enumerate(jobs, start=1):
+            generator = LaTeXFileGenerator(
+                config, fs=self.io_stats, styles=self.styles, formats=self.formats,
+                store=self.store
+            )
+            try:
+                folder = generator.generate_project(structure, **self.options)
+            except Exception as error:
+                errors.append(f"Job {index} ({config['output']}): {error}")
+                continue
+            finally:
+                files += generator.files_written
+                skipped += generator.files_skipped
+                if not self.quiet:
+                    for note in generator.notes:
+                        self.log.info(note)
+            
+            projects += 1
+            outputs.append((folder, config["basename"]))
+            if not self.quiet:
+                self.log.info(f"[{index}/{len(jobs)}] {folder} ({generator.files_written} files"
+                              f"{f', {generator.files_skipped} unchanged' if generator.files_skipped else ''})")
+            for warning in generator.warnings:
+                self.log.warning(f"{folder}: {warning}")
+        
+        self.log.flush()
+        elapsed = time.perf_counter() - start
+        return {
+            "projects": projects,
+            "files": files,
+            "skipped": skipped,
+            "styles": self.styles.summary(),
+            "formats": self.formats.summary() if self.formats else None,
+            "store": self.store.summary() if self.store else None,
+            "errors": errors,
+            "outputs": outputs,
+            "seconds": elapsed,
+            "files_per_second": files / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+def report_summary(
+    summary: Dict[str, Union[int, float, List[str]]],
+    total: int,
+    log: Optional[LogSink] = None
+) -> int:
+    """
+    Report a generation summary and return the matching exit code.
+    
+    Args:
+        summary: Summary returned by a batch or roster run
+        total: Number of projects that were requested
+        log: Destination for the summary (default: text on stdout/stderr)
+        
+    Returns:
+        Process exit code (0 if every project succeeded)
+    """
+    log = log or StreamLogSink()
+    for error in summary["errors"]:
+        log.error(error)
+    log.info(
+        f"Generated {summary['projects']}/{total} projects, "
+        f"{summary['files']} files in {summary['seconds']:.2f}s "
+        f"({summary['files_per_second']:.0f} files/sec)"
+    )
+    if summary.get("skipped"):
+        log.info(f"Skipped {summary['skipped']} unchanged files (mtimes preserved)")
+    styles = summary.get("styles")
+    if styles and (styles["linked"] or styles["cloned"]):
+        # Only links save space; in-kernel copies are full copies on most filesystems
+        details = []
+        if styles["linked"]:
+            details.append(f"{styles['bytes_saved']} bytes saved by links")
+        if styles["cloned"]:
+            details.append(f"{styles['bytes_cloned']} bytes copied in-kernel")
+        log.info(
+            f"Style files: {styles['written']} written, {styles['linked']} linked, "
+            f"{styles['cloned']} copied in-kernel ({'; '.join(details)})"
+        )
+    formats = summary.get("formats")
+    if formats:
+        log.info(
+            f"Preamble format: {formats['built']} built, {formats['hits']} reused from the "
+            f"cache, {formats['linked']} linked and {formats['copied']} copied into projects"
+        )
+    store = summary.get("store")
+    if store and store["files"]:
+        unique = sum(store["blobs"].values())
+        log.info(
+            f"Dedup store: {store['files']} files ({store['bytes']} bytes) linked to "
+            f"{len(store['blobs'])} distinct blobs ({unique} bytes), dedup ratio "
+            f"{dedup_ratio(store):.1f}x; {store['blobs_written']} blobs new in this run"
+        )
+    log.flush()
+    return 1 if summary["errors"] else 0
+
+
+def dry_run(
+    jobs: List[Tuple[Dict[str, str], Structure]],
+    quiet: bool = False,
+    log: Optional[LogSink] = None
+) -> int:
+    """
+    Render every job and report what generation would write, without writing.
+    
+    Args:
+        jobs: List of (config, structure) tuples
+        quiet: Only report each job's file count, not every file
+        log: Destination for the report (default: text on stdout/stderr)
+        
+    Returns:
+        Process exit code (0 if every job rendered)
+    """
+    log = log or StreamLogSink()
+    failed = 0
+    
+    for index, (config, structure) in enumerate(jobs, start=1):
+        try:
+            plan = LaTeXFileGenerator(config).render_plan(structure)
+        except Exception as error:
+            log.error(f"Job {index} ({config['output']}): {error}")
+            failed += 1
+            continue
+        
+        log.info(f"[{index}/{len(jobs)}] {config['output']}: "
+                 f"{len(plan)} files, {plan.total_bytes} bytes")
+        
+        output_path = Path(config["output"])
+        if output_path.is_dir():
+            changes = plan.diff(str(output_path))
+            log.info(f"  existing project: {len(changes.added)} new, "
+                     f"{len(changes.changed)} changed, {len(changes.unchanged)} unchanged")
+            if quiet:
+                continue
+            for path in changes.added:
+                log.info(f"  + {path}")
+            for path in changes.changed:
+                log.info(f"  ~ {path}")
+        elif not quiet:
+            for entry in plan:
+                log.info(f"  + {entry.path} ({len(entry.data)} bytes)")
+    
+    log.flush()
+    return 1 if failed else 0
+
+
+def validate_jobs(
+    jobs: List[Tuple[Dict[str, str], Union[str, List[Dict]]]]
+) -> List[ValidationReport]:
+    """
+    Validate the structure of every job, collecting every problem.
+    
+    Each spec file is read and validated once however many jobs use it.
+    
+    Args:
+        jobs: (config, questions) tuples from ManifestLoader.read
+        
+    Returns:
+        One validation report per job
+    """
+    validator = StructureValidator()
+    reports: Dict[str, ValidationReport] = {}
+    results = []
+    
+    for config, questions in jobs:
+        key = questions if isinstance(questions, str) else None
+        if key is not None and key in reports:
+            results.append(reports[key])
+            continue
+        
+        try:
+            if isinstance(questions, str):
+                raw_questions = SpecLoader.read(questions)
+            else:
+                raw_questions = ManifestLoader.raw_questions(questions)
+        except ValueError as error:
+            report = ValidationReport([Issue(SEVERITY_ERROR, "", str(error))], None)
+        else:
+            report = validator.validate(raw_questions)
+        
+        if key is not None:
+            reports[key] = report
+        results.append(report)
+    
+    return results
+
+
+def validate_manifest(
+    manifest_path: str,
+    quiet: bool = False,
+    log_format: str = LOG_FORMAT_TEXT
+) -> int:
+    """
+    Check every job in a manifest and report all errors and warnings.
+    
+    Nothing is generated, so this can run as a fast pre-flight check.
+    
+    Args:
+        manifest_path: Path to the JSON manifest
+        quiet: Only print the final summary
+        log_format: Output format, 'text' or 'jsonl' (see tma_generator.log)
+        
+    Returns:
+        Process exit code (0 if no job has errors)
+    """
+    log = make_log_sink(log_format)
+    try:
+        jobs = ManifestLoader.read(manifest_path)
+    except ValueError as error:
+        log.error(f"Manifest Error: {error}")
+        log.flush()
+        return 2
+    
+    start_time = time.perf_counter()
+    reports = validate_jobs(jobs)
+    elapsed = time.perf_counter() - start_time
+    
+    errors = warnings = 0
+    for index, ((config, _), report) in enumerate(zip(jobs, reports), start=1):
+        errors += len(report.errors)
+        warnings += len(report.warnings)
+        if quiet:
+            continue
+        status = "OK" if report.ok else "INVALID"
+        log.info(f"[{index}/{len(jobs)}] {config['output']}: {status}")
+        for issue in report.issues:
+            for line_number, line in enumerate(str(issue).splitlines()):
+                prefix = f"  {issue.severity}: " if line_number == 0 else "    "
+                log.info(prefix + line)
+    
+    failed = sum(1 for report in reports if not report.ok)
+    log.info(f"Validated {len(jobs)} jobs in {elapsed:.3f}s: "
+             f"{failed} invalid, {errors} errors, {warnings} warnings")
+    log.flush()
+    return 1 if failed else 0
+
+
+def write_io_stats(
+    io_stats: IOStats,
+    io_stats_path: str,
+    quiet: bool = False,
+    log: Optional[LogSink] = None
+) -> None:
+    """
+    Write I/O statistics as JSON.
+    
+    With '-' the JSON is the only thing written to stdout, so the run's
+    log sink must have been created with stderr_only.
+    
+    Args:
+        io_stats: Statistics collected during the run
+        io_stats_path: Destination file ('-' for standard output)
+        quiet: Do not report where the statistics were written
+        log: Destination for that notice (default: text on stdout/stderr)
+    """
+    if io_stats_path == "-":
+        sys.stdout.write(io_stats.to_json() + "\n")
+        sys.stdout.flush()
+        return
+    
+    with open(io_stats_path, 'w', encoding='utf-8') as file:
+        file.write(io_stats.to_json())
+    if not quiet:
+        log = log or StreamLogSink()
+        log.info(f"I/O statistics written to {io_stats_path}")
+        log.flush()
+
+
+def run_batch(
+    manifest_path: str,
+    quiet: bool = False,
+    dry: bool = False,
+    io_stats_path: Optional[str] = None,
+    options: Optional[Dict[str, bool]] = None,
+    link_styles: bool = False,
+    style_dir: Optional[str] = None,
+    log_format: str = LOG_FORMAT_TEXT,
+    compile_options: Optional[Dict[str, object]] = None,
+    preamble_format: Optional[str] = None,
+    dedup_store: Optional[str] = None
+) -> int:
+    """
+    Generate all projects described by a manifest without the GUI.
+    
+    Args:
+        manifest_path: Path to the JSON manifest
+        quiet: Suppress per-project progress lines
+        dry: Only report what would be written
+        io_stats_path: Write per-phase filesystem statistics as JSON to this file
+        options: Keyword options for LaTeXFileGenerator.generate_project
+        link_styles: Deploy repeated style files as hardlinks
+        style_dir: Ship the .sty files in this directory instead of the bundled ones
+        log_format: Progress output format, 'text' or 'jsonl' (see tma_generator.log)
+        compile_options: Compile every generated project afterwards with these
+            options (see tma_generator.compile.run_compile_stage)
+        preamble_format: Ship a precompiled preamble format for this TeX engine
+            with every project (see tma_generator.formats)
+        dedup_store: Hardlink every project's files to blobs in this
+            content-addressed store (see tma_generator.store)
+        
+    Returns:
+        Process exit code (0 if every job succeeded, and compiled if requested)
+    """
+    # A JSON report on stdout leaves every other message to stderr
+    reports = (io_stats_path, (compile_options or {}).get("report"))
+    log = make_log_sink(log_format, stderr_only="-" in reports)
+    try:
+        jobs = ManifestLoader.load(manifest_path)
+    except ValueError as error:
+        log.error(f"Manifest Error: {error}")
+        log.flush()
+        return 2
+    
+    if dry:
+        return dry_run(jobs, quiet=quiet, log=log)
+    
+    io_stats = IOStats() if io_stats_path else None
+    summary = BatchGenerator(
+        quiet=quiet, io_stats=io_stats, options=options,
+        link_styles=link_styles, style_dir=style_dir, log=log,
+        preamble_format=preamble_format, dedup_store=dedup_store
+    ).run(jobs)
+    exit_code = report_summary(summary, len(jobs), log=log)
+    
+    if io_stats:
+        write_io_stats(io_stats, io_stats_path, quiet=quiet, log=log)
+    if compile_options is not None:
+        exit_code = max(exit_code, run_compile_stage(
+            summary["outputs"], compile_options, quiet=quiet, log=log
+        ))
+    return exit_code
@@ -0,0 +1,222 @@
+"""
+Command-line entry point for the TMA LaTeX Generator.
+
+Headless options are handled without importing tkinter; the GUI is only
+imported when it is actually launched.
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from .batch import run_batch, validate_manifest
+from .compile import ENGINE_PDFLATEX, ENGINES
+from .focus import run_focus
+from .log import LOG_FORMAT_TEXT, LOG_FORMATS, make_log_sink
+from .preamble import run_lean_preamble
+from .roster import run_roster
+from .watch import run_watch
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Main function - launch the GUI, or generate headlessly from a manifest.
+    
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="TMA LaTeX Generator")
+    parser.add_argument(
+        "--manifest",
+        help="Generate projects from a JSON manifest without launching the GUI"
+    )
+    parser.add_argument(
+        "--roster",
+        help="CSV or JSON student list; generates one project per student "
+             "using the single job in --manifest as the template"
+    )
+    parser.add_argument(
+        "--workers", type=int,
+        help="Number of worker processes for --roster (defaults to CPU count)"
+    )
+    parser.add_argument(
+        "--zip", action="store_true",
+        help="Write each project as a single ZIP archive (<output>.zip) "
+             "ready to upload to Overleaf, instead of a directory"
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Update existing output folders in place: add new question, part "
+             "and subpart files and rewrite structure files, but never touch "
+             "existing answer files"
+    )
+    parser.add_argument(
+        "--link-styles", action="store_true",
+        help="Hardlink the style files of every project after the first to a "
+             "single copy (projects then share tma.sty; edits show up in all)"
+    )
+    parser.add_argument(
+        "--style-dir", metavar="DIR",
+        help="Ship the .sty files in DIR with every project instead of the "
+             "bundled tma.sty and tma-extras.sty"
+    )
+    parser.add_argument(
+        "--io-stats", metavar="PATH",
+        help="Count and time every filesystem operation per generation phase "
+             "and write the totals as JSON to PATH ('-' for stdout)"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Render --manifest jobs and list the files that would be written, "
+             "compared with any existing output, without writing anything"
+    )
+    parser.add_argument(
+        "--validate", action="store_true",
+        help="Check the question structure of every --manifest job and report "
+             "all errors and warnings, without generating anything"
+    )
+    parser.add_argument(
+        "--compile", nargs="?", const=ENGINE_PDFLATEX, choices=ENGINES, metavar="ENGINE",
+        help="After --manifest or --roster generation, compile every project "
+             "with a local TeX installation (latexmk if installed) and report "
+             f"exit codes, pages and times; ENGINE is one of {', '.join(ENGINES)} "
+             f"(default: {ENGINE_PDFLATEX}); also selects the engine for --focus "
+             "and --watch"
+    )
+    parser.add_argument(
+        "--focus", nargs=2, metavar=("DIR", "QUESTION"),
+        help="Compile only QUESTION (e.g. q3) of the generated project in DIR "
+             "into <basename>-q3.pdf with \\includeonly, reusing the other "
+             "questions' .aux files so numbering and references match the full "
+             "document"
+    )
+    parser.add_argument(
+        "--watch", metavar="DIR",
+        help="Watch the generated project in DIR and, on every save, recompile "
+             "only the question whose files changed (as with --focus); changes "
+             "to the main file or a style file rebuild the whole document"
+    )
+    parser.add_argument(
+        "--preamble-format", nargs="?", const=ENGINE_PDFLATEX, choices=ENGINES, metavar="ENGINE",
+        help="Precompile the tma.sty preamble into a format (.fmt, needs the "
+             "mylatexformat package) for ENGINE, cached across runs, ship it with "
+             "every --manifest or --roster project and load it from the first "
+             "line of the main file; for local compiles only, not Overleaf"
+    )
+    parser.add_argument(
+        "--dedup-store", metavar="DIR",
+        help="Keep each distinct file of the --manifest or --roster projects "
+             "once in the content-addressed store DIR (on the same filesystem) "
+             "and create the project files as read-only hardlinks to it"
+    )
+    parser.add_argument(
+        "--lean-preamble", metavar="DIR",
+        help="Scan the answer files of the generated project in DIR and rewrite "
+             "its tma-extras.sty to load only the packages they use (the full "
+             "set is kept when the usage is uncertain)"
+    )
+    parser.add_argument(
+        "--compile-workers", type=int,
+        help="Number of projects compiled at once for --compile (defaults to CPU count)"
+    )
+    parser.add_argument(
+        "--compile-report", metavar="PATH",
+        help="Write the --compile summary with every project's result as JSON "
+             "to PATH ('-' for stdout)"
+    )
+    parser.add_argument(
+        "--log-format", choices=LOG_FORMATS, default=LOG_FORMAT_TEXT,
+        help="Output of every headless mode: plain text, or one JSON object "
+             "per line (jsonl) for log collectors"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true",
+        help="Only print the final summary in headless mode"
+    )
+    args = parser.parse_args(argv)
+    
+    if args.roster and not args.manifest:
+        parser.error("--roster requires --manifest")
+    if args.roster and args.dry_run:
+        parser.error("--dry-run cannot be combined with --roster")
+    if args.zip and args.incremental:
+        parser.error("--incremental cannot be combined with --zip")
+    if args.validate and not args.manifest:
+        parser.error("--validate requires --manifest")
+    if args.compile and not (args.manifest or args.focus or args.watch):
+        parser.error("--compile requires --manifest, --focus or --watch")
+    if args.compile and (args.zip or args.dry_run or args.validate):
+        parser.error("--compile cannot be combined with --zip, --dry-run or --validate")
+    if args.preamble_format and not args.manifest:
+        parser.error("--preamble-format requires --manifest")
+    if args.preamble_format and (args.zip or args.dry_run or args.validate):
+        parser.error("--preamble-format cannot be combined with --zip, --dry-run or --validate")
+    if args.dedup_store and not args.manifest:
+        parser.error("--dedup-store requires --manifest")
+    if args.dedup_store and (args.zip or args.dry_run or args.validate):
+        parser.error("--dedup-store cannot be combined with --zip, --dry-run or --validate")
+    if args.preamble_format and args.compile and args.preamble_format != args.compile:
+        parser.error("--preamble-format and --compile must use the same engine")
+    if (args.compile_workers or args.compile_report) and not args.compile:
+        parser.error("--compile-workers and --compile-report require --compile")
+    if args.io_stats == "-" and args.compile_report == "-":
+        parser.error("--io-stats and --compile-report cannot both write to stdout")
+    if args.lean_preamble and args.manifest:
+        parser.error("--lean-preamble cannot be combined with --manifest")
+    if args.focus and (args.manifest or args.lean_preamble):
+        parser.error("--focus cannot be combined with --manifest or --lean-preamble")
+    if args.watch and (args.manifest or args.lean_preamble or args.focus):
+        parser.error("--watch cannot be combined with --manifest, --lean-preamble or --focus")
+    
+    if args.focus:
+        sys.exit(run_focus(
+            *args.focus, engine=args.compile, quiet=args.quiet, log=make_log_sink(args.log_format)
+        ))
+    if args.watch:
+        sys.exit(run_watch(
+            args.watch, engine=args.compile, quiet=args.quiet, log=make_log_sink(args.log_format)
+        ))
+    if args.lean_preamble:
+        sys.exit(run_lean_preamble(
+            args.lean_preamble, style_dir=args.style_dir, quiet=args.quiet,
+            log=make_log_sink(args.log_format)
+        ))
+    if args.validate:
+        sys.exit(validate_manifest(args.manifest, quiet=args.quiet, log_format=args.log_format))
+    
+    options = {"archive": args.zip, "incremental": args.incremental}
+    compile_options = None
+    if args.compile:
+        compile_options = {
+            "engine": args.compile,
+            "workers": args.compile_workers,
+            "report": args.compile_report,
+        }
+    if args.roster:
+        sys.exit(run_roster(
+            args.manifest, args.roster, args.workers,
+            quiet=args.quiet, io_stats_path=args.io_stats, options=options,
+            link_styles=args.link_styles, style_dir=args.style_dir,
+            log_format=args.log_format, compile_options=compile_options,
+            preamble_format=args.preamble_format, dedup_store=args.dedup_store
+        ))
+    if args.manifest:
+        sys.exit(run_batch(
+            args.manifest, quiet=args.quiet, dry=args.dry_run,
+            io_stats_path=args.io_stats, options=options,
+            link_styles=args.link_styles, style_dir=args.style_dir,
+            log_format=args.log_format, compile_options=compile_options,
+            preamble_format=args.preamble_format, dedup_store=args.dedup_store
+        ))
+    
+    try:
+        # Deferred so headless runs never pay for (or need) tkinter
+        import tkinter as tk
+        from .gui import TMAGeneratorGUI
+        
+        root = tk.Tk()
+        app = TMAGeneratorGUI(root)
+        root.mainloop()
+    except Exception as error:
+        print(f"GUI Error: {error}")
+        print("Error starting GUI. Please check tkinter installation.")
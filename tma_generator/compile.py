@@ -0,0 +1,319 @@
+"""
+Local compile stage for the TMA LaTeX Generator.
+
+Compiles generated projects with a locally installed TeX distribution, to
+smoke-test every scaffold after a batch or roster run. Projects are
+compiled with latexmk when it is installed, otherwise with a single run of
+the engine itself, across a bounded pool of worker threads: each compile
+is a separate process, so threads only wait on it. Exit codes, page counts
+and compile times are collected per project into a summary.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .core import TEX_EXTENSION
+from .log import LogSink, StreamLogSink
+
+
+# Engines, and the latexmk option selecting each
+ENGINE_PDFLATEX = "pdflatex"
+ENGINE_LUALATEX = "lualatex"
+ENGINE_XELATEX = "xelatex"
+LATEXMK_ENGINE_OPTIONS = {
+    ENGINE_PDFLATEX: "-pdf",
+    ENGINE_LUALATEX: "-pdflua",
+    ENGINE_XELATEX: "-pdfxe",
+}
+ENGINES = tuple(LATEXMK_ENGINE_OPTIONS)
+LATEXMK = "latexmk"
+
+# Stop at the first error instead of waiting for input
+ENGINE_OPTIONS = ("-interaction=nonstopmode", "-halt-on-error", "-file-line-error")
+COMPILE_TIMEOUT_SECONDS = 300
+
+# "Output written on TMA.pdf (3 pages, 51234 bytes)." in the engine log
+PAGES_PATTERN = re.compile(r"Output written on .*?\((\d+) pages?", re.S)
+# "! Undefined control sequence." or "./q1a.tex:3: Undefined control sequence."
+ERROR_PATTERN = re.compile(r"^(?:! |\S+\.(?:tex|sty|cls):\d+: )(.+)$", re.M)
+
+# One generated project: (folder, main file basename)
+CompileJob = Tuple[str, str]
+
+
+class CompileResult(NamedTuple):
+    """Outcome of compiling one project."""
+    
+    folder: str
+    returncode: Optional[int]
+    pages: Optional[int]
+    seconds: float
+    error: str
+    
+    @property
+    def ok(self) -> bool:
+        """True if the compiler exited successfully."""
+        return self.returncode == 0
+
+
+def parse_log(text: str) -> Tuple[Optional[int], str]:
+    """
+    Read the page count and first error from a TeX log.
+    
+    Args:
+        text: Content of the engine's .log file
+    
+    Returns:
+        Tuple of (pages, or None if no PDF was written; first error or "")
+    """
+    pages = PAGES_PATTERN.search(text)
+    error = ERROR_PATTERN.search(text)
+    return (
+        int(pages.group(1)) if pages else None,
+        error.group(1).strip() if error else ""
+    )
+
+
+class ProjectCompiler:
+    """Compile generated projects with a local TeX installation."""
+    
+    def __init__(
+        self,
+        engine: str = ENGINE_PDFLATEX,
+        use_latexmk: Optional[bool] = None,
+        timeout: float = COMPILE_TIMEOUT_SECONDS
+    ) -> None:
+        """
+        Initialize compiler.
+        
+        Args:
+            engine: TeX engine, one of ENGINES
+            use_latexmk: Drive the engine through latexmk (default: if installed)
+            timeout: Seconds before a compile is abandoned
+        
+        Raises:
+            ValueError: If the engine is unknown or not installed
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown TeX engine '{engine}' (use {', '.join(ENGINES)})")
+        if use_latexmk is None:
+            use_latexmk = shutil.which(LATEXMK) is not None
+        
+        program = LATEXMK if use_latexmk else engine
+        if shutil.which(program) is None:
+            raise ValueError(f"{program} was not found on PATH; install a TeX distribution to compile")
+        
+        self.engine = engine
+        self.use_latexmk = use_latexmk
+        self.timeout = timeout
+    
+    def command(self, main_file: str) -> List[str]:
+        """
+        Build the compile command for a main file.
+        
+        Args:
+            main_file: Main .tex file name, relative to the project folder
+        
+        Returns:
+            Command line
+        """
+        if self.use_latexmk:
+            return [LATEXMK, LATEXMK_ENGINE_OPTIONS[self.engine], *ENGINE_OPTIONS, main_file]
+        return [self.engine, *ENGINE_OPTIONS, main_file]
+    
+    def compile(self, folder: str, basename: str) -> CompileResult:
+        """
+        Compile one project.
+        
+        Args:
+            folder: Project folder
+            basename: Main document basename (without .tex)
+        
+        Returns:
+            Exit code, page count, wall time and first error of the compile
+        """
+        main_file = basename + TEX_EXTENSION
+        start = time.perf_counter()
+        try:
+            completed = subprocess.run(
+                self.command(main_file), cwd=folder,
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                timeout=self.timeout
+            )
+            returncode = completed.returncode
+            error = ""
+        except subprocess.TimeoutExpired:
+            returncode = None
+            error = f"Timed out after {self.timeout:.0f}s"
+        except OSError as os_error:
+            returncode = None
+            error = str(os_error)
+        seconds = time.perf_counter() - start
+        
+        try:
+            log_text = (Path(folder) / (basename + ".log")).read_text(encoding='utf-8', errors='replace')
+        except OSError:
+            log_text = ""
+        pages, log_error = parse_log(log_text)
+        if returncode != 0 and not error:
+            error = log_error or f"{self.command(main_file)[0]} exited with code {returncode}"
+        
+        return CompileResult(folder, returncode, pages, seconds, error)
+    
+    def compile_all(
+        self,
+        jobs: Sequence[CompileJob],
+        workers: Optional[int] = None,
+        quiet: bool = False,
+        log: Optional[LogSink] = None
+    ) -> Dict[str, Union[int, float, List]]:
+        """
+        Compile many projects across a bounded pool of workers.
+        
+        Args:
+            jobs: (folder, basename) of each generated project
+            workers: Concurrent compiles (defaults to CPU count)
+            quiet: Suppress per-project progress lines
+            log: Destination for progress lines (default: text on stdout/stderr)
+        
+        Returns:
+            Summary with compiled and failed counts, pages, timings and
+            every project's result
+        """
+        log = log or StreamLogSink()
+        workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+        results: List[CompileResult] = []
+        start = time.perf_counter()
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.compile, folder, basename) for folder, basename in jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if result.ok:
+                    if not quiet:
+                        pages = f"{result.pages} pages" if result.pages is not None else "no PDF"
+                        log.info(f"[{len(results)}/{len(jobs)}] {result.folder}: OK, "
+                                 f"{pages}, {result.seconds:.2f}s")
+                else:
+                    log.warning(f"[{len(results)}/{len(jobs)}] {result.folder}: FAILED "
+                                f"(exit code {result.returncode}): {result.error}")
+        
+        log.flush()
+        elapsed = time.perf_counter() - start
+        results.sort(key=lambda result: result.folder)
+        times = [result.seconds for result in results]
+        return {
+            "projects": len(results),
+            "compiled": sum(1 for result in results if result.ok),
+            "failed": sum(1 for result in results if not result.ok),
+            "pages": sum(result.pages or 0 for result in results),
+            "seconds": elapsed,
+            "compile_seconds": sum(times),
+            "slowest_seconds": max(times, default=0.0),
+            "workers": workers,
+            "results": [result._asdict() for result in results],
+        }
+
+
+def report_compile_summary(
+    summary: Dict[str, Union[int, float, List]],
+    log: Optional[LogSink] = None
+) -> int:
+    """
+    Report a compile summary and return the matching exit code.
+    
+    Args:
+        summary: Summary returned by ProjectCompiler.compile_all()
+        log: Destination for the summary (default: text on stdout/stderr)
+    
+    Returns:
+        Process exit code (0 if every project compiled)
+    """
+    log = log or StreamLogSink()
+    log.info(
+        f"Compiled {summary['compiled']}/{summary['projects']} projects "
+        f"({summary['pages']} pages) in {summary['seconds']:.2f}s with "
+        f"{summary['workers']} workers; slowest {summary['slowest_seconds']:.2f}s, "
+        f"total compile time {summary['compile_seconds']:.2f}s"
+    )
+    if summary["failed"]:
+        log.error(f"{summary['failed']} projects failed to compile")
+    log.flush()
+    return 1 if summary["failed"] else 0
+
+
+def write_compile_report(
+    summary: Dict[str, Union[int, float, List]],
+    report_path: str,
+    quiet: bool = False,
+    log: Optional[LogSink] = None
+) -> None:
+    """
+    Write a compile summary, with every project's result, as JSON.
+    
+    With '-' the JSON is the only thing written to stdout, so the run's
+    log sink must have been created with stderr_only.
+    
+    Args:
+        summary: Summary returned by ProjectCompiler.compile_all()
+        report_path: Destination file ('-' for standard output)
+        quiet: Do not report where the report was written
+        log: Destination for that notice (default: text on stdout/stderr)
+    """
+    text = json.dumps(summary, indent=2)
+    if report_path == "-":
+        sys.stdout.write(text + "\n")
+        sys.stdout.flush()
+        return
+    
+    with open(report_path, 'w', encoding='utf-8') as file:
+        file.write(text)
+    if not quiet:
+        log = log or StreamLogSink()
+        log.info(f"Compile report written to {report_path}")
+        log.flush()
+
+
+def run_compile_stage(
+    jobs: Sequence[CompileJob],
+    options: Dict[str, object],
+    quiet: bool = False,
+    log: Optional[LogSink] = None
+) -> int:
+    """
+    Compile the projects of a finished generation run.
+    
+    Args:
+        jobs: (folder, basename) of each generated project
+        options: 'engine', 'workers', 'latexmk' and 'report' (JSON report path)
+        quiet: Suppress per-project progress lines
+        log: Destination for progress lines and the summary
+    
+    Returns:
+        Process exit code (0 if every project compiled, 2 if no compiler)
+    """
+    log = log or StreamLogSink()
+    try:
+        compiler = ProjectCompiler(
+            engine=options.get("engine") or ENGINE_PDFLATEX,
+            use_latexmk=options.get("latexmk")
+        )
+    except ValueError as error:
+        log.error(f"Compile Error: {error}")
+        log.flush()
+        return 2
+    
+    summary = compiler.compile_all(jobs, workers=options.get("workers"), quiet=quiet, log=log)
+    exit_code = report_compile_summary(summary, log=log)
+    if options.get("report"):
+        write_compile_report(summary, options["report"], quiet=quiet, log=log)
+    return exit_code
@@ -0,0 +1,911 @@
+"""
+Generation core for the TMA LaTeX Generator.
+
+Holds configuration handling and LaTeX file generation. This module has no
+GUI dependencies, so it can be imported by headless and batch code without
+tkinter installed.
+"""
+
+import datetime
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .plan import (
+    KIND_MAIN,
+    KIND_PART,
+    KIND_QUESTION,
+    KIND_SUBPART,
+    PlanEntry,
+    RenderPlan,
+)
+from .iostats import FileOps
+from .sinks import PARTIAL_SUFFIX, DirectorySink, OutputSink, StagedDirectorySink, ZipSink
+from .store import BlobStore
+from .structure import Question, Structure, as_structure
+from .structure import parse_subparts_string  # noqa: F401 (re-exported)
+from .styles import StyleCache
+from .templates import (
+    TEMPLATE_MAIN,
+    TEMPLATE_PART,
+    TEMPLATE_QUESTION,
+    TEMPLATE_SUBPART,
+    TEMPLATE_SUBPARTS,
+    TemplateSet,
+    load_templates,
+)
+
+if TYPE_CHECKING:
+    # Only for annotations: formats builds on the compile stage, which imports this module
+    from .formats import FormatCache
+
+
+# Configuration constants
+CONFIG_FILE = "tma_generator_config.json"
+
+# Default configuration values
+DEFAULT_CONFIG = {
+    "course": "MATH101",
+    "tma_ref": "04", 
+    "cod": "21 January 2026",
+    "name": "Alex Taylor",
+    "pin": "S1234567",
+    "style": "tma",
+    "output": "./output",
+    "basename": "TMA",
+    "templates": ""
+}
+
+# LaTeX file generation constants
+TEX_EXTENSION = ".tex"
+QUESTION_PREFIX = "q"
+# First line of the main file (e.g. "%&<format>"); a FormatCache replaces it
+MAIN_TEX_PROGRAM = ""
+
+# Progress callback: (files written so far, total files)
+ProgressCallback = Callable[[int, int], None]
+
+
+class GenerationCancelled(Exception):
+    """Raised by a progress callback to stop writing a project."""
+
+
+class ConfigManager:
+    """
+    Handle loading and saving of application configuration.
+    
+    Manages persistent storage of user preferences and settings
+    using JSON format configuration file.
+    """
+    
+    @staticmethod
+    def load_config() -> Dict[str, str]:
+        """
+        Load configuration from file.
+        
+        Returns:
+            Dictionary containing configuration values, defaults if file not found
+        """
+        # Deferred so importing the package stays cheap
+        import json
+        
+        try:
+            if Path(CONFIG_FILE).exists():
+                with open(CONFIG_FILE, 'r', encoding='utf-8') as file:
+                    loaded_config = json.load(file)
+                    # Merge with defaults to ensure all keys exist
+                    config = DEFAULT_CONFIG.copy()
+                    config.update(loaded_config)
+                    return config
+        except (json.JSONDecodeError, IOError) as error:
+            print(f"Warning: Could not load config file: {error}")
+        
+        return DEFAULT_CONFIG.copy()
+    
+    @staticmethod
+    def save_config(config: Dict[str, str]) -> bool:
+        """
+        Save configuration to file.
+        
+        Args:
+            config: Configuration dictionary to save
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        # Deferred so importing the package stays cheap
+        import json
+        
+        try:
+            with open(CONFIG_FILE, 'w', encoding='utf-8') as file:
+                json.dump(config, file, indent=2)
+            return True
+        except IOError as error:
+            print(f"Warning: Could not save config file: {error}")
+            return False
+
+
+class LaTeXFileGenerator:
+    """
+    Generate LaTeX files from question structure.
+    
+    Handles creation of main LaTeX document and all associated
+    question, part, and subpart files.
+    """
+    
+    def __init__(
+        self,
+        config: Dict[str, str],
+        fs: Optional[FileOps] = None,
+        styles: Optional[StyleCache] = None,
+        templates: Optional[TemplateSet] = None,
+        formats: Optional["FormatCache"] = None,
+        store: Optional[BlobStore] = None
+    ):
+        """
+        Initialize generator with configuration.
+        
+        Args:
+            config: Configuration dictionary with file generation settings
+            fs: Filesystem operations to use (pass an IOStats to account for I/O)
+            styles: Style cache shared across the projects of a run
+            templates: File templates (default: the config's 'templates'
+                directory, falling back to the bundled templates)
+            formats: Precompile the preamble into a format, cached here, and
+                start the main file with the line that loads it
+            store: Content-addressed store; project files are written as
+                hardlinks to its blobs
+        """
+        self.config = config
+        self.fs = fs or FileOps()
+        self.styles = styles or StyleCache(fs=self.fs)
+        self._templates = templates
+        self.formats = formats
+        self.store = store
+        self.files_written = 0
+        self.files_skipped = 0
+        self.warnings: List[str] = []
+        # Informational messages for the caller's log (e.g. a folder renamed)
+        self.notes: List[str] = []
+    
+    def create_directory(self, directory: str, incremental: bool = False) -> str:
+        """
+        Create output directory, handling existing directories.
+        
+        Args:
+            directory: Path to directory to create
+            incremental: Reuse an existing directory instead of renaming it
+            
+        Returns:
+            Actual directory path (may be renamed if original exists)
+            
+        Raises:
+            Exception: If directory creation fails
+        """
+        directory_path = Path(directory).resolve()
+        
+        try:
+            self.fs.mkdir(directory_path, parents=True, exist_ok=False)
+            return str(directory_path)
+        except FileExistsError:
+            if incremental:
+                return str(directory_path)
+            
+            self._backup_directory(directory_path)
+            
+            # Create new directory
+            self.fs.mkdir(directory_path, parents=True)
+            return str(directory_path)
+    
+    def _backup_directory(self, directory_path: Path) -> None:
+        """
+        Rename an existing directory to a timestamped backup name.
+        
+        The rename is recorded in self.notes for the caller to report.
+        
+        Args:
+            directory_path: Existing directory
+        """
+        timestamp = datetime.datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
+        backup_path = f"{directory_path}.{timestamp}"
+        
+        self.notes.append(f"Directory {directory_path} exists, renaming to {backup_path}")
+        self.fs.rename(directory_path, backup_path)
+    
+    @property
+    def templates(self) -> TemplateSet:
+        """
+        Compiled file templates, loaded on first use.
+        
+        Raises:
+            ValueError: If the configured template directory is invalid
+        """
+        if self._templates is None:
+            self._templates = load_templates(self.config.get("templates"))
+        return self._templates
+    
+    def _render_template(self, template: str, **fields) -> str:
+        """
+        Render a file template with the configuration plus file-specific fields.
+        
+        Args:
+            template: Template name (e.g. TEMPLATE_PART)
+            fields: Fields for this file, overriding configuration values
+            
+        Returns:
+            Rendered file content
+        """
+        context = dict(self.config)
+        context.update(fields)
+        return self.templates.render(template, context)
+    
+    def create_main_tex_file(
+        self,
+        folder: str,
+        basename: str,
+        number_of_questions: int
+    ) -> None:
+        """
+        Create the main LaTeX document file.
+        
+        Args:
+            folder: Output directory path
+            basename: Base filename for main document
+            number_of_questions: Total number of questions to include
+            
+        Raises:
+            Exception: If file creation fails
+        """
+        file_path = Path(folder) / f"{basename}{TEX_EXTENSION}"
+        
+        try:
+            content = self._generate_main_tex_content(
+                basename=basename,
+                number_of_questions=number_of_questions
+            )
+            
+            with self.fs.open(file_path, 'w', encoding='utf-8') as file:
+                file.write(content)
+            self.files_written += 1
+                
+        except IOError as error:
+            raise Exception(f"Error creating main LaTeX file: {error}")
+    
+    def _generate_main_tex_content(
+        self,
+        basename: str,
+        number_of_questions: int
+    ) -> str:
+        """
+        Generate content for main LaTeX document.
+        
+        Args:
+            basename: Base filename
+            number_of_questions: Number of questions to include
+            
+        Returns:
+            Complete LaTeX document content as string
+        """
+        include_files = [f"{QUESTION_PREFIX}{i+1}" for i in range(number_of_questions)]
+        program = self.formats.program if self.formats is not None else MAIN_TEX_PROGRAM
+        return self._render_template(
+            TEMPLATE_MAIN,
+            basename=basename,
+            program=program,
+            dump=self.formats is not None,
+            includeonly=','.join(include_files),
+            questions=[{"id": name} for name in include_files]
+        )
+    
+    def create_question_files(
+        self,
+        folder: str,
+        basename: str,
+        question_number: str,
+        parts: Tuple[str, ...]
+    ) -> None:
+        """
+        Create LaTeX files for a question and its parts.
+        
+        Args:
+            folder: Output directory path
+            basename: Base filename for references
+            question_number: Question number as string
+            parts: Tuple of part identifiers (e.g., ('a', 'b', 'c'))
+            
+        Raises:
+            Exception: If file creation fails
+        """
+        try:
+            folder_path = Path(folder)
+            
+            # Generate question file content
+            question_content = self._generate_question_content(
+                basename, question_number, parts
+            )
+            
+            # Write main question file
+            question_filename = folder_path / f"{QUESTION_PREFIX}{question_number}{TEX_EXTENSION}"
+            with self.fs.open(question_filename, 'w', encoding='utf-8') as file:
+                file.write(question_content)
+            self.files_written += 1
+            
+            # Create part files
+            for part in parts:
+                part_filename = folder_path / f"{QUESTION_PREFIX}{question_number}{part}{TEX_EXTENSION}"
+                part_content = self._generate_part_content(
+                    basename, question_number, part
+                )
+                
+                with self.fs.open(part_filename, 'w', encoding='utf-8') as file:
+                    file.write(part_content)
+                self.files_written += 1
+                    
+        except IOError as error:
+            raise Exception(f"Error creating question files: {error}")
+    
+    def _generate_question_content(
+        self,
+        basename: str,
+        question_number: str,
+        parts: Tuple[str, ...]
+    ) -> str:
+        """
+        Generate content for question LaTeX file.
+        
+        Args:
+            basename: Base filename for root reference
+            question_number: Question number
+            parts: Part identifiers
+            
+        Returns:
+            Question file content as string
+        """
+        question_id = f"{QUESTION_PREFIX}{question_number}"
+        return self._render_template(
+            TEMPLATE_QUESTION,
+            basename=basename,
+            id=question_id,
+            question=question_number,
+            parts=[
+                {"id": f"{question_id}{part}", "part": chr(97 + ord(part) - ord('a'))}
+                for part in parts
+            ]
+        )
+    
+    def _generate_part_content(
+        self,
+        basename: str,
+        question_number: str,
+        part: str
+    ) -> str:
+        """
+        Generate content for a question part answer file.
+        
+        Args:
+            basename: Base filename for root reference
+            question_number: Question number
+            part: Part identifier
+            
+        Returns:
+            Part file content as string
+        """
+        return self._render_template(
+            TEMPLATE_PART,
+            basename=basename,
+            id=f"{QUESTION_PREFIX}{question_number}{part}",
+            question=question_number,
+            part=part
+        )
+    
+    def create_subparts(
+        self,
+        folder: str,
+        basename: str,
+        subparts_dict: Dict[str, int]
+    ) -> None:
+        """
+        Create subpart files for questions.
+        
+        Args:
+            folder: Output directory path  
+            basename: Base filename for references
+            subparts_dict: Dictionary mapping part IDs to subpart count
+            
+        Raises:
+            Exception: If file creation fails
+        """
+        try:
+            folder_path = Path(folder)
+            
+            for part_id, num_subparts in subparts_dict.items():
+                part_filename = folder_path / f"{part_id}{TEX_EXTENSION}"
+                
+                if self.fs.exists(part_filename):
+                    # Append subpart structure to existing part file
+                    subpart_content = self._generate_subpart_content(
+                        basename, part_id, num_subparts
+                    )
+                    
+                    with self.fs.open(part_filename, 'a', encoding='utf-8') as file:
+                        file.write(subpart_content)
+                    
+                    # Create individual subpart files
+                    for i in range(num_subparts):
+                        subpart_filename = folder_path / f"{part_id}_{i}{TEX_EXTENSION}"
+                        subpart_file_content = self._generate_subpart_file_content(
+                            basename, part_id, i
+                        )
+                        
+                        with self.fs.open(subpart_filename, 'w', encoding='utf-8') as file:
+                            file.write(subpart_file_content)
+                        self.files_written += 1
+                            
+        except IOError as error:
+            raise Exception(f"Error creating subpart files: {error}")
+    
+    def _generate_subpart_content(
+        self,
+        basename: str,
+        part_id: str,
+        num_subparts: int
+    ) -> str:
+        """
+        Generate subpart structure content.
+        
+        Args:
+            basename: Base filename
+            part_id: Part identifier
+            num_subparts: Number of subparts to create
+            
+        Returns:
+            Subpart structure as string
+        """
+        return self._render_template(
+            TEMPLATE_SUBPARTS,
+            basename=basename,
+            id=part_id,
+            subparts=[
+                {"id": f"{part_id}_{i}", "index": i, "number": i + 1}
+                for i in range(num_subparts)
+            ]
+        )
+    
+    def _generate_subpart_file_content(
+        self,
+        basename: str,
+        part_id: str,
+        index: int
+    ) -> str:
+        """
+        Generate content for a subpart answer file.
+        
+        Args:
+            basename: Base filename for root reference
+            part_id: Part identifier (e.g., 'q1a')
+            index: Zero-based subpart index
+            
+        Returns:
+            Subpart file content as string
+        """
+        return self._render_template(
+            TEMPLATE_SUBPART,
+            basename=basename,
+            id=f"{part_id}_{index}",
+            part_id=part_id,
+            index=index,
+            number=index + 1
+        )
+    
+    def copy_style_files(self, output_folder: str) -> List[str]:
+        """
+        Write the style files shipped with every project to the output folder.
+        
+        Args:
+            output_folder: Destination directory for style files
+            
+        Returns:
+            List of copied style file names
+            
+        Raises:
+            Exception: If file copying fails
+        """
+        copied_files = []
+        output_path = Path(output_folder)
+        
+        try:
+            for entry in self.styles.entries():
+                self.styles.deploy(entry, output_path / entry.path)
+                copied_files.append(entry.path)
+                self.files_written += 1
+                
+        except (IOError, OSError) as error:
+            raise Exception(f"Error copying style files: {error}")
+            
+        return copied_files
+    
+    @staticmethod
+    def prepare_generation_data(
+        structure: Structure
+    ) -> Tuple[List[Tuple[str, ...]], Dict[str, int]]:
+        """
+        Prepare data structures for LaTeX file generation.
+        
+        Args:
+            structure: Question structure (the older nested dictionary form
+                is also accepted)
+            
+        Returns:
+            Tuple of (parts_list, subparts_dict)
+        """
+        structure = as_structure(structure)
+        parts_list = []
+        subparts_dict = {}
+        
+        for question in structure.questions:
+            parts_list.append(tuple(part.name for part in question.parts))
+            for part in question.parts:
+                if part.subparts:
+                    subparts_dict[f"{QUESTION_PREFIX}{question.number}{part.name}"] = len(part.subparts)
+        
+        return parts_list, subparts_dict
+    
+    def iter_render(self, structure: Structure) -> Iterator[PlanEntry]:
+        """
+        Render the project file by file, in write order.
+        
+        Part files include their subpart structure directly, so every
+        rendered file is complete and is written with a single open.
+        
+        Args:
+            structure: Question structure (the older nested dictionary form
+                is also accepted)
+            
+        Yields:
+            One rendered file at a time
+            
+        Raises:
+            Exception: If the style files cannot be read
+        """
+        structure = as_structure(structure)
+        
+        yield self.render_main(len(structure.questions))
+        for question in structure.questions:
+            yield from self.render_question(question)
+        
+        try:
+            style_entries = self.styles.entries()
+        except (IOError, OSError) as error:
+            raise Exception(f"Error reading style files: {error}")
+        
+        yield from style_entries
+    
+    def render_main(self, number_of_questions: int) -> PlanEntry:
+        """
+        Render the main document file.
+        
+        Args:
+            number_of_questions: Number of questions it includes
+            
+        Returns:
+            Rendered main file
+        """
+        basename = self.config["basename"]
+        main_content = self._generate_main_tex_content(
+            basename=basename,
+            number_of_questions=number_of_questions
+        )
+        return PlanEntry(f"{basename}{TEX_EXTENSION}", main_content.encode('utf-8'), KIND_MAIN)
+    
+    def render_question(self, question: Question, number: Optional[str] = None) -> Iterator[PlanEntry]:
+        """
+        Render the question, part and subpart files of one question.
+        
+        Each question's files depend only on the question itself, so they
+        can be rendered (and cached) independently of the others.
+        
+        Args:
+            question: Question to render
+            number: Question number written into file names and content
+                (default: question.number)
+            
+        Yields:
+            Rendered files in write order
+        """
+        basename = self.config["basename"]
+        question_number = str(question.number) if number is None else number
+        
+        question_content = self._generate_question_content(
+            basename, question_number, tuple(part.name for part in question.parts)
+        )
+        yield PlanEntry(
+            f"{QUESTION_PREFIX}{question_number}{TEX_EXTENSION}",
+            question_content.encode('utf-8'),
+            KIND_QUESTION
+        )
+        
+        for part in question.parts:
+            part_id = f"{QUESTION_PREFIX}{question_number}{part.name}"
+            num_subparts = len(part.subparts)
+            
+            part_content = self._generate_part_content(
+                basename, question_number, part.name
+            )
+            if num_subparts:
+                part_content += self._generate_subpart_content(
+                    basename, part_id, num_subparts
+                )
+            yield PlanEntry(
+                f"{part_id}{TEX_EXTENSION}", part_content.encode('utf-8'), KIND_PART
+            )
+            
+            for index in range(num_subparts):
+                subpart_content = self._generate_subpart_file_content(
+                    basename, part_id, index
+                )
+                yield PlanEntry(
+                    f"{part_id}_{index}{TEX_EXTENSION}",
+                    subpart_content.encode('utf-8'),
+                    KIND_SUBPART
+                )
+    
+    def render_plan(
+        self,
+        structure: Structure
+    ) -> RenderPlan:
+        """
+        Render the complete project into memory without touching the output.
+        
+        Args:
+            structure: Question structure
+            
+        Returns:
+            Immutable render plan of every file in the project
+            
+        Raises:
+            Exception: If the style files cannot be read
+        """
+        return RenderPlan(self.iter_render(structure))
+    
+    def commit_plan(
+        self,
+        plan: RenderPlan,
+        folder: str,
+        incremental: bool = False,
+        skip_unchanged: Optional[bool] = None
+    ) -> DirectorySink:
+        """
+        Write a render plan into an output directory in one pass.
+        
+        In incremental mode existing answer files are kept, and anything the
+        student may need to adjust by hand is added to self.warnings. Files
+        whose content has not changed are skipped rather than rewritten,
+        which by default is the case whenever incremental is set.
+        
+        Args:
+            plan: Render plan to write
+            folder: Existing output directory
+            incremental: Keep existing answer files instead of overwriting them
+            skip_unchanged: Skip identical files (defaults to incremental)
+            
+        Returns:
+            The sink used, with written, preserved and skipped files
+            
+        Raises:
+            Exception: If writing fails
+        """
+        if skip_unchanged is None:
+            skip_unchanged = incremental
+        sink = DirectorySink(
+            folder, fs=self.fs, incremental=incremental,
+            skip_unchanged=skip_unchanged, styles=self.styles, store=self.store
+        )
+        try:
+            plan.commit(sink)
+            if incremental:
+                self.warnings.extend(self._check_incremental_update(plan, sink))
+        except (IOError, OSError) as error:
+            raise Exception(f"Error writing project files: {error}")
+        finally:
+            self.files_written += sink.files_written
+            self.files_skipped += len(sink.skipped)
+        return sink
+    
+    def write_project(
+        self,
+        plan: RenderPlan,
+        directory: str,
+        incremental: bool = False,
+        progress: Optional[ProgressCallback] = None
+    ) -> Tuple[str, DirectorySink]:
+        """
+        Write a render plan so the output only changes once every file is written.
+        
+        Files are written into a staging directory next to the output
+        (<output>.partial). A new project is then moved into place with one
+        rename, backing up any existing folder as create_directory() does;
+        an incremental update moves each written file into the existing
+        folder. If writing fails, or progress raises GenerationCancelled,
+        the staging directory is removed and the output is left as it was.
+        
+        Args:
+            plan: Render plan to write
+            directory: Output directory
+            incremental: Update an existing directory in place, keeping answer files
+            progress: Called with (files done, total files) after each file
+            
+        Returns:
+            Tuple of (actual output directory, sink used)
+            
+        Raises:
+            GenerationCancelled: If progress cancelled the run
+            Exception: If writing fails
+        """
+        directory_path = Path(directory).resolve()
+        staging_path = directory_path.with_name(directory_path.name + PARTIAL_SUFFIX)
+        # Left over from an interrupted run
+        shutil.rmtree(staging_path, ignore_errors=True)
+        
+        update = incremental and directory_path.is_dir()
+        if update:
+            sink = StagedDirectorySink(
+                str(directory_path), str(staging_path), fs=self.fs,
+                incremental=True, skip_unchanged=True, styles=self.styles, store=self.store
+            )
+        else:
+            sink = DirectorySink(str(staging_path), fs=self.fs, styles=self.styles, store=self.store)
+        
+        total = len(plan)
+        try:
+            self.fs.mkdir(staging_path, parents=True)
+            for done, entry in enumerate(plan, start=1):
+                sink.write(entry)
+                if progress is not None:
+                    progress(done, total)
+            
+            if update:
+                sink.close()
+                self.warnings.extend(self._check_incremental_update(plan, sink))
+            else:
+                if directory_path.exists():
+                    self._backup_directory(directory_path)
+                self.fs.rename(staging_path, directory_path)
+        except (IOError, OSError) as error:
+            shutil.rmtree(staging_path, ignore_errors=True)
+            raise Exception(f"Error writing project files: {error}")
+        except BaseException:
+            # Cancelled, or interrupted
+            shutil.rmtree(staging_path, ignore_errors=True)
+            raise
+        finally:
+            self.files_written += sink.files_written
+            self.files_skipped += len(sink.skipped)
+        
+        return str(directory_path), sink
+    
+    def _check_incremental_update(self, plan: RenderPlan, sink: DirectorySink) -> List[str]:
+        """
+        Find follow-up work after an incremental update.
+        
+        Kept part files are not rewritten, so subparts added to an existing
+        part are not yet included by it; and answer files for questions or
+        parts that were removed are left in place.
+        
+        Args:
+            plan: Render plan that was written
+            sink: Directory sink that wrote it
+            
+        Returns:
+            Human-readable warnings
+        """
+        warnings = []
+        
+        for path in sink.preserved:
+            entry = plan.files[path]
+            if entry.kind != KIND_PART or b"\\input{" not in entry.data:
+                continue
+            existing = self.fs.read_bytes(sink.folder / path)
+            missing = [
+                line.decode('utf-8') for line in entry.data.splitlines()
+                if line.startswith(b"\\qsubpart") and line not in existing
+            ]
+            if missing:
+                warnings.append(
+                    f"{path} was kept unchanged; add these lines to include its new subparts: "
+                    + " ".join(missing)
+                )
+        
+        stale = sorted(
+            name for name in sink.existing
+            if name.endswith(TEX_EXTENSION) and name.startswith(QUESTION_PREFIX)
+            and name not in plan
+        )
+        if stale:
+            warnings.append(
+                f"No longer part of the structure and left in place: {', '.join(stale)}"
+            )
+        
+        return warnings
+    
+    def stream_to_sink(
+        self,
+        structure: Structure,
+        sink: OutputSink
+    ) -> str:
+        """
+        Render the project straight into an output sink, file by file.
+        
+        Nothing is staged: each file is handed to the sink as soon as it is
+        rendered, and the sink is finalised once every file is written.
+        
+        Args:
+            structure: Question structure
+            sink: Destination for the rendered files
+            
+        Returns:
+            Location of the finished output
+            
+        Raises:
+            Exception: If rendering or writing fails
+        """
+        try:
+            with sink:
+                for entry in self.iter_render(structure):
+                    sink.write(entry)
+                    self.files_written += 1
+        except (IOError, OSError) as error:
+            raise Exception(f"Error writing project files: {error}")
+        return sink.location
+    
+    def generate_project(
+        self,
+        structure: Structure,
+        archive: bool = False,
+        incremental: bool = False
+    ) -> str:
+        """
+        Generate a complete TMA project without any user interface.
+        
+        By default the whole project is rendered into a plan first, then the
+        output directory is created and the plan written with one open per
+        file. With archive=True the files are streamed into a single ZIP
+        archive named after the output setting instead. With
+        incremental=True an existing project is updated in place: new
+        question, part and subpart files are added, the DO-NOT-EDIT structure
+        files are rewritten, and existing answer files are never touched.
+        Files whose content is unchanged are not rewritten at all. If the
+        generator has a format cache, the preamble format is added to the
+        output directory.
+        
+        Args:
+            structure: Question structure
+            archive: Write a ZIP archive instead of a directory
+            incremental: Update an existing project directory in place
+            
+        Returns:
+            Actual output directory or archive path
+            
+        Raises:
+            Exception: If any generation step fails
+        """
+        if archive:
+            with self.fs.phase("stream"):
+                return self.stream_to_sink(
+                    structure, ZipSink(self.config["output"], fs=self.fs)
+                )
+        
+        with self.fs.phase("render"):
+            plan = self.render_plan(structure)
+        with self.fs.phase("directory"):
+            actual_folder = self.create_directory(
+                self.config["output"], incremental=incremental
+            )
+        with self.fs.phase("write"):
+            self.commit_plan(plan, actual_folder, incremental=incremental)
+        if self.formats is not None:
+            with self.fs.phase("format"):
+                try:
+                    self.formats.deploy_plan(plan, actual_folder)
+                except ValueError as error:
+                    raise Exception(f"Error precompiling the preamble: {error}")
+        return actual_folder
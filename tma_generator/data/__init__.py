@@ -0,0 +1,32 @@
+"""
+Files bundled with the TMA LaTeX Generator: the style files shipped with
+every project and the default file templates.
+"""
+
+from pathlib import Path
+
+
+def read_data(*names: str) -> bytes:
+    """
+    Read a bundled data file.
+    
+    Args:
+        names: Path components below this package (e.g. 'templates', 'main.tex')
+    
+    Returns:
+        File content
+    
+    Raises:
+        OSError: If the file does not exist
+    """
+    try:
+        # Deferred so importing the package stays cheap
+        from importlib.resources import files
+    except ImportError:  # Python 3.8
+        resource = Path(__file__).parent
+    else:
+        resource = files(__name__)
+    
+    for name in names:
+        resource = resource.joinpath(name)
+    return resource.read_bytes()
@@ -0,0 +1,303 @@
+"""
+Focused single-question builds for the TMA LaTeX Generator.
+
+The main file \\includes every question, so each compile typesets the
+whole TMA. A focused build compiles the same main file under its own job
+name (TMA-q3.pdf) with \\includeonly{q3}: LaTeX typesets only that
+question and restores the counters and labels of the others from their
+q<n>.aux files, so page numbers, equation numbers and cross-references
+match the full document while a compile costs one question.
+
+The .aux files come from a full build. The focus job starts from a copy
+of the full build's main .aux file, which lists every question's .aux
+file, and a full build is run first if any of them is missing.
+"""
+
+import re
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from .compile import (
+    COMPILE_TIMEOUT_SECONDS,
+    ENGINE_OPTIONS,
+    ENGINE_PDFLATEX,
+    CompileResult,
+    ProjectCompiler,
+    parse_log,
+)
+from .core import DEFAULT_CONFIG, QUESTION_PREFIX, TEX_EXTENSION
+from .log import LogSink, StreamLogSink
+from .preview import included_files
+
+
+# "q3", "Q3" or "3"; a part name after the number ("q3b") selects its question
+QUESTION_ARGUMENT_PATTERN = re.compile(r"^[qQ]?(\d+)[A-Za-z0-9_]*$")
+# Question files included by the main file, and every generated question file
+QUESTION_FILE_PATTERN = re.compile(rf"^{QUESTION_PREFIX}\d+$")
+GENERATED_FILE_PATTERN = re.compile(rf"^{QUESTION_PREFIX}\d+[A-Za-z0-9_]*$")
+# Precompiled format named on the first line of the main file
+FORMAT_LINE_PATTERN = re.compile(r"^%&(\S+)")
+# Labels or page references changed; LaTeX needs another run
+RERUN_PATTERN = re.compile(r"Rerun to get|Label\(s\) may have changed")
+MAX_RERUNS = 2
+
+
+def find_main_file(folder: str) -> str:
+    """
+    Find the main document of a generated project.
+    
+    Args:
+        folder: Project folder
+    
+    Returns:
+        Main document basename (without .tex)
+    
+    Raises:
+        ValueError: If the folder has no main document, or several and
+            none of them is the default TMA.tex
+    """
+    candidates = []
+    for path in sorted(Path(folder).glob("*" + TEX_EXTENSION)):
+        if GENERATED_FILE_PATTERN.match(path.stem):
+            continue
+        try:
+            if "\\documentclass" in path.read_text(encoding='utf-8', errors='replace'):
+                candidates.append(path.stem)
+        except OSError:
+            continue
+    
+    if len(candidates) == 1:
+        return candidates[0]
+    if DEFAULT_CONFIG["basename"] in candidates:
+        return DEFAULT_CONFIG["basename"]
+    if not candidates:
+        raise ValueError(f"No main .tex file found in {folder}")
+    raise ValueError(f"Several main .tex files in {folder}: {', '.join(candidates)}")
+
+
+def question_name(argument: str) -> str:
+    """
+    Normalise a question argument.
+    
+    Args:
+        argument: 'q3', 'Q3', '3' or a part such as 'q3b'
+    
+    Returns:
+        Question file stem, e.g. 'q3'
+    
+    Raises:
+        ValueError: If the argument does not name a question
+    """
+    match = QUESTION_ARGUMENT_PATTERN.match(argument.strip())
+    if match is None:
+        raise ValueError(f"'{argument}' is not a question (use e.g. q3)")
+    return f"{QUESTION_PREFIX}{int(match.group(1))}"
+
+
+class FocusCompiler:
+    """Compile one question of a generated project at a time."""
+    
+    def __init__(
+        self,
+        folder: str,
+        basename: Optional[str] = None,
+        engine: str = ENGINE_PDFLATEX,
+        timeout: float = COMPILE_TIMEOUT_SECONDS
+    ) -> None:
+        """
+        Initialize focus compiler.
+        
+        Args:
+            folder: Project folder
+            basename: Main document basename (default: found with find_main_file())
+            engine: TeX engine, one of ENGINES
+            timeout: Seconds before a compile is abandoned
+        
+        Raises:
+            ValueError: If the engine is unknown or not installed, or the
+                main file cannot be found
+        """
+        self.folder = Path(folder)
+        self.basename = basename or find_main_file(folder)
+        self.compiler = ProjectCompiler(engine=engine, use_latexmk=False, timeout=timeout)
+        self.engine = engine
+        self.timeout = timeout
+    
+    @property
+    def main_file(self) -> Path:
+        """Main document."""
+        return self.folder / (self.basename + TEX_EXTENSION)
+    
+    def questions(self) -> List[str]:
+        """
+        Questions the main file includes.
+        
+        Returns:
+            Question file stems in order, e.g. ['q1', 'q2']
+        
+        Raises:
+            OSError: If the main file cannot be read
+        """
+        return [
+            Path(name).stem for name in included_files(self.main_file.read_bytes())
+            if QUESTION_FILE_PATTERN.match(Path(name).stem)
+        ]
+    
+    def jobname(self, question: str) -> str:
+        """Job name of a focused build, e.g. 'TMA-q3'."""
+        return f"{self.basename}-{question}"
+    
+    def needs_full_build(self, questions: List[str]) -> bool:
+        """
+        Check whether the .aux files a focused build reuses exist.
+        
+        Args:
+            questions: Questions the main file includes
+        
+        Returns:
+            True if the main .aux file or any question's .aux file is missing
+        """
+        return any(
+            not (self.folder / (name + ".aux")).is_file()
+            for name in (self.basename, *questions)
+        )
+    
+    def command(self, question: str) -> List[str]:
+        """
+        Build the engine command for a focused build.
+        
+        \\includeonly is set before the main file is read and then disabled,
+        so the main file's own \\includeonly line has no effect.
+        
+        Args:
+            question: Question file stem, e.g. 'q3'
+        
+        Returns:
+            Command line
+        """
+        command = [self.engine, *ENGINE_OPTIONS, f"-jobname={self.jobname(question)}"]
+        try:
+            with open(self.main_file, 'r', encoding='utf-8', errors='replace') as file:
+                match = FORMAT_LINE_PATTERN.match(file.readline())
+        except OSError:
+            match = None
+        if match:
+            # %& is only read from a file named on the command line
+            command.append(f"-fmt={match.group(1)}")
+        command.append(
+            f"\\includeonly{{{question}}}\\def\\includeonly#1{{}}"
+            f"\\input{{{self.basename}{TEX_EXTENSION}}}"
+        )
+        return command
+    
+    def compile(self, question: str, log: Optional[LogSink] = None) -> CompileResult:
+        """
+        Compile one question.
+        
+        Args:
+            question: Question file stem, e.g. 'q3'
+            log: Destination for a note when a full build runs first
+        
+        Returns:
+            Exit code, page count, wall time and first error of the focused
+            build (including any full build it needed first)
+        
+        Raises:
+            ValueError: If the main file does not include the question
+            OSError: If the main file cannot be read
+        """
+        questions = self.questions()
+        if question not in questions:
+            raise ValueError(f"{self.main_file.name} does not include {question}")
+        
+        start = time.perf_counter()
+        if self.needs_full_build(questions):
+            if log is not None:
+                log.info(f"Compiling the whole of {self.main_file.name} first to record every question's counters")
+            full = self.compiler.compile(str(self.folder), self.basename)
+            if not full.ok:
+                return full._replace(seconds=time.perf_counter() - start)
+        
+        jobname = self.jobname(question)
+        full_aux = self.folder / (self.basename + ".aux")
+        focus_aux = self.folder / (jobname + ".aux")
+        if not focus_aux.is_file() or focus_aux.stat().st_mtime_ns < full_aux.stat().st_mtime_ns:
+            shutil.copyfile(full_aux, focus_aux)
+        
+        for _ in range(1 + MAX_RERUNS):
+            try:
+                completed = subprocess.run(
+                    self.command(question), cwd=self.folder,
+                    stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                    timeout=self.timeout
+                )
+                returncode = completed.returncode
+                error = ""
+            except subprocess.TimeoutExpired:
+                returncode = None
+                error = f"Timed out after {self.timeout:.0f}s"
+            except OSError as os_error:
+                returncode = None
+                error = str(os_error)
+            
+            try:
+                log_text = (self.folder / (jobname + ".log")).read_text(encoding='utf-8', errors='replace')
+            except OSError:
+                log_text = ""
+            if returncode != 0 or not RERUN_PATTERN.search(log_text):
+                break
+        
+        pages, log_error = parse_log(log_text)
+        if returncode != 0 and not error:
+            error = log_error or f"{self.engine} exited with code {returncode}"
+        return CompileResult(str(self.folder), returncode, pages, time.perf_counter() - start, error)
+
+
+def run_focus(
+    folder: str,
+    question: str,
+    engine: Optional[str] = None,
+    quiet: bool = False,
+    log: Optional[LogSink] = None
+) -> int:
+    """
+    Compile one question of a generated project into <basename>-<question>.pdf.
+    
+    Args:
+        folder: Project folder
+        question: Question to compile ('q3', '3', ...)
+        engine: TeX engine (default: pdflatex)
+        quiet: Only report the result, not a full build run first
+        log: Destination for the result (default: text on stdout/stderr)
+    
+    Returns:
+        Process exit code (0 if the question compiled, 2 if no compiler or
+        main file)
+    """
+    log = log or StreamLogSink()
+    try:
+        compiler = FocusCompiler(folder, engine=engine or ENGINE_PDFLATEX)
+    except ValueError as error:
+        log.error(f"Focus Error: {error}")
+        log.flush()
+        return 2
+    
+    try:
+        name = question_name(question)
+        result = compiler.compile(name, log=None if quiet else log)
+    except (OSError, ValueError) as error:
+        log.error(f"Focus Error: {error}")
+        log.flush()
+        return 1
+    
+    pdf = compiler.jobname(name) + ".pdf"
+    if result.ok:
+        pages = f"{result.pages} pages" if result.pages is not None else "no PDF"
+        log.info(f"Compiled {name} of {folder} into {pdf}: {pages} in {result.seconds:.2f}s")
+    else:
+        log.error(f"{name} of {folder} failed to compile (exit code {result.returncode}): {result.error}")
+    log.flush()
+    return 0 if result.ok else 1
@@ -0,0 +1,267 @@
+"""
+Precompiled preamble formats for the TMA LaTeX Generator.
+
+tma.sty and tma-extras.sty load dozens of packages, so most of a compile
+is spent reading the preamble. A format (.fmt) is a memory dump of TeX
+after the preamble has been read: a document whose first line is
+``%&tma-preamble`` starts from the dump instead of loading every package
+again.
+
+Formats are built with the mylatexformat package from the preamble of the
+rendered main file, up to its ``\\endofdump`` line; the per-student lines
+after it (\\myname, \\mypin, ...) are read on every compile as usual. Built
+formats are cached on disk keyed by the preamble, the style file hashes,
+the engine and its version, so a run builds each format once and every
+project gets a hardlink (or copy) of it.
+"""
+
+import hashlib
+import os
+import subprocess
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .compile import ENGINE_PDFLATEX, ENGINES, parse_log
+from .iostats import FileOps
+from .plan import KIND_MAIN, KIND_STYLE, PlanEntry
+from .spec import default_cache_dir
+
+
+# Format file, and the main file lines that select and end it
+FORMAT_NAME = "tma-preamble"
+FORMAT_EXTENSION = ".fmt"
+FORMAT_PROGRAM = f"%&{FORMAT_NAME}"
+DUMP_MARKER = "\\endofdump"
+FORMAT_BUILD_TIMEOUT_SECONDS = 300
+
+# Bump when the way formats are built changes
+FORMAT_CACHE_VERSION = 1
+
+
+@lru_cache(maxsize=None)
+def engine_version(engine: str) -> str:
+    """
+    First line of an engine's --version output, read once per process.
+    
+    Args:
+        engine: TeX engine, one of ENGINES
+    
+    Returns:
+        Version line
+    
+    Raises:
+        ValueError: If the engine is not installed
+    """
+    try:
+        completed = subprocess.run(
+            [engine, "--version"], stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=60
+        )
+    except (OSError, subprocess.TimeoutExpired) as error:
+        raise ValueError(f"Could not run {engine}: {error}")
+    return completed.stdout.decode('utf-8', errors='replace').partition("\n")[0].strip()
+
+
+def extract_preamble(main: PlanEntry) -> str:
+    """
+    Get the part of a rendered main file that goes into the format.
+    
+    Args:
+        main: Rendered main file
+    
+    Returns:
+        Lines between the %& line and \\endofdump, without comment lines
+    
+    Raises:
+        ValueError: If the main file does not start with the %& line or has
+            no \\endofdump line (e.g. a department main.tex template
+            without the {{#program}} and {{#dump}} sections)
+    """
+    lines = main.data.decode('utf-8').splitlines()
+    if not lines or lines[0] != FORMAT_PROGRAM:
+        raise ValueError(
+            f"{main.path} must start with {FORMAT_PROGRAM}; put {{{{#program}}}} on "
+            f"the first line of the main.tex template"
+        )
+    try:
+        end = lines.index(DUMP_MARKER)
+    except ValueError:
+        raise ValueError(
+            f"{main.path} has no {DUMP_MARKER} line; add {{{{#dump}}}} after "
+            f"\\usepackage in the main.tex template"
+        )
+    return "".join(
+        line + "\n" for line in lines[1:end] if line.strip() and not line.lstrip().startswith("%")
+    )
+
+
+class FormatCache:
+    """
+    On-disk cache of preamble formats for one engine.
+    
+    Formats are built in a private temporary directory and moved into
+    place with one rename, so concurrent runs and worker processes never
+    see a half-written format; at worst two of them build the same one.
+    """
+    
+    def __init__(
+        self,
+        engine: str = ENGINE_PDFLATEX,
+        directory: Optional[str] = None,
+        fs: Optional[FileOps] = None
+    ) -> None:
+        """
+        Initialize format cache.
+        
+        Args:
+            engine: TeX engine the formats are built for, one of ENGINES
+            directory: Cache directory (default: default_cache_dir('formats'))
+            fs: Filesystem operations to use when deploying formats
+        
+        Raises:
+            ValueError: If the engine is unknown
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown TeX engine '{engine}' (use {', '.join(ENGINES)})")
+        self.engine = engine
+        self.program = FORMAT_PROGRAM
+        self.directory = Path(directory) if directory else default_cache_dir("formats")
+        self.fs = fs or FileOps()
+        self.built = 0
+        self.hits = 0
+        self.linked = 0
+        self.copied = 0
+    
+    def key(self, preamble: str, styles: Iterable[PlanEntry]) -> str:
+        """
+        Cache key of a format.
+        
+        Args:
+            preamble: Preamble from extract_preamble()
+            styles: Style files the preamble loads
+        
+        Returns:
+            Hex digest of everything the format depends on
+        """
+        digest = hashlib.sha256()
+        for value in (str(FORMAT_CACHE_VERSION), self.engine, engine_version(self.engine), preamble):
+            digest.update(value.encode('utf-8') + b"\0")
+        for entry in sorted(styles):
+            digest.update(entry.path.encode('utf-8') + b"\0" + entry.digest.encode('ascii') + b"\0")
+        return digest.hexdigest()
+    
+    def ensure(self, preamble: str, styles: List[PlanEntry]) -> Path:
+        """
+        Get the cached format for a preamble, building it if needed.
+        
+        Args:
+            preamble: Preamble from extract_preamble()
+            styles: Style files the preamble loads
+        
+        Returns:
+            Path of the cached .fmt file
+        
+        Raises:
+            ValueError: If the engine is not installed or the format cannot be built
+        """
+        path = self.directory / (self.key(preamble, styles) + FORMAT_EXTENSION)
+        if path.is_file():
+            self.hits += 1
+            return path
+        
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=self.directory, prefix="build-") as build_dir:
+            build = Path(build_dir)
+            for entry in styles:
+                (build / entry.path).write_bytes(entry.data)
+            (build / (FORMAT_NAME + ".tex")).write_text(
+                preamble + "\\begin{document}\n\\end{document}\n", encoding='utf-8'
+            )
+            
+            command = [
+                self.engine, "-ini", f"-jobname={FORMAT_NAME}",
+                "-interaction=nonstopmode", "-halt-on-error",
+                f"&{self.engine}", "mylatexformat.ltx", FORMAT_NAME + ".tex"
+            ]
+            try:
+                completed = subprocess.run(
+                    command, cwd=build, stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                    timeout=FORMAT_BUILD_TIMEOUT_SECONDS
+                )
+            except (OSError, subprocess.TimeoutExpired) as error:
+                raise ValueError(f"Could not build the {FORMAT_NAME} format with {self.engine}: {error}")
+            
+            built = build / (FORMAT_NAME + FORMAT_EXTENSION)
+            if completed.returncode != 0 or not built.is_file():
+                try:
+                    log_text = (build / (FORMAT_NAME + ".log")).read_text(encoding='utf-8', errors='replace')
+                except OSError:
+                    log_text = ""
+                error = parse_log(log_text)[1] or f"{self.engine} exited with code {completed.returncode}"
+                raise ValueError(f"Could not build the {FORMAT_NAME} format: {error}")
+            os.replace(built, path)
+        
+        self.built += 1
+        return path
+    
+    def ensure_plan(self, plan: Iterable[PlanEntry]) -> Path:
+        """
+        Get the cached format for a render plan's preamble, building it if needed.
+        
+        Args:
+            plan: Render plan of a project
+        
+        Returns:
+            Path of the cached .fmt file
+        
+        Raises:
+            ValueError: If the plan has no main file or cannot be dumped
+        """
+        entries = list(plan)
+        main = next((entry for entry in entries if entry.kind == KIND_MAIN), None)
+        if main is None:
+            raise ValueError("Render plan has no main file")
+        return self.ensure(
+            extract_preamble(main), [entry for entry in entries if entry.kind == KIND_STYLE]
+        )
+    
+    def deploy_plan(self, plan: Iterable[PlanEntry], folder: Union[str, Path]) -> Path:
+        """
+        Put the format for a render plan's preamble into its project folder.
+        
+        The format is hardlinked from the cache where possible, otherwise
+        copied. TeX only ever reads it, so sharing one file is safe.
+        
+        Args:
+            plan: Render plan of the project
+            folder: Project folder
+        
+        Returns:
+            Path of the deployed format
+        
+        Raises:
+            ValueError: If the plan has no main file or cannot be dumped
+        """
+        source = self.ensure_plan(plan)
+        destination = Path(folder) / (FORMAT_NAME + FORMAT_EXTENSION)
+        if self.fs.exists(destination):
+            self.fs.remove(destination)
+        try:
+            self.fs.link(source, destination)
+            self.linked += 1
+        except OSError:
+            self.fs.copy2(source, destination)
+            self.copied += 1
+        return destination
+    
+    def summary(self) -> Dict[str, int]:
+        """
+        Count format builds and deployments.
+        
+        Returns:
+            Dictionary with built, hits, linked and copied counts
+        """
+        return {"built": self.built, "hits": self.hits, "linked": self.linked, "copied": self.copied}
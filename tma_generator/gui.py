@@ -0,0 +1,1679 @@
+"""
+Tkinter user interface for the TMA LaTeX Generator.
+
+Importing this module requires tkinter. Headless code should import from
+tma_generator.core instead.
+"""
+
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox, scrolledtext
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .core import DEFAULT_CONFIG, ConfigManager, GenerationCancelled, LaTeXFileGenerator
+from .log import LEVEL_INFO, LEVEL_PREFIXES, LEVEL_WARNING, LogRecord, LogSink
+from .plan import KIND_STYLE
+from .preview import ProjectPreview
+from .spec import SPEC_FORMATS, SpecCache, SpecLoader
+from .structure import EXPECTED_TOTAL_MARKS, Structure
+from .validation import SEVERITY_ERROR, SEVERITY_WARNING, IncrementalValidator, ValidationReport
+
+
+# GUI window constants
+DEFAULT_WINDOW_SIZE = "800x900"
+TOOLTIP_DELAY_MS = 500
+TOOLTIP_STYLE = {
+    'background': '#ffffe0',
+    'relief': 'solid',
+    'borderwidth': 1,
+    'wraplength': 300,
+    'font': ("Arial", "9", "normal")
+}
+
+# GUI styling constants
+MAIN_FRAME_PADDING = "10"
+BUTTON_PADX = 5
+ENTRY_PADY = 2
+SEPARATOR_PADY = 10
+
+# Question editor: fixed row height lets the list create widgets only for
+# visible rows. Fields: (key, label, default, entry width, tooltip)
+QUESTION_ROW_HEIGHT = 74
+QUESTION_ROW_PADY = 4
+QUESTION_LIST_HEIGHT = 200
+QUESTION_FIELDS = (
+    ("marks", "Marks:", "25", 5, "Total marks for this question (e.g., 25, 30, 15)"),
+    ("parts", "Parts:", "a,b,c,d", 20, "Question parts separated by commas\nExamples: 'a,b,c,d' or 'a,b' or 'a,b,c,d,e,f'"),
+    ("subparts", "Subparts (part:subparts):", "", 15, "Subparts for each part using format: part:sub1,sub2\nExamples:\n'a:i,ii,iii' or 'a:i,ii;c:1,2,3'\nLeave blank if no subparts"),
+)
+
+# Live validation: delay after the last keystroke, and inline marker colours
+LIVE_VALIDATION_DELAY_MS = 300
+MARKER_COLOURS = {SEVERITY_ERROR: "#c0392b", SEVERITY_WARNING: "#b9770e"}
+
+# Output pane: messages are inserted at most once per frame (~60 fps)
+LOG_FRAME_MS = 16
+
+# Preview pane: only redrawn while visible, and settings edits are debounced
+PREVIEW_DELAY_MS = 300
+
+# Background generation: how often the worker queue is drained, and its events
+WORKER_POLL_MS = 50
+EVENT_LOG = "log"
+EVENT_PROGRESS = "progress"
+EVENT_DONE = "done"
+EVENT_CANCELLED = "cancelled"
+EVENT_ERROR = "error"
+
+
+class ToolTip:
+    """
+    Create a tooltip for any tkinter widget.
+    
+    Provides hover tooltips that display helpful information about widgets.
+    Tooltips appear when mouse enters widget and disappear when mouse leaves.
+    """
+    
+    def __init__(self, widget: tk.Widget, text: str = '') -> None:
+        """
+        Initialize tooltip for a widget.
+        
+        Args:
+            widget: The tkinter widget to attach tooltip to
+            text: The tooltip text to display
+        """
+        self.widget = widget
+        self.text = text
+        self.tooltip_window: Optional[tk.Toplevel] = None
+        
+        # Bind mouse events to show/hide tooltip
+        self.widget.bind("<Enter>", self.on_enter)
+        self.widget.bind("<Leave>", self.on_leave)
+    
+    def on_enter(self, event: Optional[tk.Event] = None) -> None:
+        """
+        Show tooltip when mouse enters widget.
+        
+        Args:
+            event: Tkinter event object (unused)
+        """
+        if not self.text:
+            return
+            
+        try:
+            # Get widget position for tooltip placement
+            x, y, _, _ = self.widget.bbox("insert")
+            x += self.widget.winfo_rootx() + 25
+            y += self.widget.winfo_rooty() + 25
+        except tk.TclError:
+            # Widget doesn't support bbox, use alternative positioning
+            x = self.widget.winfo_rootx() + 25
+            y = self.widget.winfo_rooty() + 25
+        
+        # Create tooltip window
+        self.tooltip_window = tooltip = tk.Toplevel(self.widget)
+        tooltip.wm_overrideredirect(True)
+        tooltip.wm_geometry(f"+{x}+{y}")
+        
+        # Create and pack tooltip label
+        label = tk.Label(
+            tooltip,
+            text=self.text,
+            justify='left',
+            **TOOLTIP_STYLE
+        )
+        label.pack(ipadx=5, ipady=3)
+    
+    def on_leave(self, event: Optional[tk.Event] = None) -> None:
+        """
+        Hide tooltip when mouse leaves widget.
+        
+        Args:
+            event: Tkinter event object (unused)
+        """
+        if self.tooltip_window:
+            self.tooltip_window.destroy()
+            self.tooltip_window = None
+    
+    def update_text(self, new_text: str) -> None:
+        """
+        Update tooltip text.
+        
+        Args:
+            new_text: New text to display in tooltip
+        """
+        self.text = new_text
+
+
+class QuestionListView:
+    """
+    Virtualized, scrollable list of question editor rows.
+    
+    Question values live in a plain list of dictionaries (the model); only
+    enough row widgets to fill the visible area are created, and they are
+    rebound to other questions as the list scrolls. Every row has the same
+    height, so the scroll region and the visible range are computed
+    directly instead of measuring widgets, and adding or removing a
+    question only touches the visible rows however many questions there are.
+    """
+    
+    def __init__(
+        self,
+        parent: tk.Widget,
+        on_remove: Callable[[int], None],
+        on_edit: Optional[Callable[[int], None]] = None,
+        marker: Optional[Callable[[int], Tuple[str, str, str]]] = None
+    ) -> None:
+        """
+        Initialize question list.
+        
+        Args:
+            parent: Parent widget for the canvas and scrollbar
+            on_remove: Called with a question's index when its Remove button is pressed
+            on_edit: Called with a question's index after one of its fields changes
+            marker: Returns (severity, summary, details) of the inline marker
+                shown under a question ("" summary for none)
+        """
+        self.on_remove = on_remove
+        self.on_edit = on_edit
+        self.marker = marker
+        self.rows: List[Dict[str, str]] = []
+        self._pool: List[Dict] = []
+        self._binding = False
+        
+        # Scroll one row per wheel step or arrow click
+        self.canvas = tk.Canvas(
+            parent, height=QUESTION_LIST_HEIGHT,
+            yscrollincrement=QUESTION_ROW_HEIGHT, highlightthickness=0
+        )
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self._yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.bind("<Configure>", self._on_resize)
+        self._bind_mousewheel(self.canvas)
+    
+    def __len__(self) -> int:
+        """Number of questions."""
+        return len(self.rows)
+    
+    def add(self, values: Optional[Dict[str, str]] = None) -> int:
+        """
+        Append a question and scroll it into view.
+        
+        Args:
+            values: Field values (default: the default question)
+        
+        Returns:
+            Index of the new question
+        """
+        row = {key: default for key, _, default, _, _ in QUESTION_FIELDS}
+        row.update(values or {})
+        self.rows.append(row)
+        self._update_scroll_region()
+        self.canvas.yview_moveto(1.0)
+        self.refresh()
+        return len(self.rows) - 1
+    
+    def remove(self, index: int) -> None:
+        """
+        Remove a question; later questions are renumbered as they are shown.
+        
+        Args:
+            index: Index of the question
+        """
+        del self.rows[index]
+        self._update_scroll_region()
+        self._unbind_rows()
+        self.refresh()
+    
+    def set_rows(self, rows: List[Dict[str, str]]) -> None:
+        """
+        Replace every question.
+        
+        Args:
+            rows: Field values of each question
+        """
+        self.rows = [dict(row) for row in rows]
+        self._update_scroll_region()
+        self.canvas.yview_moveto(0.0)
+        self._unbind_rows()
+        self.refresh()
+    
+    def _update_scroll_region(self) -> None:
+        """Size the scroll region from the number of questions."""
+        self.canvas.configure(scrollregion=(
+            0, 0, self.canvas.winfo_width(), len(self.rows) * QUESTION_ROW_HEIGHT
+        ))
+    
+    def _unbind_rows(self) -> None:
+        """Make every row widget reload its question on the next refresh."""
+        for row_widget in self._pool:
+            row_widget['index'] = None
+    
+    def _on_resize(self, event: tk.Event) -> None:
+        """Fit the rows to a resized canvas."""
+        self._update_scroll_region()
+        self.refresh()
+    
+    def _yview(self, *args) -> None:
+        """Scroll the canvas, then rebind rows to the questions now visible."""
+        self.canvas.yview(*args)
+        self.refresh()
+    
+    def _bind_mousewheel(self, widget: tk.Widget) -> None:
+        """Scroll the list with the mouse wheel over a widget."""
+        widget.bind("<MouseWheel>", lambda e: self._yview("scroll", -1 if e.delta > 0 else 1, "units"))
+        widget.bind("<Button-4>", lambda e: self._yview("scroll", -1, "units"))
+        widget.bind("<Button-5>", lambda e: self._yview("scroll", 1, "units"))
+    
+    def refresh(self) -> None:
+        """Bind the row widgets to the questions in the visible area."""
+        height = max(self.canvas.winfo_height(), QUESTION_LIST_HEIGHT)
+        visible = height // QUESTION_ROW_HEIGHT + 2
+        if len(self._pool) < visible:
+            while len(self._pool) < visible:
+                self._pool.append(self._create_row())
+            self._unbind_rows()
+        
+        top = self.canvas.canvasy(0)
+        first = max(0, int(top // QUESTION_ROW_HEIGHT))
+        width = self.canvas.winfo_width()
+        
+        # Question i always uses pool slot i % pool size, so scrolling by a
+        # row only rebinds the one widget that wrapped around
+        for index in range(first, first + len(self._pool)):
+            row_widget = self._pool[index % len(self._pool)]
+            if index >= len(self.rows):
+                row_widget['index'] = None
+                self.canvas.itemconfigure(row_widget['item'], state='hidden')
+                continue
+            
+            self.canvas.coords(row_widget['item'], 0, index * QUESTION_ROW_HEIGHT)
+            self.canvas.itemconfigure(row_widget['item'], state='normal', width=width)
+            if row_widget['index'] != index:
+                self._bind_row(row_widget, index)
+    
+    def _bind_row(self, row_widget: Dict, index: int) -> None:
+        """
+        Show a question in a row widget.
+        
+        Args:
+            row_widget: Pooled row widget
+            index: Index of the question to show
+        """
+        row_widget['index'] = index
+        row_widget['frame'].configure(text=f"Question {index + 1}")
+        self._binding = True
+        try:
+            for key, _, _, _, _ in QUESTION_FIELDS:
+                row_widget['vars'][key].set(self.rows[index][key])
+        finally:
+            self._binding = False
+        self._show_marker(row_widget)
+    
+    def update_marker(self, index: int) -> None:
+        """
+        Redraw a question's inline marker if the question is visible.
+        
+        Args:
+            index: Index of the question
+        """
+        if self._pool:
+            row_widget = self._pool[index % len(self._pool)]
+            if row_widget['index'] == index:
+                self._show_marker(row_widget)
+    
+    def _show_marker(self, row_widget: Dict) -> None:
+        """Show the marker of the question bound to a row widget."""
+        severity, summary, details = ("", "", "")
+        if self.marker is not None:
+            severity, summary, details = self.marker(row_widget['index'])
+        row_widget['marker'].configure(
+            text=summary, foreground=MARKER_COLOURS.get(severity, "")
+        )
+        row_widget['marker_tip'].update_text(details)
+    
+    def _create_row(self) -> Dict:
+        """
+        Create one pooled row widget.
+        
+        Returns:
+            Row widget: its frame, canvas item, field variables and bound index
+        """
+        row_widget = {'index': None, 'vars': {}}
+        frame = ttk.LabelFrame(self.canvas, text="")
+        details_frame = ttk.Frame(frame)
+        details_frame.pack(fill=tk.X, padx=5, pady=2)
+        
+        for key, label_text, _, width, tooltip in QUESTION_FIELDS:
+            ttk.Label(details_frame, text=label_text).pack(side=tk.LEFT)
+            
+            var = tk.StringVar()
+            var.trace_add("write", lambda *args, key=key, var=var: self._on_edit(row_widget, key, var))
+            entry = ttk.Entry(details_frame, textvariable=var, width=width)
+            entry.pack(side=tk.LEFT, padx=(2, 10))
+            ToolTip(entry, tooltip)
+            row_widget['vars'][key] = var
+        
+        remove_button = ttk.Button(
+            details_frame,
+            text="Remove",
+            command=lambda: self._on_remove_clicked(row_widget)
+        )
+        remove_button.pack(side=tk.RIGHT)
+        ToolTip(remove_button, "Remove this question from the structure")
+        
+        # Inline validation marker; hover for every issue in the question
+        marker = ttk.Label(frame, text="", font=("Arial", 9))
+        marker.pack(fill=tk.X, padx=5)
+        row_widget['marker'] = marker
+        row_widget['marker_tip'] = ToolTip(marker, "")
+        
+        for widget in (frame, details_frame):
+            self._bind_mousewheel(widget)
+        
+        row_widget['frame'] = frame
+        row_widget['item'] = self.canvas.create_window(
+            0, 0, window=frame, anchor="nw",
+            height=QUESTION_ROW_HEIGHT - QUESTION_ROW_PADY, state='hidden'
+        )
+        return row_widget
+    
+    def _on_remove_clicked(self, row_widget: Dict) -> None:
+        """Ask to remove the question shown in a row widget."""
+        if row_widget['index'] is not None:
+            self.on_remove(row_widget['index'])
+    
+    def _on_edit(self, row_widget: Dict, key: str, var: tk.StringVar) -> None:
+        """Copy an edited field back into the model."""
+        if not self._binding and row_widget['index'] is not None:
+            self.rows[row_widget['index']][key] = var.get()
+            if self.on_edit is not None:
+                self.on_edit(row_widget['index'])
+
+
+class TextLogSink(LogSink):
+    """
+    Log sink writing into a Tk text widget at most once per frame.
+    
+    The first message logged after a flush schedules a single flush
+    LOG_FRAME_MS later; every message logged until then is inserted with
+    one insert() and one see(), so long summaries redraw the widget once.
+    """
+    
+    def __init__(self, widget: tk.Text) -> None:
+        """
+        Initialize text widget log sink.
+        
+        Args:
+            widget: Text widget to append messages to
+        """
+        super().__init__(max_buffered=0)
+        self.widget = widget
+        self._pending: Optional[str] = None
+    
+    def _schedule_flush(self) -> None:
+        """Schedule one flush for the next frame."""
+        if self._pending is None:
+            self._pending = self.widget.after(LOG_FRAME_MS, self._flush_frame)
+    
+    def _flush_frame(self) -> None:
+        """Flush at the end of a frame."""
+        self._pending = None
+        self.flush()
+    
+    def _emit(self, records: List[LogRecord]) -> None:
+        """Append the batch to the widget and scroll to the end."""
+        self.widget.insert(tk.END, "".join(
+            f"{LEVEL_PREFIXES.get(record.level, '')}{record.message}\n" for record in records
+        ))
+        self.widget.see(tk.END)
+    
+    def clear(self) -> None:
+        """Drop buffered messages and empty the widget."""
+        super().clear()
+        self.widget.delete(1.0, tk.END)
+
+
+class HelpDialog:
+    """
+    Comprehensive help dialog with usage instructions and examples.
+    
+    Displays a modal dialog containing detailed information about how to use
+    the TMA LaTeX Generator, including examples and troubleshooting tips.
+    """
+    
+    def __init__(self, parent: tk.Widget) -> None:
+        """
+        Initialize and display help dialog.
+        
+        Args:
+            parent: Parent widget for modal dialog
+        """
+        self.dialog = tk.Toplevel(parent)
+        self._setup_dialog(parent)
+        self._create_help_content()
+        self._center_dialog()
+    
+    def _setup_dialog(self, parent: tk.Widget) -> None:
+        """
+        Configure dialog window properties.
+        
+        Args:
+            parent: Parent widget for modal dialog
+        """
+        self.dialog.title("TMA LaTeX Generator - Help")
+        self.dialog.geometry("700x600")
+        self.dialog.resizable(True, True)
+        
+        # Make dialog modal
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+    
+    def _center_dialog(self) -> None:
+        """Centre dialogue on screen."""
+        self.dialog.update_idletasks()
+        screen_width = self.dialog.winfo_screenwidth()
+        screen_height = self.dialog.winfo_screenheight()
+        dialogue_width = self.dialog.winfo_width()
+        dialogue_height = self.dialog.winfo_height()
+        
+        x = (screen_width // 2) - (dialogue_width // 2)
+        y = (screen_height // 2) - (dialogue_height // 2)
+        self.dialog.geometry(f"+{x}+{y}")
+    
+    def _create_help_content(self) -> None:
+        """Create and populate help dialog content."""
+        # Main frame with padding
+        main_frame = ttk.Frame(self.dialog, padding=MAIN_FRAME_PADDING)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Title
+        title_label = ttk.Label(
+            main_frame,
+            text="TMA LaTeX Generator - User Guide",
+            font=("Arial", 14, "bold")
+        )
+        title_label.pack(pady=(0, 10))
+        
+        # Scrolled text widget for content
+        text_widget = scrolledtext.ScrolledText(
+            main_frame,
+            wrap=tk.WORD,
+            font=("Arial", 10),
+            height=30
+        )
+        text_widget.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        
+        # Insert help content
+        help_content = self._get_help_content()
+        text_widget.insert(tk.END, help_content)
+        text_widget.config(state=tk.DISABLED)  # Make read-only
+        
+        # Close button
+        close_button = ttk.Button(
+            main_frame,
+            text="Close",
+            command=self.dialog.destroy
+        )
+        close_button.pack(pady=(5, 0))
+    
+    def _get_help_content(self) -> str:
+        """
+        Generate comprehensive help content.
+        
+        Returns:
+            Formatted help text with examples and instructions
+        """
+        return """🎯 OVERVIEW
+
+The TMA LaTeX Generator creates structured LaTeX files for academic assignments, specifically designed for Overleaf. You manually specify the question structure, and the application generates all necessary files organised for easy editing and upload to Overleaf.
+
+📋 STEP-BY-STEP GUIDE
+
+1. BASIC SETTINGS
+   • Course Code: Your module code (e.g., MATH101, PHYS201, etc.)
+   • TMA Reference: Assignment number (e.g., 01, 02, 03, 04)
+   • Cut-off Date: Submission deadline (e.g., "21 January 2026")
+   • Your Name: Your full name as registered
+   • Student PIN: Your student identification number
+   • LaTeX Style: Style file to use (usually "tma")
+   • Output Directory: Where to save generated files
+   • Base Filename: Main file name (usually "TMA")
+
+2. QUESTION STRUCTURE
+   This is where you specify how your TMA is organised:
+
+   📝 MARKS FIELD
+   Enter the total marks for each question as a number.
+   Examples: 25, 30, 15, 20
+
+   📝 PARTS FIELD
+   List question parts separated by commas.
+   Examples:
+   • "a,b,c,d" - for parts (a), (b), (c), (d)
+   • "a,b" - for just parts (a), (b)
+   • "a,b,c,d,e,f" - for six parts
+
+   📝 SUBPARTS FIELD
+   Specify subparts for each part using the format: part:subparts
+   Multiple parts separated by semicolons.
+   Examples:
+   • "a:i,ii,iii" - part (a) has subparts (i), (ii), (iii)
+   • "a:i,ii;c:i,ii,iii,iv" - part (a) has 2 subparts, part (c) has 4
+   • "b:1,2,3" - part (b) has numbered subparts (1), (2), (3)
+   • Leave blank if no subparts needed
+
+3. COMPLETE EXAMPLES
+
+   📚 EXAMPLE 1: Simple Question
+   Question 1:
+   • Marks: 25
+   • Parts: a,b,c,d
+   • Subparts: (leave blank)
+   
+   This creates: Q1 with parts (a), (b), (c), (d), no subparts
+
+   📚 EXAMPLE 2: Complex Question
+   Question 1:
+   • Marks: 30
+   • Parts: a,b,c
+   • Subparts: a:i,ii,iii;c:i,ii
+   
+   This creates:
+   • Q1(a) with subparts (i), (ii), (iii)
+   • Q1(b) with no subparts
+   • Q1(c) with subparts (i), (ii)
+
+   📚 EXAMPLE 3: Mixed Numbering
+   Question 2:
+   • Marks: 20
+   • Parts: a,b
+   • Subparts: a:1,2,3,4;b:i,ii
+   
+   This creates:
+   • Q2(a) with subparts (1), (2), (3), (4)
+   • Q2(b) with subparts (i), (ii)
+
+4. COMMON TMA PATTERNS
+
+   🏫 TYPICAL ACADEMIC TMA STRUCTURE:
+   • 4 questions, 25 marks each
+   • Each question has 4 parts (a,b,c,d)
+   • Some parts may have subparts
+
+   📖 EXAMPLE TMA SETUP:
+   
+   Question 1: Marks=25, Parts=a,b,c,d, Subparts=a:i,ii;c:i,ii,iii
+   Question 2: Marks=25, Parts=a,b,c,d, Subparts=b:i,ii,iii
+   Question 3: Marks=25, Parts=a,b,c,d, Subparts=(blank)
+   Question 4: Marks=25, Parts=a,b,c,d, Subparts=d:i,ii
+
+5. GENERATED FILES
+
+   The application creates:
+   • Main LaTeX file (TMA.tex)
+   • Question files (q1.tex, q2.tex, etc.)
+   • Part files (q1a.tex, q1b.tex, etc.)
+   • Subpart files (q1a_0.tex, q1a_1.tex, etc.)
+
+6. CONTROLS
+
+   🔧 BUTTONS:
+   • Add Question: Creates a new question entry
+   • Clear All: Removes all questions (use carefully!)
+   • Generate TMA Files: Creates the LaTeX file structure
+   • Save Settings: Saves your configuration for next time
+   • Help: Shows this help dialog
+
+   ⚠️ TIPS:
+   • Start with one question to test your setup
+   • Save settings frequently to avoid re-entering information
+   • Check the output directory exists before generating
+   • Review the generated structure in the output log
+
+7. TROUBLESHOOTING
+
+   ❌ Common Issues:
+   • "No questions specified": Add at least one question
+   • "Invalid marks": Enter numbers only in marks field
+   • "Directory error": Check output directory path is valid
+   • "Generation failed": Check all fields are properly filled
+
+   ✅ Best Practices:
+   • Use consistent naming (lowercase for parts: a,b,c)
+   • Check subpart syntax carefully (part:sub1,sub2)
+   • Test with simple structure first
+   • Keep backup of your LaTeX style files
+
+📞 USING WITH OVERLEAF
+
+This tool generates files specifically for Overleaf:
+
+1. CREATE OVERLEAF PROJECT:
+   • Go to overleaf.com and sign in
+   • Click "New Project" → "Blank Project"
+   • Use the suggested project name from output
+   • (e.g., "MATH101 TMA 04 (2026)")
+
+2. UPLOAD GENERATED FILES:
+   • Delete the default main.tex file in Overleaf
+   • Upload ALL files from your output directory
+   • This includes .tex files and .sty style files
+   • Use drag & drop or the upload button
+
+3. COMPILE AND EDIT:
+   • Set TMA.tex as main document (if not automatic)
+   • Click "Recompile" to generate PDF
+   • Edit individual part files (q1a.tex, q1b.tex, etc.)
+   • View formatted output in PDF preview
+
+Overleaf provides automatic compilation, cloud storage, and professional formatting with the included style files. No local LaTeX installation required!
+        """
+
+class TMAGeneratorGUI:
+    """
+    Main GUI application for TMA LaTeX Generator.
+    
+    Provides user interface for configuring TMA structure and generating
+    LaTeX files. Includes tooltips, help system, and persistent settings.
+    """
+    
+    def __init__(self, root: tk.Tk) -> None:
+        """
+        Initialize the main GUI application.
+        
+        Args:
+            root: Main tkinter window
+        """
+        self.root = root
+        self.config = ConfigManager.load_config()
+        
+        # Per-question validation results, kept current as questions are edited
+        self.live_validator = IncrementalValidator(expected_total=None)
+        self._dirty_questions: Set[int] = set()
+        self._live_validation_job: Optional[str] = None
+        
+        # File tree preview, rendered per question and redrawn when visible
+        self.preview = ProjectPreview()
+        self.output_notebook: Optional[ttk.Notebook] = None
+        self._preview_job: Optional[str] = None
+        self._preview_text = ""
+        
+        # Background generation worker and the queue it reports through
+        self._generation_queue: "queue.Queue[Tuple]" = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        
+        self._setup_main_window()
+        self._create_widgets()
+    
+    def _setup_main_window(self) -> None:
+        """Configure main application window."""
+        self.root.title("TMA LaTeX Generator")
+        self.root.geometry(DEFAULT_WINDOW_SIZE)
+        
+        # Configure grid weights for responsive layout
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+    
+    def _create_widgets(self) -> None:
+        """Create and layout all GUI widgets."""
+        # Main container frame
+        main_frame = ttk.Frame(self.root, padding=MAIN_FRAME_PADDING)
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        main_frame.columnconfigure(1, weight=1)
+        
+        row = 0
+        
+        # Application title
+        row = self._create_title_section(main_frame, row)
+        
+        # Basic settings section
+        row = self._create_basic_settings_section(main_frame, row)
+        
+        # Question structure section
+        row = self._create_question_structure_section(main_frame, row)
+        
+        # Action buttons section
+        row = self._create_action_buttons_section(main_frame, row)
+        
+        # Output display section
+        self._create_output_section(main_frame, row)
+    
+    def _create_title_section(self, parent: ttk.Frame, row: int) -> int:
+        """
+        Create application title section.
+        
+        Args:
+            parent: Parent frame
+            row: Current grid row
+            
+        Returns:
+            Next available row number
+        """
+        title_label = ttk.Label(
+            parent,
+            text="TMA LaTeX Generator",
+            font=("Arial", 16, "bold")
+        )
+        title_label.grid(row=row, column=0, columnspan=3, pady=(0, 10))
+        row += 1
+        
+        # Separator
+        separator = ttk.Separator(parent, orient='horizontal')
+        separator.grid(
+            row=row, column=0, columnspan=3,
+            sticky=(tk.W, tk.E), pady=(0, SEPARATOR_PADY)
+        )
+        row += 1
+        
+        return row
+    
+    def _create_basic_settings_section(self, parent: ttk.Frame, row: int) -> int:
+        """
+        Create basic settings input fields.
+        
+        Args:
+            parent: Parent frame
+            row: Current grid row
+            
+        Returns:
+            Next available row number
+        """
+        # Setting field definitions with labels, config keys, widths and tooltips
+        settings_fields = [
+            ("Course Code:", "course", 15, "Your module code (e.g., MATH101, PHYS201, CHEM301)"),
+            ("TMA Reference:", "tma_ref", 10, "TMA assignment number (e.g., 01, 02, 03, 04)"),
+            ("Cut-off Date:", "cod", 15, "Assignment submission deadline (e.g., '21 January 2026', 'TBD')"),
+            ("Your Name:", "name", 30, "Your full name as registered with your institution"),
+            ("Student PIN:", "pin", 15, "Your student identification number (e.g., S1234567)"),
+            ("LaTeX Style:", "style", 10, "LaTeX style file to use (usually 'tma' for academic assignments)"),
+        ]
+        
+        # Create standard input fields
+        for label_text, config_key, width, tooltip_text in settings_fields:
+            row = self._create_labeled_entry(
+                parent, row, label_text, config_key, width, tooltip_text
+            )
+        
+        # Special handling for output directory (has browse button)
+        row = self._create_output_directory_field(parent, row)
+        
+        # Base filename field
+        row = self._create_labeled_entry(
+            parent, row, "Base Filename:", "basename", 15,
+            "Name for main LaTeX file (usually 'TMA'). Creates TMA.tex as main file."
+        )
+        
+        # Incremental update option
+        self.incremental_var = tk.BooleanVar(value=False)
+        incremental_check = ttk.Checkbutton(
+            parent,
+            text="Update existing project (keep my answers)",
+            variable=self.incremental_var
+        )
+        incremental_check.grid(row=row, column=1, sticky=tk.W, pady=ENTRY_PADY, padx=(5, 0))
+        ToolTip(
+            incremental_check,
+            "Update the output directory in place instead of renaming it to a backup.\n"
+            "New question, part and subpart files are added and the DO-NOT-EDIT\n"
+            "structure files are rewritten; your existing answer files are never touched."
+        )
+        row += 1
+        
+        return row
+    
+    def _create_labeled_entry(
+        self,
+        parent: ttk.Frame,
+        row: int,
+        label_text: str,
+        config_key: str,
+        width: int,
+        tooltip_text: str
+    ) -> int:
+        """
+        Create a labeled entry field with tooltip.
+        
+        Args:
+            parent: Parent frame
+            row: Current grid row
+            label_text: Text for field label
+            config_key: Configuration key for this field
+            width: Entry widget width
+            tooltip_text: Tooltip text to display
+            
+        Returns:
+            Next available row number
+        """
+        # Create label
+        ttk.Label(parent, text=label_text).grid(
+            row=row, column=0, sticky=tk.W, pady=ENTRY_PADY
+        )
+        
+        # Create entry field
+        var = tk.StringVar(value=self.config[config_key])
+        entry = ttk.Entry(parent, textvariable=var, width=width)
+        entry.grid(
+            row=row, column=1, sticky=tk.W,
+            pady=ENTRY_PADY, padx=(5, 0)
+        )
+        
+        # Store reference to variable
+        setattr(self, f"{config_key}_var", var)
+        
+        # Add tooltip
+        ToolTip(entry, tooltip_text)
+        
+        return row + 1
+    
+    def _create_output_directory_field(self, parent: ttk.Frame, row: int) -> int:
+        """
+        Create output directory field with browse button.
+        
+        Args:
+            parent: Parent frame
+            row: Current grid row
+            
+        Returns:
+            Next available row number
+        """
+        # Label
+        ttk.Label(parent, text="Output Directory:").grid(
+            row=row, column=0, sticky=tk.W, pady=ENTRY_PADY
+        )
+        
+        # Entry field
+        self.output_var = tk.StringVar(value=self.config["output"])
+        output_entry = ttk.Entry(parent, textvariable=self.output_var, width=30)
+        output_entry.grid(
+            row=row, column=1, sticky=(tk.W, tk.E),
+            pady=ENTRY_PADY, padx=(5, 0)
+        )
+        ToolTip(output_entry, "Directory where LaTeX files will be created. Use Browse button or type path directly.")
+        
+        # Browse button
+        browse_button = ttk.Button(parent, text="Browse", command=self._browse_output)
+        browse_button.grid(row=row, column=2, pady=ENTRY_PADY, padx=(5, 0))
+        ToolTip(browse_button, "Click to select output directory")
+        
+        return row + 1
+    
+    def _create_question_structure_section(self, parent: ttk.Frame, row: int) -> int:
+        """
+        Create question structure configuration section.
+        
+        Args:
+            parent: Parent frame
+            row: Current grid row
+            
+        Returns:
+            Next available row number
+        """
+        # Section separator
+        separator = ttk.Separator(parent, orient='horizontal')
+        separator.grid(
+            row=row, column=0, columnspan=3,
+            sticky=(tk.W, tk.E), pady=SEPARATOR_PADY
+        )
+        row += 1
+        
+        # Section title
+        structure_label = ttk.Label(
+            parent,
+            text="Question Structure (Manual Input)",
+            font=("Arial", 12, "bold")
+        )
+        structure_label.grid(row=row, column=0, columnspan=3, pady=(0, 5))
+        row += 1
+        
+        # Control buttons
+        row = self._create_structure_control_buttons(parent, row)
+        
+        # Scrollable area for question inputs
+        row = self._create_scrollable_question_area(parent, row)
+        
+        return row
+    
+    def _create_structure_control_buttons(self, parent: ttk.Frame, row: int) -> int:
+        """
+        Create control buttons for question structure.
+        
+        Args:
+            parent: Parent frame
+            row: Current grid row
+            
+        Returns:
+            Next available row number
+        """
+        control_frame = ttk.Frame(parent)
+        control_frame.grid(row=row, column=0, columnspan=3, pady=5)
+        
+        # Button definitions: (text, command, tooltip)
+        buttons = [
+            ("Clear All", self._clear_structure, "Remove all questions from the structure (cannot be undone!)"),
+            ("Add Question", self._add_question, "Add a new question to the structure"),
+            ("Load Spec", self._load_spec, "Replace the questions with those in a JSON, TOML or YAML structure spec file"),
+            ("Help", self._show_help, "Show comprehensive help with examples and instructions"),
+        ]
+        
+        for text, command, tooltip in buttons:
+            button = ttk.Button(control_frame, text=text, command=command)
+            button.pack(side=tk.LEFT, padx=BUTTON_PADX)
+            ToolTip(button, tooltip)
+        
+        # Running marks total, updated as questions are edited
+        self.marks_total_var = tk.StringVar()
+        marks_total_label = ttk.Label(control_frame, textvariable=self.marks_total_var)
+        marks_total_label.pack(side=tk.LEFT, padx=(BUTTON_PADX * 3, 0))
+        ToolTip(marks_total_label, f"Sum of all question marks (should be {EXPECTED_TOTAL_MARKS})")
+        
+        return row + 1
+    
+    def _create_scrollable_question_area(self, parent: ttk.Frame, row: int) -> int:
+        """
+        Create scrollable area for question configuration widgets.
+        
+        Args:
+            parent: Parent frame
+            row: Current grid row
+            
+        Returns:
+            Next available row number
+        """
+        # Virtualized list: widgets only exist for the visible questions
+        self.question_list = QuestionListView(
+            parent, on_remove=self._remove_question,
+            on_edit=self._question_edited, marker=self._question_marker
+        )
+        self.structure_canvas = self.question_list.canvas
+        self.structure_scrollbar = self.question_list.scrollbar
+        
+        # Grid layout
+        self.structure_canvas.grid(
+            row=row, column=0, columnspan=2,
+            sticky=(tk.W, tk.E, tk.N, tk.S), pady=(5, 0)
+        )
+        self.structure_scrollbar.grid(
+            row=row, column=2,
+            sticky=(tk.N, tk.S), pady=(5, 0)
+        )
+        
+        # Add initial question
+        self._add_question()
+        
+        return row + 1
+    
+    def _create_action_buttons_section(self, parent: ttk.Frame, row: int) -> int:
+        """
+        Create main action buttons section.
+        
+        Args:
+            parent: Parent frame
+            row: Current grid row
+            
+        Returns:
+            Next available row number
+        """
+        # Section separator
+        separator = ttk.Separator(parent, orient='horizontal')
+        separator.grid(
+            row=row, column=0, columnspan=3,
+            sticky=(tk.W, tk.E), pady=SEPARATOR_PADY
+        )
+        row += 1
+        
+        # Button frame
+        button_frame = ttk.Frame(parent)
+        button_frame.grid(row=row, column=0, columnspan=3, pady=10)
+        
+        # Button definitions: (text, command, tooltip)
+        buttons = [
+            ("Generate TMA Files", self._generate_files, "Create the LaTeX file structure based on your question setup"),
+            ("Cancel", self._cancel_generation, "Stop generating; the output folder is left as it was"),
+            ("Save Settings", self._save_settings, "Save your current configuration to avoid re-entering next time"),
+            ("Exit", self.root.quit, "Close the application"),
+        ]
+        
+        action_buttons = []
+        for text, command, tooltip in buttons:
+            button = ttk.Button(button_frame, text=text, command=command)
+            button.pack(side=tk.LEFT, padx=BUTTON_PADX)
+            ToolTip(button, tooltip)
+            action_buttons.append(button)
+        
+        self.generate_button, self.cancel_button = action_buttons[:2]
+        self.cancel_button.configure(state=tk.DISABLED)
+        
+        return row + 1
+    
+    def _create_output_section(self, parent: ttk.Frame, row: int) -> None:
+        """
+        Create output display section.
+        
+        Args:
+            parent: Parent frame
+            row: Current grid row
+        """
+        # Output label
+        ttk.Label(parent, text="Output:").grid(
+            row=row, column=0, sticky=tk.W, pady=(10, 0)
+        )
+        row += 1
+        
+        # Progress of the running generation (files written / total)
+        self.progress_bar = ttk.Progressbar(parent, mode='determinate')
+        self.progress_bar.grid(
+            row=row, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(5, 0)
+        )
+        row += 1
+        
+        # Status messages and the file tree preview share the pane as tabs
+        self.output_notebook = ttk.Notebook(parent)
+        self.output_notebook.grid(
+            row=row, column=0, columnspan=3,
+            sticky=(tk.W, tk.E, tk.N, tk.S), pady=(5, 0)
+        )
+        
+        # Output text area
+        self.output_text = scrolledtext.ScrolledText(
+            self.output_notebook, width=70, height=15
+        )
+        self.output_notebook.add(self.output_text, text="Messages")
+        
+        # Status messages are buffered and inserted once per frame
+        self.log = TextLogSink(self.output_text)
+        
+        # Files and \include/\input tree that generating would produce
+        self.preview_text = scrolledtext.ScrolledText(
+            self.output_notebook, width=70, height=15, wrap=tk.NONE
+        )
+        self.preview_text.configure(state=tk.DISABLED)
+        self.output_notebook.add(self.preview_text, text="Preview")
+        ToolTip(
+            self.preview_text,
+            "Files that Generate would write, and which files include them.\n"
+            "Updated as you edit; nothing is written to disk."
+        )
+        
+        self.output_notebook.bind("<<NotebookTabChanged>>", lambda event: self._refresh_preview())
+        # Every setting in the form: the main file shows name, PIN, course and the rest
+        config_variables = [
+            getattr(self, f"{key}_var") for key in DEFAULT_CONFIG if hasattr(self, f"{key}_var")
+        ]
+        for variable in (*config_variables, self.incremental_var):
+            variable.trace_add("write", lambda *args: self._schedule_preview())
+    
+    def _browse_output(self) -> None:
+        """Open directory browser for output directory selection."""
+        directory = filedialog.askdirectory(title="Select Output Directory")
+        if directory:
+            self.output_var.set(directory)
+    
+    def _show_help(self) -> None:
+        """Display help dialog."""
+        HelpDialog(self.root)
+    
+    def _save_settings(self) -> None:
+        """Save current settings to configuration file."""
+        config = self._get_current_config()
+        
+        if ConfigManager.save_config(config):
+            self.config = config
+            messagebox.showinfo("Settings Saved", "Settings have been saved successfully!")
+        else:
+            messagebox.showerror("Error", "Could not save settings to file.")
+    
+    def _get_current_config(self) -> Dict[str, str]:
+        """
+        Get current configuration from GUI fields.
+        
+        Returns:
+            Configuration dictionary with current values
+        """
+        return {
+            "course": self.course_var.get(),
+            "tma_ref": self.tma_ref_var.get(),
+            "cod": self.cod_var.get(),
+            "name": self.name_var.get(),
+            "pin": self.pin_var.get(),
+            "style": self.style_var.get(),
+            "output": self.output_var.get(),
+            "basename": self.basename_var.get(),
+            # Not shown in the form; kept from the config file
+            "templates": self.config.get("templates", "")
+        }
+    
+    def _add_question(self) -> None:
+        """Add a new question to the structure."""
+        self._run_live_validation()
+        index = self.question_list.add()
+        self.live_validator.insert(index, self._question_input(index))
+        self.question_list.update_marker(index)
+        self._update_marks_total()
+        self._refresh_preview()
+    
+    def _set_questions(self, rows: List[Dict[str, str]]) -> None:
+        """
+        Replace every question.
+        
+        Args:
+            rows: Field values of each question
+        """
+        self._cancel_live_validation()
+        self.live_validator.reset((row["marks"], row["parts"], row["subparts"]) for row in rows)
+        self.question_list.set_rows(rows)
+        self._update_marks_total()
+        self._refresh_preview()
+    
+    def _question_input(self, index: int) -> Tuple[str, str, str]:
+        """Raw (marks, parts, subparts) of a question as entered."""
+        row = self.question_list.rows[index]
+        return row["marks"], row["parts"], row["subparts"]
+    
+    def _question_edited(self, index: int) -> None:
+        """
+        Schedule revalidation of an edited question.
+        
+        Validation is debounced: it runs once typing pauses for
+        LIVE_VALIDATION_DELAY_MS, and then only for the edited questions.
+        
+        Args:
+            index: Index of the edited question
+        """
+        self._dirty_questions.add(index)
+        if self._live_validation_job is not None:
+            self.root.after_cancel(self._live_validation_job)
+        self._live_validation_job = self.root.after(
+            LIVE_VALIDATION_DELAY_MS, self._run_live_validation
+        )
+    
+    def _cancel_live_validation(self) -> None:
+        """Drop pending revalidation (the questions are about to be replaced)."""
+        if self._live_validation_job is not None:
+            self.root.after_cancel(self._live_validation_job)
+            self._live_validation_job = None
+        self._dirty_questions.clear()
+    
+    def _run_live_validation(self) -> None:
+        """Revalidate the questions edited since the last run."""
+        if self._live_validation_job is not None:
+            self.root.after_cancel(self._live_validation_job)
+            self._live_validation_job = None
+        if not self._dirty_questions:
+            return
+        
+        for index in self._dirty_questions:
+            if index < len(self.live_validator):
+                self.live_validator.update(index, self._question_input(index))
+                self.question_list.update_marker(index)
+        self._dirty_questions.clear()
+        self._update_marks_total()
+        self._refresh_preview()
+    
+    def _question_marker(self, index: int) -> Tuple[str, str, str]:
+        """
+        Inline marker for a question: its first issue, errors first.
+        
+        Args:
+            index: Index of the question
+        
+        Returns:
+            (severity, one-line summary, every issue) for the question
+        """
+        if index >= len(self.live_validator):
+            return "", "", ""
+        
+        issues = sorted(
+            self.live_validator.checks[index].issues,
+            key=lambda issue: issue.severity != SEVERITY_ERROR
+        )
+        if not issues:
+            return "", "", ""
+        
+        summary = str(issues[0]).splitlines()[0]
+        if len(issues) > 1:
+            summary += f" (+{len(issues) - 1} more)"
+        symbol = "\u2716" if issues[0].severity == SEVERITY_ERROR else "\u26a0"
+        return issues[0].severity, f"{symbol} {summary}", "\n\n".join(str(issue) for issue in issues)
+    
+    def _update_marks_total(self) -> None:
+        """Show the running marks total and the number of invalid questions."""
+        text = f"Total: {self.live_validator.total_marks}/{EXPECTED_TOTAL_MARKS} marks"
+        if self.live_validator.invalid:
+            text += f", {self.live_validator.invalid} question(s) with errors"
+        self.marks_total_var.set(text)
+    
+    def _remove_question(self, index: int) -> None:
+        """
+        Remove a question from the structure.
+        
+        Args:
+            index: Index of the question to remove
+        """
+        # Confirm removal
+        if not messagebox.askyesno(
+            "Remove Question",
+            f"Remove Question {index + 1}? This cannot be undone."
+        ):
+            return
+        
+        self._run_live_validation()
+        self.live_validator.remove(index)
+        self.question_list.remove(index)
+        self._update_marks_total()
+        self._refresh_preview()
+    
+    def _schedule_preview(self) -> None:
+        """Refresh the preview once settings edits pause."""
+        if self._preview_job is not None:
+            self.root.after_cancel(self._preview_job)
+        self._preview_job = self.root.after(PREVIEW_DELAY_MS, self._refresh_preview)
+    
+    def _refresh_preview(self) -> None:
+        """
+        Redraw the file tree preview, if it is the visible tab.
+        
+        Questions come from the live validator, so only questions edited
+        since the last refresh are rendered again; questions with errors
+        are shown as placeholders until they are fixed.
+        """
+        if self._preview_job is not None:
+            self.root.after_cancel(self._preview_job)
+            self._preview_job = None
+        if self.output_notebook is None or self.output_notebook.select() != str(self.preview_text):
+            return
+        
+        questions = [
+            None if check.question is None else check.question._replace(number=number)
+            for number, check in enumerate(self.live_validator.checks, start=1)
+        ]
+        try:
+            text = "\n".join(self.preview.render(
+                self._get_current_config(), questions, self.incremental_var.get()
+            ))
+        except Exception as error:
+            text = f"Preview unavailable: {error}"
+        
+        if text == self._preview_text:
+            return
+        self._preview_text = text
+        self.preview_text.configure(state=tk.NORMAL)
+        self.preview_text.delete("1.0", tk.END)
+        self.preview_text.insert("1.0", text)
+        self.preview_text.configure(state=tk.DISABLED)
+    
+    def _clear_structure(self) -> None:
+        """Clear all questions from the structure."""
+        # Confirm destructive action
+        if messagebox.askyesno(
+            "Clear All Questions",
+            "This will remove all questions from the structure. This cannot be undone. Continue?"
+        ):
+            self._set_questions([])
+    
+    def _load_spec(self) -> None:
+        """Replace the questions with the structure in a spec file."""
+        spec_path = filedialog.askopenfilename(
+            title="Load Structure Spec",
+            filetypes=[
+                ("Structure specs", " ".join(f"*{ext}" for ext in SPEC_FORMATS)),
+                ("All files", "*.*"),
+            ]
+        )
+        if not spec_path:
+            return
+        
+        try:
+            structure = SpecLoader.load(spec_path, cache=SpecCache())
+        except ValueError as error:
+            messagebox.showerror("Spec Error", str(error))
+            return
+        
+        self._set_questions([
+            {
+                "marks": str(question.marks),
+                "parts": ",".join(part.name for part in question.parts),
+                "subparts": ";".join(
+                    f"{part.name}:{','.join(part.subparts)}"
+                    for part in question.parts if part.subparts
+                ),
+            }
+            for question in structure.questions
+        ])
+    
+    def _get_manual_structure(self) -> ValidationReport:
+        """
+        Parse and validate the question structure from GUI inputs.
+        
+        Uses the live validation results, so only questions edited since
+        the last check are validated again; every problem in every question
+        is reported in one go. The marks total is checked separately by
+        _validate_question_structure.
+        
+        Returns:
+            Validation report holding the structure if there were no errors
+        """
+        # Only questions edited since the last live validation are checked
+        self._run_live_validation()
+        return self.live_validator.report()
+    
+    def _validate_question_structure(self, structure: Structure) -> Optional[str]:
+        """
+        Check the parsed structure as a whole.
+        
+        Each question was already validated while parsing, so this only
+        checks that the marks add up.
+        
+        Args:
+            structure: Parsed question structure
+            
+        Returns:
+            Error message if validation fails, None if validation passes
+        """
+        if structure.total_marks != EXPECTED_TOTAL_MARKS:
+            return self._handle_marks_total_mismatch(structure.total_marks)
+        
+        return None  # No validation errors
+    
+    def _handle_marks_total_mismatch(self, total_marks: int) -> Optional[str]:
+        """
+        Handle case where total marks don't add up to 100.
+        
+        Args:
+            total_marks: The actual total of all question marks
+            
+        Returns:
+            Error message if user chooses to fix, None if user chooses to continue
+        """
+        num_questions = len(self.question_list)
+        
+        if total_marks < 100:
+            message = (f"Total marks: {total_marks} (should be 100)\n\n"
+                      f"You currently have {num_questions} question(s).\n"
+                      f"The marks are {100 - total_marks} short of 100.\n\n"
+                      f"Possible issues:\n"
+                      f"• Too few questions - consider adding more questions\n"
+                      f"• Question marks are too low - consider increasing marks per question\n\n"
+                      f"Do you want to continue generating files anyway?")
+        else:  # total_marks > 100
+            message = (f"Total marks: {total_marks} (should be 100)\n\n"
+                      f"You currently have {num_questions} question(s).\n"
+                      f"The marks are {total_marks - 100} over 100.\n\n"
+                      f"Possible issues:\n"
+                      f"• Too many questions - consider removing some questions\n"
+                      f"• Question marks are too high - consider reducing marks per question\n\n"
+                      f"Do you want to continue generating files anyway?")
+        
+        # Ask user if they want to continue despite the mismatch
+        continue_anyway = messagebox.askyesno(
+            "Marks Total Warning",
+            message,
+            icon='warning'
+        )
+        
+        if continue_anyway:
+            return None  # User chose to continue, no error
+        else:
+            return f"File generation cancelled. Please adjust your questions so the total marks equal 100 (currently: {total_marks})."
+    
+    def _generate_files(self) -> None:
+        """Generate LaTeX files based on current configuration."""
+        # Clear output display and show it
+        self.log.clear()
+        self.output_notebook.select(self.output_text)
+        
+        # Validate input
+        if not self.question_list.rows:
+            messagebox.showerror("Error", "Please add at least one question.")
+            return
+        
+        try:
+            # Get configuration and structure
+            config = self._get_current_config()
+            
+            # Parse and validate the structure once before generation
+            report = self._get_manual_structure()
+            if not report.ok:
+                messagebox.showerror(
+                    "Validation Error",
+                    "\n\n".join(str(issue) for issue in report.errors)
+                )
+                return
+            for issue in report.warnings:
+                self.log.warning(str(issue))
+            structure = report.structure
+            validation_error = self._validate_question_structure(structure)
+            if validation_error:
+                messagebox.showerror("Validation Error", validation_error)
+                return
+            
+            # Generate files in the background; _finish_generation reports the result
+            self._generate_tma_files(config, structure)
+            
+        except Exception as error:
+            error_msg = f"Unexpected error: {str(error)}"
+            self.log.info(error_msg)
+            self.log.flush()
+            messagebox.showerror("Error", error_msg)
+    
+    def _generate_tma_files(self, config: Dict[str, str], structure: Structure) -> None:
+        """
+        Start generating TMA LaTeX files on a background worker thread.
+        
+        The window stays responsive while files are written; the worker
+        reports back through a queue drained by _poll_generation.
+        
+        Args:
+            config: Configuration dictionary
+            structure: Question structure
+        """
+        self.log.info("Using manual question structure...")
+        
+        # Display structure summary
+        self._display_structure_summary(structure)
+        
+        self._cancel_event.clear()
+        self.progress_bar.configure(value=0, maximum=1)
+        self.generate_button.configure(state=tk.DISABLED)
+        self.cancel_button.configure(state=tk.NORMAL)
+        
+        self._worker = threading.Thread(
+            target=self._run_generation,
+            args=(config, structure, self.incremental_var.get()),
+            daemon=True
+        )
+        self._worker.start()
+        self.root.after(WORKER_POLL_MS, self._poll_generation)
+    
+    def _run_generation(self, config: Dict[str, str], structure: Structure, incremental: bool) -> None:
+        """
+        Render and write the project (runs on the worker thread).
+        
+        Never touches Tk widgets; every update is posted to the queue. The
+        project is written through a staging directory, so cancelling
+        leaves the output folder as it was.
+        
+        Args:
+            config: Configuration dictionary
+            structure: Question structure
+            incremental: Update an existing project in place
+        """
+        post = self._generation_queue.put
+        
+        def progress(done: int, total: int) -> None:
+            if self._cancel_event.is_set():
+                raise GenerationCancelled()
+            post((EVENT_PROGRESS, done, total))
+        
+        try:
+            generator = LaTeXFileGenerator(config)
+            
+            # Render the whole project before touching the output directory
+            plan = generator.render_plan(structure)
+            progress(0, len(plan))
+            
+            # Write main, question, part, subpart and style files in one pass
+            actual_folder, sink = generator.write_project(
+                plan, config["output"], incremental=incremental, progress=progress
+            )
+            for note in generator.notes:
+                post((EVENT_LOG, LEVEL_INFO, note))
+            post((EVENT_LOG, LEVEL_INFO, f"Using directory: {actual_folder}"))
+            if sink.preserved:
+                post((EVENT_LOG, LEVEL_INFO, f"Kept {len(sink.preserved)} existing answer file(s) unchanged"))
+            if sink.skipped:
+                post((EVENT_LOG, LEVEL_INFO, f"Skipped {len(sink.skipped)} unchanged file(s): {', '.join(sink.skipped)}"))
+            for warning in generator.warnings:
+                post((EVENT_LOG, LEVEL_WARNING, warning))
+            
+            copied_styles = [entry.path for entry in plan.of_kind(KIND_STYLE)]
+            if copied_styles:
+                post((EVENT_LOG, LEVEL_INFO, f"Copied style files: {', '.join(copied_styles)}"))
+            
+            post((EVENT_DONE, config, actual_folder))
+        except GenerationCancelled:
+            post((EVENT_CANCELLED,))
+        except Exception as error:
+            post((EVENT_ERROR, f"Error: {str(error)}"))
+    
+    def _poll_generation(self) -> None:
+        """Apply the worker's queued updates, then check again until it finishes."""
+        finished = None
+        
+        try:
+            while finished is None:
+                event = self._generation_queue.get_nowait()
+                kind = event[0]
+                if kind == EVENT_PROGRESS:
+                    _, done, total = event
+                    self.progress_bar.configure(value=done, maximum=max(total, 1))
+                elif kind == EVENT_LOG:
+                    _, level, message = event
+                    self.log.log(message, level)
+                else:
+                    finished = event
+        except queue.Empty:
+            pass
+        
+        if finished is None:
+            self.root.after(WORKER_POLL_MS, self._poll_generation)
+        else:
+            self._finish_generation(finished)
+    
+    def _cancel_generation(self) -> None:
+        """Ask the worker to stop after the file it is writing."""
+        if self._worker is not None and self._worker.is_alive():
+            self._cancel_event.set()
+            self.cancel_button.configure(state=tk.DISABLED)
+            self.log.info("Cancelling...")
+    
+    def _finish_generation(self, event: Tuple) -> None:
+        """
+        Report the outcome of a generation run.
+        
+        Args:
+            event: EVENT_DONE, EVENT_CANCELLED or EVENT_ERROR event from the worker
+        """
+        self._worker = None
+        self.generate_button.configure(state=tk.NORMAL)
+        self.cancel_button.configure(state=tk.DISABLED)
+        kind = event[0]
+        
+        if kind == EVENT_CANCELLED:
+            self.progress_bar.configure(value=0)
+            self.log.info("Generation cancelled; the output folder was left unchanged.")
+            return
+        
+        if kind == EVENT_ERROR:
+            error_message = event[1]
+            self.log.info(error_message)
+            self.log.flush()
+            messagebox.showerror("Error", error_message)
+            return
+        
+        _, config, actual_folder = event
+        
+        # Generate suggested Overleaf project name
+        suggested_name = self._generate_overleaf_project_name(config)
+        
+        success_message = f"TMA files successfully created in {actual_folder}"
+        self.log.info(success_message)
+        self.log.info("\n=== OVERLEAF SETUP ===")
+        self.log.info("Suggested Overleaf project name:")
+        self.log.info(f"  {suggested_name}\n")
+        self.log.info("Next steps:")
+        self.log.info("1. Create new blank project in Overleaf")
+        self.log.info("2. Use the suggested name above")
+        self.log.info("3. Delete default main.tex in Overleaf")
+        self.log.info("4. Upload ALL files from output directory")
+        self.log.info("5. Compile and start editing!\n")
+        self.log.info("Generation completed successfully!")
+        self.log.flush()
+        
+        # Save successful configuration
+        self.config = config
+        ConfigManager.save_config(self.config)
+        self._refresh_preview()
+        messagebox.showinfo("Success", "TMA files generated successfully!")
+    
+    def _display_structure_summary(self, structure: Structure) -> None:
+        """
+        Display question structure summary in output.
+        
+        Args:
+            structure: Question structure
+        """
+        self.log.info("Question Structure:")
+        
+        for question in structure.questions:
+            self.log.info(f"{question.id}: {question.marks} marks")
+            
+            for part in question.parts:
+                self.log.info(f"  ({part.name})")
+                for subpart in part.subparts:
+                    self.log.info(f"    ({subpart})")
+    
+    def _prepare_generation_data(
+        self,
+        structure: Structure
+    ) -> Tuple[List[Tuple[str, ...]], Dict[str, int]]:
+        """
+        Prepare data structures for LaTeX file generation.
+        
+        Args:
+            structure: Question structure
+            
+        Returns:
+            Tuple of (parts_list, subparts_dict)
+        """
+        return LaTeXFileGenerator.prepare_generation_data(structure)
+    
+    def _generate_overleaf_project_name(self, config: Dict[str, str]) -> str:
+        """
+        Generate a suggested Overleaf project name based on course details.
+        
+        Args:
+            config: Configuration dictionary with course details
+            
+        Returns:
+            Suggested project name string
+        """
+        course = config.get('course', 'COURSE').upper()
+        tma_ref = config.get('tma_ref', '01').zfill(2)  # Ensure 2 digits
+        cod = config.get('cod', '').strip()
+        
+        # Extract year from cut-off date if possible
+        year_suffix = ""
+        if cod:
+            # Try to extract year from various date formats
+            import re
+            year_match = re.search(r'\b(20\d{2})\b', cod)
+            if year_match:
+                year_suffix = f" ({year_match.group(1)})"
+        
+        # Generate clean, professional project name
+        project_name = f"{course} TMA {tma_ref}{year_suffix}"
+        
+        return project_name
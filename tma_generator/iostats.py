@@ -0,0 +1,365 @@
+"""
+File operation layer and I/O accounting for the TMA LaTeX Generator.
+
+Every filesystem operation made during generation goes through a FileOps
+object. The default FileOps simply performs the operation; IOStats also
+counts it and times it per generation phase, so a run can be reported as
+JSON and checked against upper bounds (e.g. at most one open per file).
+"""
+
+import os
+import shutil
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Dict, Iterator, List, Optional, Union
+
+
+# Operation names reported by IOStats
+OP_OPEN = "open"
+OP_WRITE = "write"
+OP_READ = "read"
+OP_STAT = "stat"
+OP_RENAME = "rename"
+OP_MKDIR = "mkdir"
+OP_COPY = "copy"
+OP_LINK = "link"
+OP_SCAN = "scan"
+OP_REMOVE = "remove"
+
+# Phase used for operations made outside any explicit phase
+DEFAULT_PHASE = "other"
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+class FileOps:
+    """
+    Plain filesystem operations used by the generator and output sinks.
+    
+    Subclasses can observe or replace individual operations; IOStats uses
+    this to count and time them.
+    """
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Mark the operations made inside the block as belonging to a phase.
+        
+        Args:
+            name: Phase name (e.g. 'render', 'write')
+        """
+        yield
+    
+    def open(self, path: PathLike, mode: str = 'r', **kwargs) -> IO:
+        """Open a file, like the builtin open()."""
+        return open(path, mode, **kwargs)
+    
+    def read_bytes(self, path: PathLike) -> bytes:
+        """Read a whole file."""
+        with self.open(path, 'rb') as file:
+            return file.read()
+    
+    def exists(self, path: PathLike) -> bool:
+        """Check whether a path exists."""
+        return os.path.exists(path)
+    
+    def stat(self, path: PathLike) -> os.stat_result:
+        """Stat a path."""
+        return os.stat(path)
+    
+    def mkdir(self, path: PathLike, parents: bool = False, exist_ok: bool = False) -> None:
+        """Create a directory."""
+        Path(path).mkdir(parents=parents, exist_ok=exist_ok)
+    
+    def rename(self, source: PathLike, destination: PathLike) -> None:
+        """Rename a file or directory."""
+        os.rename(source, destination)
+    
+    def replace(self, source: PathLike, destination: PathLike) -> None:
+        """Rename a file, replacing any existing destination."""
+        os.replace(source, destination)
+    
+    def remove(self, path: PathLike) -> None:
+        """Remove a file."""
+        os.remove(path)
+    
+    def copy2(self, source: PathLike, destination: PathLike) -> None:
+        """Copy a file with its metadata."""
+        shutil.copy2(source, destination)
+    
+    def link(self, source: PathLike, destination: PathLike) -> None:
+        """Create a hardlink to a file."""
+        os.link(source, destination)
+    
+    def copy_file_range(self, source: PathLike, destination: PathLike) -> None:
+        """
+        Copy a file inside the kernel with os.copy_file_range.
+        
+        On filesystems that support it (e.g. Btrfs, XFS) this creates a
+        reflink rather than copying data; on NFS it is a server-side copy.
+        
+        Raises:
+            OSError: If the platform or filesystem does not support it
+        """
+        _copy_file_range(source, destination)
+    
+    def glob(self, directory: PathLike, pattern: str) -> List[Path]:
+        """List the entries of a directory matching a glob pattern."""
+        return sorted(Path(directory).glob(pattern))
+    
+    def listdir(self, directory: PathLike) -> List[str]:
+        """List the names in a directory."""
+        return os.listdir(directory)
+
+
+def _copy_file_range(source: PathLike, destination: PathLike) -> None:
+    """
+    Copy a whole file with os.copy_file_range.
+    
+    Raises:
+        OSError: If copy_file_range is unavailable or unsupported
+    """
+    if not hasattr(os, "copy_file_range"):
+        raise OSError("copy_file_range is not available on this platform")
+    
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+    if remaining > 0:
+        raise OSError(f"copy_file_range stopped early copying {source}")
+
+
+class _CountingFile:
+    """File wrapper that reports writes and reads to IOStats."""
+    
+    def __init__(self, file: IO, stats: "IOStats") -> None:
+        """
+        Wrap an open file.
+        
+        Args:
+            file: File object returned by open()
+            stats: Statistics to report to
+        """
+        self._file = file
+        self._stats = stats
+    
+    def write(self, data) -> int:
+        """Write data, counting one write and its size."""
+        start = time.perf_counter()
+        written = self._file.write(data)
+        self._stats.record(OP_WRITE, time.perf_counter() - start, nbytes=len(data))
+        return written
+    
+    def read(self, *args):
+        """Read data, counting one read and its size."""
+        start = time.perf_counter()
+        data = self._file.read(*args)
+        self._stats.record(OP_READ, time.perf_counter() - start, nbytes=len(data), read=True)
+        return data
+    
+    def __enter__(self) -> "_CountingFile":
+        """Enter the file context."""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the file."""
+        self._file.close()
+    
+    def __getattr__(self, name: str):
+        """Delegate everything else (seek, tell, flush, close...) to the file."""
+        return getattr(self._file, name)
+
+
+class IOStats(FileOps):
+    """
+    Filesystem operations that count and time themselves per phase.
+    
+    Byte counts are the sizes passed to write() and returned by read(), so
+    they are characters rather than bytes for files opened in text mode.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self._phase = DEFAULT_PHASE
+        self.counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.seconds: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.bytes_written: Dict[str, int] = defaultdict(int)
+        self.bytes_read: Dict[str, int] = defaultdict(int)
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Attribute the operations made inside the block to a phase.
+        
+        Args:
+            name: Phase name (e.g. 'render', 'write')
+        """
+        previous = self._phase
+        self._phase = name
+        try:
+            yield
+        finally:
+            self._phase = previous
+    
+    def record(self, op: str, seconds: float, nbytes: int = 0, read: bool = False) -> None:
+        """
+        Record one operation in the current phase.
+        
+        Args:
+            op: Operation name
+            seconds: Time the operation took
+            nbytes: Number of bytes transferred
+            read: Count nbytes as read rather than written
+        """
+        self.counts[self._phase][op] += 1
+        self.seconds[self._phase][op] += seconds
+        if read:
+            self.bytes_read[self._phase] += nbytes
+        else:
+            self.bytes_written[self._phase] += nbytes
+    
+    def _timed(self, op: str, func, *args, **kwargs):
+        """Run a filesystem call and record it."""
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.record(op, time.perf_counter() - start)
+    
+    def open(self, path: PathLike, mode: str = 'r', **kwargs) -> IO:
+        """Open a file, counting the open and every read and write on it."""
+        return _CountingFile(self._timed(OP_OPEN, open, path, mode, **kwargs), self)
+    
+    def exists(self, path: PathLike) -> bool:
+        """Check whether a path exists, counted as a stat."""
+        return self._timed(OP_STAT, os.path.exists, path)
+    
+    def stat(self, path: PathLike) -> os.stat_result:
+        """Stat a path."""
+        return self._timed(OP_STAT, os.stat, path)
+    
+    def mkdir(self, path: PathLike, parents: bool = False, exist_ok: bool = False) -> None:
+        """Create a directory."""
+        self._timed(OP_MKDIR, Path(path).mkdir, parents=parents, exist_ok=exist_ok)
+    
+    def rename(self, source: PathLike, destination: PathLike) -> None:
+        """Rename a file or directory."""
+        self._timed(OP_RENAME, os.rename, source, destination)
+    
+    def replace(self, source: PathLike, destination: PathLike) -> None:
+        """Rename a file, replacing any existing destination."""
+        self._timed(OP_RENAME, os.replace, source, destination)
+    
+    def remove(self, path: PathLike) -> None:
+        """Remove a file."""
+        self._timed(OP_REMOVE, os.remove, path)
+    
+    def copy2(self, source: PathLike, destination: PathLike) -> None:
+        """Copy a file with its metadata."""
+        self._timed(OP_COPY, shutil.copy2, source, destination)
+    
+    def link(self, source: PathLike, destination: PathLike) -> None:
+        """Create a hardlink to a file."""
+        self._timed(OP_LINK, os.link, source, destination)
+    
+    def copy_file_range(self, source: PathLike, destination: PathLike) -> None:
+        """Copy a file inside the kernel, counted as a copy."""
+        self._timed(OP_COPY, _copy_file_range, source, destination)
+    
+    def glob(self, directory: PathLike, pattern: str) -> List[Path]:
+        """List the entries of a directory matching a glob pattern."""
+        return self._timed(OP_SCAN, lambda: sorted(Path(directory).glob(pattern)))
+    
+    def listdir(self, directory: PathLike) -> List[str]:
+        """List the names in a directory."""
+        return self._timed(OP_SCAN, os.listdir, directory)
+    
+    def count(self, op: str, phase: Optional[str] = None) -> int:
+        """
+        Number of times an operation was performed.
+        
+        Args:
+            op: Operation name (e.g. OP_OPEN)
+            phase: Restrict to one phase (default: all phases)
+        
+        Returns:
+            Operation count
+        """
+        phases = [phase] if phase else list(self.counts)
+        return sum(self.counts[name].get(op, 0) for name in phases if name in self.counts)
+    
+    def assert_at_most(self, op: str, limit: int, phase: Optional[str] = None) -> None:
+        """
+        Check that an operation was performed at most a given number of times.
+        
+        Args:
+            op: Operation name (e.g. OP_OPEN)
+            limit: Maximum allowed count
+            phase: Restrict to one phase (default: all phases)
+        
+        Raises:
+            AssertionError: If the count exceeds the limit
+        """
+        actual = self.count(op, phase)
+        if actual > limit:
+            where = f" in phase '{phase}'" if phase else ""
+            raise AssertionError(f"{actual} {op} operations{where}, expected at most {limit}")
+    
+    def merge(self, other: Dict) -> None:
+        """
+        Add statistics reported by another IOStats (e.g. from a worker process).
+        
+        Args:
+            other: Dictionary produced by to_dict()
+        """
+        for phase, data in other.get("phases", {}).items():
+            for op, values in data.get("ops", {}).items():
+                self.counts[phase][op] += values["count"]
+                self.seconds[phase][op] += values["seconds"]
+            self.bytes_written[phase] += data.get("bytes_written", 0)
+            self.bytes_read[phase] += data.get("bytes_read", 0)
+    
+    def to_dict(self) -> Dict:
+        """
+        Summarise the statistics.
+        
+        Returns:
+            Per-phase and total counts, latencies and byte counts
+        """
+        phases = {}
+        totals: Dict[str, Dict[str, Union[int, float]]] = {}
+        
+        for phase in sorted(set(self.counts) | set(self.bytes_written) | set(self.bytes_read)):
+            ops = {}
+            for op in sorted(self.counts.get(phase, {})):
+                count = self.counts[phase][op]
+                seconds = self.seconds[phase][op]
+                ops[op] = {"count": count, "seconds": round(seconds, 6)}
+                total = totals.setdefault(op, {"count": 0, "seconds": 0.0})
+                total["count"] += count
+                total["seconds"] = round(total["seconds"] + seconds, 6)
+            phases[phase] = {
+                "ops": ops,
+                "bytes_written": self.bytes_written.get(phase, 0),
+                "bytes_read": self.bytes_read.get(phase, 0),
+            }
+        
+        return {
+            "phases": phases,
+            "totals": totals,
+            "bytes_written": sum(self.bytes_written.values()),
+            "bytes_read": sum(self.bytes_read.values()),
+        }
+    
+    def to_json(self) -> str:
+        """Summarise the statistics as indented JSON."""
+        # Deferred so importing the package stays cheap
+        import json
+        
+        return json.dumps(self.to_dict(), indent=2)
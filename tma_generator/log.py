@@ -0,0 +1,238 @@
+"""
+Buffered status logging for the TMA LaTeX Generator.
+
+Generation reports progress as many short status lines. Writing each one
+straight to a widget or terminal is expensive (a Tk text widget redraws on
+every insert), so messages go to a LogSink, which buffers them and writes
+them out in batches. The same interface is used by the desktop app, which
+flushes into its output pane at most once per frame, and by headless runs,
+which write plain text or JSON lines.
+"""
+
+import json
+import sys
+import time
+from typing import IO, List, NamedTuple, Optional
+
+
+# Message levels
+LEVEL_INFO = "info"
+LEVEL_WARNING = "warning"
+LEVEL_ERROR = "error"
+
+# Prefixes for warnings and errors in plain text output
+LEVEL_PREFIXES = {LEVEL_INFO: "", LEVEL_WARNING: "Warning: ", LEVEL_ERROR: "Error: "}
+
+# Headless output formats
+LOG_FORMAT_TEXT = "text"
+LOG_FORMAT_JSONL = "jsonl"
+LOG_FORMATS = (LOG_FORMAT_TEXT, LOG_FORMAT_JSONL)
+
+# Flush at least this often (seconds), and whenever this many messages are waiting
+DEFAULT_FLUSH_INTERVAL = 0.1
+MAX_BUFFERED_RECORDS = 1000
+
+
+class LogRecord(NamedTuple):
+    """One status message."""
+    
+    level: str
+    message: str
+    time: float
+
+
+class LogSink:
+    """
+    Buffered destination for status messages.
+    
+    Messages are collected and handed to _emit() in batches: when the
+    buffer fills, when flush_interval has passed since the last flush, and
+    on flush() or close(). Subclasses implement _emit(), and may override
+    _schedule_flush() to flush on their own clock (e.g. a GUI frame).
+    Sinks are used as context managers so the last messages are flushed.
+    """
+    
+    def __init__(
+        self,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_buffered: int = MAX_BUFFERED_RECORDS
+    ) -> None:
+        """
+        Initialize log sink.
+        
+        Args:
+            flush_interval: Longest time a message waits in the buffer (seconds)
+            max_buffered: Flush as soon as this many messages wait (0: no limit)
+        """
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self._buffer: List[LogRecord] = []
+        self._last_flush = time.monotonic()
+    
+    def log(self, message: str, level: str = LEVEL_INFO) -> None:
+        """
+        Buffer one message.
+        
+        Args:
+            message: Message text (may span several lines)
+            level: LEVEL_INFO, LEVEL_WARNING or LEVEL_ERROR
+        """
+        self._buffer.append(LogRecord(level, message, time.time()))
+        if self.max_buffered and len(self._buffer) >= self.max_buffered:
+            self.flush()
+        else:
+            self._schedule_flush()
+    
+    def info(self, message: str) -> None:
+        """Buffer an informational message."""
+        self.log(message, LEVEL_INFO)
+    
+    def warning(self, message: str) -> None:
+        """Buffer a warning."""
+        self.log(message, LEVEL_WARNING)
+    
+    def error(self, message: str) -> None:
+        """Buffer an error."""
+        self.log(message, LEVEL_ERROR)
+    
+    def _schedule_flush(self) -> None:
+        """Flush if the buffer has waited longer than flush_interval."""
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Write out every buffered message."""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        records, self._buffer = self._buffer, []
+        self._emit(records)
+    
+    def clear(self) -> None:
+        """Drop buffered messages that have not been written yet."""
+        self._buffer = []
+    
+    def _emit(self, records: List[LogRecord]) -> None:
+        """
+        Write a batch of messages.
+        
+        Args:
+            records: Messages in the order they were logged
+        """
+        raise NotImplementedError
+    
+    def close(self) -> None:
+        """Flush the remaining messages."""
+        self.flush()
+    
+    def __enter__(self) -> "LogSink":
+        """Enter the sink context."""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Flush the remaining messages."""
+        self.close()
+
+
+class StreamLogSink(LogSink):
+    """
+    Write messages as plain text lines.
+    
+    Informational messages go to stdout; warnings and errors go to stderr
+    with a "Warning: " or "Error: " prefix. Each flush is one write per
+    stream.
+    """
+    
+    def __init__(
+        self,
+        stream: Optional[IO[str]] = None,
+        error_stream: Optional[IO[str]] = None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL
+    ) -> None:
+        """
+        Initialize text log sink.
+        
+        Args:
+            stream: Stream for informational messages (default: sys.stdout)
+            error_stream: Stream for warnings and errors (default: sys.stderr)
+            flush_interval: Longest time a message waits in the buffer (seconds)
+        """
+        super().__init__(flush_interval)
+        self.stream = stream
+        self.error_stream = error_stream
+    
+    def _emit(self, records: List[LogRecord]) -> None:
+        """Write the batch, keeping stdout and stderr lines in order."""
+        # Resolved at write time so redirected sys.stdout/sys.stderr are honoured
+        stream = self.stream or sys.stdout
+        error_stream = self.error_stream or sys.stderr
+        
+        lines: List[str] = []
+        current = None
+        for record in records:
+            target = stream if record.level == LEVEL_INFO else error_stream
+            if target is not current and lines:
+                current.write("".join(lines))
+                current.flush()
+                lines = []
+            current = target
+            lines.append(f"{LEVEL_PREFIXES.get(record.level, '')}{record.message}\n")
+        if lines:
+            current.write("".join(lines))
+            current.flush()
+
+
+class JsonLinesLogSink(LogSink):
+    """
+    Write messages as JSON lines for log collectors.
+    
+    Each message is one line: {"time": ..., "level": ..., "message": ...},
+    with the time in seconds since the epoch.
+    """
+    
+    def __init__(
+        self,
+        stream: Optional[IO[str]] = None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL
+    ) -> None:
+        """
+        Initialize JSON lines log sink.
+        
+        Args:
+            stream: Output stream (default: sys.stdout)
+            flush_interval: Longest time a message waits in the buffer (seconds)
+        """
+        super().__init__(flush_interval)
+        self.stream = stream
+    
+    def _emit(self, records: List[LogRecord]) -> None:
+        """Write the batch as one JSON object per line."""
+        stream = self.stream or sys.stdout
+        stream.write("".join(
+            json.dumps({"time": round(record.time, 3), "level": record.level, "message": record.message}) + "\n"
+            for record in records
+        ))
+        stream.flush()
+
+
+def make_log_sink(log_format: str = LOG_FORMAT_TEXT, stderr_only: bool = False) -> LogSink:
+    """
+    Create the headless log sink for an output format.
+    
+    Args:
+        log_format: LOG_FORMAT_TEXT or LOG_FORMAT_JSONL
+        stderr_only: Write every message to stderr, keeping stdout free for
+            a JSON report written to '-'
+    
+    Returns:
+        Log sink writing to stdout (and stderr for text warnings and errors)
+    
+    Raises:
+        ValueError: If the format is unknown
+    """
+    stream = sys.stderr if stderr_only else None
+    if log_format == LOG_FORMAT_TEXT:
+        return StreamLogSink(stream=stream)
+    if log_format == LOG_FORMAT_JSONL:
+        return JsonLinesLogSink(stream=stream)
+    raise ValueError(f"Unknown log format '{log_format}' (use {', '.join(LOG_FORMATS)})")
@@ -0,0 +1,157 @@
+"""
+Render plans for the TMA LaTeX Generator.
+
+A render plan is the complete, immutable file tree of a project held in
+memory as relative path -> bytes. Generation renders a plan first and then
+commits it in a single write pass, so the same plan can also drive dry
+runs, previews, archives and diffs against an existing project.
+"""
+
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Tuple
+
+
+# Kinds of file in a plan
+KIND_MAIN = "main"
+KIND_QUESTION = "question"
+KIND_PART = "part"
+KIND_SUBPART = "subpart"
+KIND_STYLE = "style"
+
+# Structure files are regenerated; answer files hold the student's work
+STRUCTURE_KINDS = (KIND_MAIN, KIND_QUESTION)
+ANSWER_KINDS = (KIND_PART, KIND_SUBPART)
+
+
+class PlanEntry(NamedTuple):
+    """A single rendered file in a render plan."""
+    
+    path: str
+    data: bytes
+    kind: str
+    
+    @property
+    def digest(self) -> str:
+        """SHA-256 hex digest of the rendered content."""
+        # Deferred so importing the package stays cheap
+        import hashlib
+        
+        return hashlib.sha256(self.data).hexdigest()
+
+
+class PlanDiff(NamedTuple):
+    """Difference between a render plan and a project on disk."""
+    
+    added: Tuple[str, ...]
+    changed: Tuple[str, ...]
+    unchanged: Tuple[str, ...]
+
+
+class RenderPlan:
+    """
+    Immutable mapping of relative file path to rendered file content.
+    
+    Entries keep the order in which they were rendered, which is also the
+    order in which they are written.
+    """
+    
+    __slots__ = ("_entries", "_files")
+    
+    def __init__(self, entries: Iterable[PlanEntry]) -> None:
+        """
+        Initialize plan from rendered entries.
+        
+        Args:
+            entries: Rendered files in write order
+        
+        Raises:
+            ValueError: If two entries share a path
+        """
+        self._entries: Tuple[PlanEntry, ...] = tuple(entries)
+        files: Dict[str, PlanEntry] = {}
+        for entry in self._entries:
+            if entry.path in files:
+                raise ValueError(f"Duplicate file in render plan: {entry.path}")
+            files[entry.path] = entry
+        self._files: Mapping[str, PlanEntry] = MappingProxyType(files)
+    
+    def __len__(self) -> int:
+        """Number of files in the plan."""
+        return len(self._entries)
+    
+    def __iter__(self) -> Iterator[PlanEntry]:
+        """Iterate over entries in write order."""
+        return iter(self._entries)
+    
+    def __contains__(self, path: object) -> bool:
+        """Check whether the plan contains a file path."""
+        return path in self._files
+    
+    def __getitem__(self, path: str) -> bytes:
+        """Rendered content of a file path."""
+        return self._files[path].data
+    
+    @property
+    def files(self) -> Mapping[str, PlanEntry]:
+        """Read-only mapping of path to entry."""
+        return self._files
+    
+    @property
+    def paths(self) -> List[str]:
+        """File paths in write order."""
+        return [entry.path for entry in self._entries]
+    
+    @property
+    def total_bytes(self) -> int:
+        """Total size of all rendered files."""
+        return sum(len(entry.data) for entry in self._entries)
+    
+    def of_kind(self, *kinds: str) -> List[PlanEntry]:
+        """
+        Select entries of the given kinds.
+        
+        Args:
+            kinds: File kinds to select (e.g. KIND_STYLE)
+        
+        Returns:
+            Matching entries in write order
+        """
+        return [entry for entry in self._entries if entry.kind in kinds]
+    
+    def commit(self, sink) -> int:
+        """
+        Write every file into an output sink, in write order.
+        
+        Args:
+            sink: Output sink (see tma_generator.sinks)
+        
+        Returns:
+            Number of files written
+        """
+        for entry in self._entries:
+            sink.write(entry)
+        return len(self._entries)
+    
+    def diff(self, folder: str) -> PlanDiff:
+        """
+        Compare the plan with the files currently in a folder.
+        
+        Args:
+            folder: Existing project directory
+        
+        Returns:
+            Paths that would be added, changed or left unchanged
+        """
+        folder_path = Path(folder)
+        added, changed, unchanged = [], [], []
+        
+        for entry in self._entries:
+            try:
+                existing = (folder_path / entry.path).read_bytes()
+            except FileNotFoundError:
+                added.append(entry.path)
+                continue
+            (unchanged if existing == entry.data else changed).append(entry.path)
+        
+        return PlanDiff(tuple(added), tuple(changed), tuple(unchanged))
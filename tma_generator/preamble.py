@@ -0,0 +1,593 @@
+"""
+Usage-driven lean preamble for the TMA LaTeX Generator.
+
+tma-extras.sty loads forest, tcolorbox, tabu, calculator and two dozen
+other packages on every compile, even when the answers are plain maths.
+The analyzer scans a project's answer files (q1a.tex, q1a_1.tex, ...) for
+the commands and environments they use, maps them to the packages that
+provide them, and writes a tma-extras.sty that loads only those.
+
+The command -> package index is bundled as package data. When a TeX
+installation is available it is extended with the commands the installed
+package files define, and that scan is cached on disk keyed by the paths,
+modification times and sizes of the package files, so it runs once per
+TeX installation.
+
+Whenever the usage cannot be determined with confidence (an unknown
+command, low-level TeX such as \\csname or \\makeatletter, an \\input of a
+file outside the project, an unreadable file), the full package set is
+kept instead.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Pattern, Set, Tuple
+
+from .core import TEX_EXTENSION
+from .data import read_data
+from .formats import FORMAT_EXTENSION, FORMAT_NAME
+from .log import LogSink, StreamLogSink
+from .spec import default_cache_dir
+from .styles import load_bundled_styles
+
+
+# Bundled index, and the style file that is trimmed
+INDEX_NAME = "preamble_index.json"
+EXTRAS_STYLE = "tma-extras.sty"
+MAIN_STYLE = "tma.sty"
+KPSEWHICH = "kpsewhich"
+
+# On-disk cache of scanned package files; bump when the scan changes
+PREAMBLE_CACHE_VERSION = 1
+
+# Answer and subpart files: q1a.tex, q12b_ii.tex
+ANSWER_FILE_PATTERN = re.compile(r"^q\d+[A-Za-z0-9]+(?:_[A-Za-z0-9]+)?\.tex$")
+
+# Everything after an unescaped %
+COMMENT_PATTERN = re.compile(r"(?<!\\)%.*")
+COMMAND_PATTERN = re.compile(r"\\([A-Za-z@]+)")
+ENVIRONMENT_PATTERN = re.compile(r"\\begin\s*\{([^}]*)\}")
+INPUT_PATTERN = re.compile(r"\\(?:input|include)\s*\{([^}]*)\}")
+COMMAND_DEFINITION_PATTERN = re.compile(
+    r"\\(?:(?:re)?newcommand|providecommand|DeclareRobustCommand|DeclareMathOperator|"
+    r"(?:New|Renew|Provide|Declare)DocumentCommand|newlength)\*?\s*\{?\s*\\([A-Za-z@]+)"
+    r"|\\(?:[egx]?def|let)\s*\\([A-Za-z@]+)"
+)
+ENVIRONMENT_DEFINITION_PATTERN = re.compile(
+    r"\\(?:(?:re)?newenvironment|newtheorem|(?:New|Renew|Provide|Declare)DocumentEnvironment|"
+    r"newtcolorbox|newlist)\*?\s*\{([^}]*)\}"
+)
+# \RequirePackage[options]{a,b} on a line of its own
+REQUIRE_PATTERN = re.compile(r"^(\s*)\\RequirePackage(\[[^\]]*\])?\{([^}]*)\}(.*)$")
+
+# Unknown names listed in the fallback reason
+MAX_REPORTED_NAMES = 5
+
+
+def strip_comments(text: str) -> str:
+    """
+    Remove LaTeX comments.
+    
+    Args:
+        text: LaTeX source
+    
+    Returns:
+        Source without anything after an unescaped % on each line
+    """
+    return "\n".join(COMMENT_PATTERN.sub("", line) for line in text.splitlines())
+
+
+def defined_names(text: str) -> Tuple[Set[str], Set[str]]:
+    """
+    Find the commands and environments LaTeX source defines.
+    
+    Args:
+        text: LaTeX source without comments
+    
+    Returns:
+        Tuple of (command names, environment names)
+    """
+    commands = {
+        first or second for first, second in COMMAND_DEFINITION_PATTERN.findall(text)
+    }
+    environments = {name.strip() for name in ENVIRONMENT_DEFINITION_PATTERN.findall(text)}
+    return commands, environments
+
+
+class PreambleIndex(NamedTuple):
+    """Which packages provide which commands and environments."""
+    
+    version: int
+    always: Tuple[str, ...]
+    uncertain: FrozenSet[str]
+    commands: Dict[str, Tuple[str, ...]]
+    environments: Dict[str, Tuple[str, ...]]
+    patterns: Tuple[Tuple[Pattern, str], ...]
+    loaded_by: Dict[str, Tuple[str, ...]]
+    known_commands: FrozenSet[str]
+    known_environments: FrozenSet[str]
+    
+    @property
+    def packages(self) -> FrozenSet[str]:
+        """Every package the index knows about."""
+        names = set(self.always) | set(self.loaded_by)
+        for providers in (*self.commands.values(), *self.environments.values()):
+            names.update(providers)
+        names.update(package for _, package in self.patterns)
+        return frozenset(names)
+    
+    @staticmethod
+    def from_data(data: Dict, scanned: Optional[Dict[str, Dict[str, List[str]]]] = None) -> "PreambleIndex":
+        """
+        Build an index from the bundled data and scanned package files.
+        
+        Scanned definitions only add names the bundled index does not
+        already map to a package or treat as known.
+        
+        Args:
+            data: Parsed preamble_index.json
+            scanned: Package name -> {'commands': [...], 'environments': [...]}
+        
+        Returns:
+            Index
+        """
+        known_commands = frozenset(data["known"]["commands"])
+        known_environments = frozenset(data["known"]["environments"])
+        commands: Dict[str, Tuple[str, ...]] = {}
+        environments: Dict[str, Tuple[str, ...]] = {}
+        patterns = []
+        loaded_by = {}
+        
+        def add(mapping: Dict[str, Tuple[str, ...]], name: str, package: str) -> None:
+            if package not in mapping.get(name, ()):
+                mapping[name] = mapping.get(name, ()) + (package,)
+        
+        for package, entry in data["packages"].items():
+            for name in entry.get("commands", ()):
+                add(commands, name, package)
+            for name in entry.get("environments", ()):
+                add(environments, name, package)
+            for pattern in entry.get("patterns", ()):
+                patterns.append((re.compile(pattern), package))
+            if entry.get("loaded_by"):
+                loaded_by[package] = tuple(entry["loaded_by"])
+        
+        for package, entry in (scanned or {}).items():
+            for name in entry.get("commands", ()):
+                if name not in commands and name not in known_commands:
+                    add(commands, name, package)
+            for name in entry.get("environments", ()):
+                if name not in environments and name not in known_environments:
+                    add(environments, name, package)
+        
+        return PreambleIndex(
+            version=data["version"],
+            always=tuple(data["always"]),
+            uncertain=frozenset(data["uncertain_commands"]),
+            commands=commands,
+            environments=environments,
+            patterns=tuple(patterns),
+            loaded_by=loaded_by,
+            known_commands=known_commands,
+            known_environments=known_environments,
+        )
+
+
+@lru_cache(maxsize=None)
+def load_index_data() -> Dict:
+    """
+    Load the bundled command -> package index, reading it only once per process.
+    
+    Returns:
+        Parsed preamble_index.json
+    
+    Raises:
+        OSError: If the bundled index is missing
+    """
+    return json.loads(read_data(INDEX_NAME).decode('utf-8'))
+
+
+class PackageScanCache:
+    """
+    On-disk cache of the commands defined by installed package files.
+    
+    The cache holds one JSON file, valid while the index version and the
+    path, modification time and size of every scanned package file still
+    match. Anything unreadable is treated as a miss and failures to write
+    are ignored, so the cache can never break a run.
+    """
+    
+    def __init__(self, directory: Optional[str] = None) -> None:
+        """
+        Initialize package scan cache.
+        
+        Args:
+            directory: Cache directory (default: default_cache_dir('preamble'))
+        """
+        self.directory = Path(directory) if directory else default_cache_dir("preamble")
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def path(self) -> Path:
+        """Cache file."""
+        return self.directory / "packages.json"
+    
+    @staticmethod
+    def locate(packages: Iterable[str]) -> Dict[str, str]:
+        """
+        Find installed package files with kpsewhich.
+        
+        Args:
+            packages: Package names
+        
+        Returns:
+            Package name -> path of its .sty file, for the packages found
+            (empty if kpsewhich is not installed)
+        """
+        names = sorted(packages)
+        if not names or shutil.which(KPSEWHICH) is None:
+            return {}
+        try:
+            completed = subprocess.run(
+                [KPSEWHICH, *(name + ".sty" for name in names)], stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=60
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return {}
+        
+        paths = {}
+        for line in completed.stdout.decode('utf-8', errors='replace').splitlines():
+            path = Path(line.strip())
+            if path.suffix == ".sty" and path.stem in names:
+                paths[path.stem] = str(path)
+        return paths
+    
+    @staticmethod
+    def _key(version: int, paths: Dict[str, str]) -> Dict:
+        """Values that must match for the cache to be valid."""
+        files = {}
+        for package, path in sorted(paths.items()):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files[package] = [path, stat.st_mtime_ns, stat.st_size]
+        return {"version": PREAMBLE_CACHE_VERSION, "index": version, "files": files}
+    
+    def scan(self, version: int, packages: Iterable[str]) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Get the commands and environments installed packages define.
+        
+        Args:
+            version: Version of the bundled index
+            packages: Package names to scan
+        
+        Returns:
+            Package name -> {'commands': [...], 'environments': [...]},
+            from the cache when the package files have not changed
+        """
+        paths = self.locate(packages)
+        if not paths:
+            return {}
+        key = self._key(version, paths)
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+            if entry.get("key") != key:
+                raise ValueError("stale entry")
+            scanned = entry["packages"]
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+        else:
+            self.hits += 1
+            return scanned
+        
+        scanned = {}
+        for package, (path, _, _) in key["files"].items():
+            try:
+                text = strip_comments(Path(path).read_text(encoding='utf-8', errors='replace'))
+            except OSError:
+                continue
+            commands, environments = defined_names(text)
+            scanned[package] = {
+                "commands": sorted(name for name in commands if "@" not in name),
+                "environments": sorted(name for name in environments if "@" not in name),
+            }
+        
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump({"key": key, "packages": scanned}, file)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+        return scanned
+
+
+def load_index(cache: Optional[PackageScanCache] = None, scan: bool = True) -> PreambleIndex:
+    """
+    Load the command -> package index.
+    
+    Args:
+        cache: Cache of scanned package files (default: the user cache directory)
+        scan: Extend the bundled index with the installed package files
+    
+    Returns:
+        Index
+    
+    Raises:
+        OSError: If the bundled index is missing
+    """
+    data = load_index_data()
+    scanned = None
+    if scan:
+        scanned = (cache or PackageScanCache()).scan(data["version"], data["packages"])
+    return PreambleIndex.from_data(data, scanned)
+
+
+class PreambleAnalysis(NamedTuple):
+    """Packages a project's answers need, or why they could not be determined."""
+    
+    files: Tuple[str, ...]
+    packages: FrozenSet[str]
+    uncertain: Tuple[str, ...]
+    
+    @property
+    def lean(self) -> bool:
+        """True if the usage was determined and the preamble can be trimmed."""
+        return not self.uncertain
+
+
+class PreambleAnalyzer:
+    """Work out which packages the answer files of a project use."""
+    
+    def __init__(self, index: PreambleIndex, styles: Iterable[bytes] = ()) -> None:
+        """
+        Initialize analyzer.
+        
+        Args:
+            index: Command -> package index
+            styles: Content of the style files; the commands and
+                environments they define are known
+        """
+        self.index = index
+        self.style_commands: Set[str] = set()
+        self.style_environments: Set[str] = set()
+        for data in styles:
+            commands, environments = defined_names(strip_comments(data.decode('utf-8', errors='replace')))
+            self.style_commands |= commands
+            self.style_environments |= environments
+    
+    def analyze(self, folder: str) -> PreambleAnalysis:
+        """
+        Scan the answer files of a project, and the project files they \\input.
+        
+        Args:
+            folder: Project folder
+        
+        Returns:
+            Files scanned, packages needed, and the reasons the usage is
+            uncertain (none if the preamble can be trimmed)
+        """
+        root = Path(folder).resolve()
+        queue = sorted(path.name for path in root.iterdir() if ANSWER_FILE_PATTERN.match(path.name))
+        seen = set(queue)
+        uncertain: List[str] = []
+        commands: Set[str] = set()
+        environments: Set[str] = set()
+        defined_commands: Set[str] = set()
+        defined_environments: Set[str] = set()
+        packages = set(self.index.always)
+        
+        for name in queue:
+            try:
+                text = strip_comments((root / name).read_text(encoding='utf-8'))
+            except (OSError, UnicodeDecodeError) as error:
+                uncertain.append(f"Could not read {name}: {error}")
+                continue
+            
+            used = set(COMMAND_PATTERN.findall(text))
+            for command in sorted(used & self.index.uncertain):
+                uncertain.append(f"{name} uses \\{command}")
+            commands |= used
+            environments.update(env.strip() for env in ENVIRONMENT_PATTERN.findall(text))
+            new_commands, new_environments = defined_names(text)
+            defined_commands |= new_commands
+            defined_environments |= new_environments
+            for pattern, package in self.index.patterns:
+                if pattern.search(text):
+                    packages.add(package)
+            
+            for target in INPUT_PATTERN.findall(text):
+                target = target.strip()
+                if not Path(target).suffix:
+                    target += TEX_EXTENSION
+                path = (root / target).resolve()
+                if root not in path.parents or not path.is_file():
+                    uncertain.append(f"{name} inputs {target}, which is not a file in the project")
+                else:
+                    relative = path.relative_to(root).as_posix()
+                    if relative not in seen:
+                        seen.add(relative)
+                        queue.append(relative)
+        
+        unknown = []
+        known_commands = self.index.known_commands | self.style_commands | defined_commands
+        for command in sorted(commands):
+            providers = self.index.commands.get(command)
+            if providers:
+                packages.update(providers)
+            elif command not in known_commands and command not in self.index.uncertain:
+                unknown.append("\\" + command)
+        known_environments = self.index.known_environments | self.style_environments | defined_environments
+        for environment in sorted(environments):
+            providers = self.index.environments.get(environment)
+            if providers:
+                packages.update(providers)
+            elif environment not in known_environments:
+                unknown.append(f"{{{environment}}}")
+        if unknown:
+            shown = ", ".join(unknown[:MAX_REPORTED_NAMES])
+            more = f" and {len(unknown) - MAX_REPORTED_NAMES} more" if len(unknown) > MAX_REPORTED_NAMES else ""
+            uncertain.append(f"No package is known to provide {shown}{more}")
+        
+        return PreambleAnalysis(tuple(queue), frozenset(packages), tuple(uncertain))
+
+
+class LeanExtras(NamedTuple):
+    """A trimmed tma-extras.sty and what was trimmed."""
+    
+    data: bytes
+    kept: Tuple[str, ...]
+    dropped: Tuple[str, ...]
+    added: Tuple[str, ...]
+
+
+def build_lean_extras(full: bytes, analysis: PreambleAnalysis, index: PreambleIndex) -> LeanExtras:
+    """
+    Trim the \\RequirePackage lines of a full tma-extras.sty.
+    
+    Packages the index does not know about are always kept. Packages the
+    answers use directly that are normally loaded by a dropped package
+    (e.g. graphicx by adjustbox) are loaded directly after the last
+    \\RequirePackage line. An uncertain analysis keeps the full file.
+    
+    Args:
+        full: Content of the full tma-extras.sty
+        analysis: Result of PreambleAnalyzer.analyze()
+        index: Index used for the analysis
+    
+    Returns:
+        Trimmed file with the kept, dropped and directly loaded packages
+    """
+    lines = full.decode('utf-8').splitlines(keepends=True)
+    known = index.packages
+    kept: List[str] = []
+    dropped: List[str] = []
+    last_require = None
+    
+    for number, line in enumerate(lines):
+        match = REQUIRE_PATTERN.match(line.rstrip("\r\n"))
+        if match is None:
+            continue
+        last_require = number
+        indent, options, names, rest = match.groups()
+        packages = [name.strip() for name in names.split(",") if name.strip()]
+        keep = [
+            name for name in packages
+            if not analysis.lean or name in analysis.packages or name not in known
+        ]
+        kept.extend(keep)
+        dropped.extend(name for name in packages if name not in keep)
+        if len(keep) == len(packages):
+            continue
+        if keep:
+            lines[number] = f"{indent}\\RequirePackage{options or ''}{{{','.join(keep)}}}{rest}\n"
+        else:
+            lines[number] = f"{indent}% {line.lstrip()}"
+    
+    added = []
+    if analysis.lean:
+        loaded = set(kept)
+        added = sorted(
+            package for package, loaders in index.loaded_by.items()
+            if package in analysis.packages and package not in loaded and not loaded & set(loaders)
+        )
+    if added and last_require is not None:
+        lines.insert(last_require + 1, "".join(f"\\RequirePackage{{{package}}}\n" for package in added))
+    
+    if dropped or added:
+        header = [
+            "%% Lean preamble written by TMA LaTeX Generator for the answers in this project.\n",
+            f"%% Not loaded: {', '.join(dropped)}\n" if dropped else "",
+            f"%% Loaded directly: {', '.join(added)}\n" if added else "",
+            "%% Run --lean-preamble again after changing the answers, or regenerate\n",
+            "%% the project to restore the full file.\n",
+        ]
+        lines[:0] = header
+    
+    return LeanExtras("".join(lines).encode('utf-8'), tuple(kept), tuple(dropped), tuple(added))
+
+
+def run_lean_preamble(
+    folder: str,
+    style_dir: Optional[str] = None,
+    quiet: bool = False,
+    log: Optional[LogSink] = None
+) -> int:
+    """
+    Write a tma-extras.sty loading only the packages a project's answers use.
+    
+    The trimmed file is always built from the full tma-extras.sty (the
+    bundled one, or the one in style_dir), so running again after the
+    answers change, or once they need more packages, gives the right
+    file; an uncertain analysis restores the full file. The file is
+    replaced, never written through, so projects sharing a hardlinked
+    tma-extras.sty are not affected.
+    
+    Args:
+        folder: Project folder
+        style_dir: Directory holding the full tma-extras.sty and tma.sty
+            (default: the bundled style files)
+        quiet: Only print the summary line
+        log: Destination for progress lines (default: text on stdout/stderr)
+    
+    Returns:
+        Process exit code (0 on success)
+    """
+    log = log or StreamLogSink()
+    project = Path(folder).expanduser()
+    try:
+        if style_dir is None:
+            styles = {entry.path: entry.data for entry in load_bundled_styles()}
+        else:
+            styles = {
+                name: (Path(style_dir) / name).read_bytes()
+                for name in (MAIN_STYLE, EXTRAS_STYLE) if (Path(style_dir) / name).is_file()
+            }
+        if EXTRAS_STYLE not in styles:
+            raise OSError(f"{EXTRAS_STYLE} not found in {style_dir}")
+        if not project.is_dir():
+            raise OSError(f"{project} is not a directory")
+        
+        index = load_index()
+        analysis = PreambleAnalyzer(index, styles.values()).analyze(str(project))
+        extras = build_lean_extras(styles[EXTRAS_STYLE], analysis, index)
+        
+        destination = project / EXTRAS_STYLE
+        try:
+            unchanged = destination.read_bytes() == extras.data
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            temp_path = destination.with_name(f"{destination.name}.{os.getpid()}.tmp")
+            temp_path.write_bytes(extras.data)
+            os.replace(temp_path, destination)
+    except (OSError, ValueError) as error:
+        log.error(f"Lean Preamble Error: {error}")
+        log.flush()
+        return 1
+    
+    if (project / (FORMAT_NAME + FORMAT_EXTENSION)).exists():
+        log.warning(f"{project} loads a precompiled preamble format, which still holds every package")
+    if not quiet:
+        for reason in analysis.uncertain:
+            log.info(f"  {reason}")
+    if analysis.lean:
+        log.info(
+            f"Lean preamble for {project}: {len(analysis.files)} files scanned, "
+            f"{len(extras.kept) + len(extras.added)} packages loaded, {len(extras.dropped)} dropped"
+            + (f" ({', '.join(extras.dropped)})" if extras.dropped and not quiet else "")
+        )
+    else:
+        log.info(f"Kept the full preamble for {project}: the package usage could not be determined")
+    log.flush()
+    return 0
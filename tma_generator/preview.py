@@ -0,0 +1,300 @@
+"""
+Live project preview for the TMA LaTeX Generator.
+
+The preview lists the files a generation would write, as a tree following
+the \\include and \\input commands in their rendered content, without
+touching the output directory. Each question's files depend only on its
+parts and its number, so they are rendered once per distinct set of parts
+with a placeholder number, which is filled in for the question's position:
+editing one question re-renders only its own files, inserting or deleting
+a question only renumbers the later ones, and settings that the question
+templates do not use re-render just the main file. The tree is re-assembled
+from cached lines, so large structures preview in a few milliseconds.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from .core import QUESTION_PREFIX, TEX_EXTENSION, LaTeXFileGenerator
+from .plan import PlanEntry
+from .structure import Part, Question
+from .templates import TEMPLATE_PART, TEMPLATE_QUESTION, TEMPLATE_SUBPART, TEMPLATE_SUBPARTS
+
+
+# \include{name} or \input{name}, ignoring commented-out lines
+INCLUDE_PATTERN = re.compile(rb"\\(?:include|input)\{([^}]*)\}")
+
+# Tree drawing
+TREE_BRANCH = "├── "
+TREE_LAST = "└── "
+TREE_PIPE = "│   "
+TREE_SPACE = "    "
+
+# Stands in for the question number in cached renders; never occurs in templates
+NUMBER_PLACEHOLDER = "\x00"
+
+# Templates of the cached question, part and subpart files
+QUESTION_TEMPLATES = (TEMPLATE_QUESTION, TEMPLATE_PART, TEMPLATE_SUBPARTS, TEMPLATE_SUBPART)
+
+
+def included_files(data: bytes) -> List[str]:
+    """
+    Find the files included by rendered LaTeX.
+    
+    Args:
+        data: Rendered file content
+    
+    Returns:
+        Included file paths in order, with .tex added where LaTeX would add it
+    """
+    names = []
+    for line in data.splitlines():
+        code = line.split(b"%", 1)[0]
+        for match in INCLUDE_PATTERN.finditer(code):
+            name = match.group(1).decode('utf-8').strip()
+            if name:
+                names.append(name if Path(name).suffix else name + TEX_EXTENSION)
+    return names
+
+
+def format_size(size: int) -> str:
+    """
+    Format a file size for display.
+    
+    Args:
+        size: Size in bytes
+    
+    Returns:
+        e.g. '512 B' or '1.5 KB'
+    """
+    if size < 1024:
+        return f"{size} B"
+    return f"{size / 1024:.1f} KB"
+
+
+def _label(entry: PlanEntry) -> str:
+    """Tree line text for one file."""
+    return f"{entry.path}  ({entry.kind}, {format_size(len(entry.data))})"
+
+
+def include_tree(root: str, files: Mapping[str, PlanEntry]) -> List[str]:
+    """
+    Draw the include tree below one file.
+    
+    Args:
+        root: Path of the top file
+        files: Rendered files by path
+    
+    Returns:
+        One line per file, the first being the root itself
+    """
+    lines = []
+    # Stack of (path, prefix of this line, prefix of its children's lines)
+    stack: List[Tuple[str, str, str]] = [(root, "", "")]
+    shown = set()
+    
+    while stack:
+        path, prefix, child_prefix = stack.pop()
+        entry = files.get(path)
+        if entry is None:
+            lines.append(f"{prefix}{path}  (missing)")
+            continue
+        if path in shown:
+            lines.append(f"{prefix}{path}  (included again)")
+            continue
+        shown.add(path)
+        lines.append(prefix + _label(entry))
+        
+        children = included_files(entry.data)
+        for index in reversed(range(len(children))):
+            last = index == len(children) - 1
+            stack.append((
+                children[index],
+                child_prefix + (TREE_LAST if last else TREE_BRANCH),
+                child_prefix + (TREE_SPACE if last else TREE_PIPE)
+            ))
+    
+    return lines
+
+
+class QuestionPreview(NamedTuple):
+    """Rendered files of one question and its include tree."""
+    
+    entries: Tuple[PlanEntry, ...]
+    lines: Tuple[str, ...]
+    
+    @property
+    def size(self) -> int:
+        """Total size of the question's files in bytes."""
+        return sum(len(entry.data) for entry in self.entries)
+
+
+class ProjectPreview:
+    """
+    Preview of the project a configuration and structure would generate.
+    
+    Question files are rendered once per distinct tuple of parts and cached
+    with a placeholder number; the number is filled in for each position
+    the parts are shown at. Only changing the template directory or a
+    setting the question templates use clears the cache.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize an empty preview."""
+        self.config: Optional[Dict[str, str]] = None
+        self.generator: Optional[LaTeXFileGenerator] = None
+        # Rendered files by parts, with NUMBER_PLACEHOLDER for the number
+        self._rendered: Dict[Tuple[Part, ...], Tuple[PlanEntry, ...]] = {}
+        # Numbered previews by (number, parts)
+        self._questions: Dict[Tuple[int, Tuple[Part, ...]], QuestionPreview] = {}
+        # Settings the question templates use, including the template directory
+        self._question_keys: Tuple[str, ...] = ()
+        self.rendered = 0
+    
+    def configure(self, config: Dict[str, str]) -> None:
+        """
+        Use a configuration, dropping cached question files only if they depend on it.
+        
+        Args:
+            config: Configuration dictionary with file generation settings
+        
+        Raises:
+            ValueError: If the configured template directory is invalid
+        """
+        if config == self.config:
+            return
+        if self.config is not None and all(
+            config.get(key) == self.config.get(key) for key in self._question_keys
+        ):
+            # Only the main file changes; it is rendered on every refresh
+            self.config = dict(config)
+            self.generator.config = self.config
+            return
+        config = dict(config)
+        generator = LaTeXFileGenerator(config)
+        # Question templates are rendered with the whole configuration, so
+        # custom ones may use any setting (e.g. {{course}} in part.tex)
+        fields = generator.templates.fields(QUESTION_TEMPLATES)
+        self._question_keys = ("templates", *sorted(fields))
+        self.config = config
+        self.generator = generator
+        self._rendered = {}
+        self._questions = {}
+    
+    def question(self, question: Question) -> QuestionPreview:
+        """
+        Get the preview of one question, rendering it only if its parts are new.
+        
+        Args:
+            question: Question with its final number
+        
+        Returns:
+            Rendered files and include tree of the question
+        """
+        key = (question.number, question.parts)
+        preview = self._questions.get(key)
+        if preview is not None:
+            return preview
+        
+        rendered = self._rendered.get(question.parts)
+        if rendered is None:
+            rendered = tuple(self.generator.render_question(question, number=NUMBER_PLACEHOLDER))
+            self._rendered[question.parts] = rendered
+            self.rendered += 1
+        
+        number = str(question.number)
+        placeholder = NUMBER_PLACEHOLDER.encode('utf-8')
+        entries = tuple(
+            PlanEntry(
+                entry.path.replace(NUMBER_PLACEHOLDER, number),
+                entry.data.replace(placeholder, number.encode('utf-8')),
+                entry.kind
+            )
+            for entry in rendered
+        )
+        files = {entry.path: entry for entry in entries}
+        preview = QuestionPreview(entries, tuple(include_tree(entries[0].path, files)))
+        self._questions[key] = preview
+        return preview
+    
+    def render(
+        self,
+        config: Dict[str, str],
+        questions: Sequence[Optional[Question]],
+        incremental: bool = False
+    ) -> List[str]:
+        """
+        Build the preview lines for a structure.
+        
+        Args:
+            config: Configuration dictionary with file generation settings
+            questions: Questions in order, numbered from 1; None for a
+                question that has errors and cannot be rendered yet
+            incremental: Whether an existing output folder would be updated
+        
+        Returns:
+            Lines describing the output folder, the include tree and totals
+        
+        Raises:
+            ValueError: If the configured template directory is invalid
+        """
+        self.configure(config)
+        main = self.generator.render_main(len(questions))
+        
+        previews: Dict[str, QuestionPreview] = {}
+        pending: Dict[str, int] = {}
+        for number, question in enumerate(questions, start=1):
+            path = f"{QUESTION_PREFIX}{number}{TEX_EXTENSION}"
+            if question is None:
+                pending[path] = number
+            else:
+                previews[path] = self.question(question)
+        # Keep only the questions in use, so the caches stay bounded
+        in_use = [question for question in questions if question is not None]
+        self._questions = {
+            key: self._questions[key]
+            for key in ((question.number, question.parts) for question in in_use)
+        }
+        self._rendered = {question.parts: self._rendered[question.parts] for question in in_use}
+        
+        lines = [self._describe_output(incremental), "", _label(main)]
+        files = 1
+        size = len(main.data)
+        
+        children = included_files(main.data)
+        for index, path in enumerate(children):
+            last = index == len(children) - 1
+            branch, pipe = (TREE_LAST, TREE_SPACE) if last else (TREE_BRANCH, TREE_PIPE)
+            preview = previews.get(path)
+            if preview is not None:
+                lines.append(branch + preview.lines[0])
+                lines.extend(pipe + line for line in preview.lines[1:])
+                files += len(preview.entries)
+                size += preview.size
+            elif path in pending:
+                lines.append(f"{branch}{path}  (fix the errors in Question {pending[path]} to preview)")
+            else:
+                lines.append(f"{branch}{path}  (missing)")
+        
+        try:
+            styles = self.generator.styles.entries()
+        except (IOError, OSError) as error:
+            lines.append(f"Style files could not be read: {error}")
+        else:
+            for entry in styles:
+                lines.append(_label(entry))
+                size += len(entry.data)
+            files += len(styles)
+        
+        lines.extend(["", f"{files} files, {format_size(size)}"])
+        return lines
+    
+    def _describe_output(self, incremental: bool) -> str:
+        """Say what generating would do to the output folder."""
+        output = Path(self.config.get("output") or ".").expanduser().resolve()
+        if not output.exists():
+            return f"Creates {output}"
+        if incremental:
+            return f"Updates {output} in place (existing answer files are kept)"
+        return f"Replaces {output} (the existing folder is renamed to a timestamped backup)"
@@ -0,0 +1,417 @@
+"""
+Roster generation for the TMA LaTeX Generator.
+
+Generates the same TMA structure for every student on a roster, one output
+folder per student, spreading the work over a pool of processes.
+"""
+
+import csv
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .batch import ManifestLoader, report_summary, write_io_stats
+from .compile import run_compile_stage
+from .core import DEFAULT_CONFIG, LaTeXFileGenerator
+from .formats import FormatCache
+from .iostats import IOStats
+from .log import LOG_FORMAT_TEXT, LogSink, StreamLogSink, make_log_sink
+from .store import BlobStore, merge_store_summaries
+from .structure import Structure
+from .styles import StyleCache
+
+
+# Roster constants
+ROSTER_REQUIRED_KEYS = ("name", "pin")
+ROSTER_OPTIONAL_KEYS = ("output",)
+TASKS_PER_WORKER = 4
+MAX_CHUNK_SIZE = 64
+
+
+class RosterLoader:
+    """
+    Load a student roster from a CSV or JSON file.
+    
+    CSV rosters need a header row with at least ``name`` and ``pin`` columns.
+    JSON rosters are a list of objects with the same keys. Any other
+    configuration key (e.g. ``tma_ref``) may be given to override the
+    template for that student, and ``output`` overrides the student folder.
+    """
+    
+    @staticmethod
+    def load(roster_path: str) -> List[Dict[str, str]]:
+        """
+        Load and check every student in a roster file.
+        
+        Args:
+            roster_path: Path to a .csv or .json roster
+        
+        Returns:
+            List of per-student configuration overrides
+        
+        Raises:
+            ValueError: If the roster is malformed
+        """
+        try:
+            with open(roster_path, 'r', encoding='utf-8', newline='') as file:
+                if Path(roster_path).suffix.lower() == ".json":
+                    students = json.load(file)
+                else:
+                    students = list(csv.DictReader(file))
+        except (json.JSONDecodeError, csv.Error, IOError) as error:
+            raise ValueError(f"Could not read roster {roster_path}: {error}")
+        
+        if not isinstance(students, list) or not students:
+            raise ValueError("Roster must contain at least one student")
+        
+        allowed_keys = set(DEFAULT_CONFIG) | set(ROSTER_OPTIONAL_KEYS)
+        loaded = []
+        for row_num, student in enumerate(students, start=1):
+            if not isinstance(student, dict):
+                raise ValueError(f"Student {row_num}: must be an object")
+            student = {
+                str(key).strip(): str(value).strip()
+                for key, value in student.items() if key is not None
+            }
+            missing = [key for key in ROSTER_REQUIRED_KEYS if not student.get(key)]
+            if missing:
+                raise ValueError(f"Student {row_num}: Missing {', '.join(missing)}")
+            unknown = set(student) - allowed_keys
+            if unknown:
+                raise ValueError(f"Student {row_num}: Unknown keys: {', '.join(sorted(unknown))}")
+            loaded.append(student)
+        
+        return loaded
+
+
+def student_folder_name(student: Dict[str, str]) -> str:
+    """
+    Build a filesystem-safe folder name for a student.
+    
+    Args:
+        student: Student configuration overrides
+    
+    Returns:
+        Folder name derived from the student PIN
+    """
+    return re.sub(r'[^\w.-]+', '_', student["pin"]).strip('._') or "student"
+
+
+def _generate_chunk(
+    jobs: List[Tuple[Dict[str, str], Structure]],
+    options: Dict[str, bool],
+    collect_io: bool = False,
+    link_styles: bool = False,
+    style_dir: Optional[str] = None,
+    preamble_format: Optional[str] = None,
+    dedup_store: Optional[str] = None
+) -> Tuple[
+    List[Tuple[str, str, str, int, int, Optional[str], List[str], List[str]]],
+    Optional[Dict], Dict[str, int], Optional[Dict[str, int]], Optional[Dict]
+]:
+    """
+    Generate a chunk of student projects in a worker process.
+    
+    Style files are read and hashed once per chunk, and deployed to the
+    rest of the chunk's projects from the first copy written.
+    
+    Args:
+        jobs: List of (config, structure) tuples
+        options: Keyword options for LaTeXFileGenerator.generate_project
+        collect_io: Account filesystem operations for this chunk
+        link_styles: Deploy repeated style files as hardlinks
+        style_dir: Ship the .sty files in this directory instead of the bundled ones
+        preamble_format: Ship a precompiled preamble format for this TeX engine
+        dedup_store: Hardlink every file to a blob in this content-addressed store
+    
+    Returns:
+        List of (pin, folder, basename, files_written, files_skipped, error, warnings,
+        notes) tuples,
+        the chunk's I/O statistics if requested, its style deployment summary,
+        its format summary if a format was requested, and its store summary if
+        a store was requested
+    """
+    io_stats = IOStats() if collect_io else None
+    styles = StyleCache(fs=io_stats, link=link_styles, style_dir=style_dir)
+    formats = FormatCache(preamble_format, fs=io_stats) if preamble_format else None
+    store = BlobStore(dedup_store, fs=io_stats) if dedup_store else None
+    results = []
+    for config, structure in jobs:
+        generator = LaTeXFileGenerator(config, fs=io_stats, styles=styles, formats=formats, store=store)
+        try:
+            folder = generator.generate_project(structure, **options)
+            results.append(
+                (config["pin"], folder, config["basename"], generator.files_written,
+                 generator.files_skipped, None, generator.warnings, generator.notes)
+            )
+        except Exception as error:
+            results.append(
+                (config["pin"], config["output"], config["basename"], generator.files_written,
+                 generator.files_skipped, str(error), [], generator.notes)
+            )
+    return (
+        results, io_stats.to_dict() if io_stats else None, styles.summary(),
+        formats.summary() if formats else None, store.summary() if store else None
+    )
+
+
+class RosterGenerator:
+    """
+    Generate one project per student across a process pool.
+    
+    Only name and PIN differ between students, so the projects are fully
+    independent and throughput scales with the number of cores.
+    """
+    
+    def __init__(
+        self,
+        config: Dict[str, str],
+        structure: Structure,
+        workers: Optional[int] = None,
+        quiet: bool = False,
+        io_stats: Optional[IOStats] = None,
+        options: Optional[Dict[str, bool]] = None,
+        link_styles: bool = False,
+        style_dir: Optional[str] = None,
+        log: Optional[LogSink] = None,
+        preamble_format: Optional[str] = None,
+        dedup_store: Optional[str] = None
+    ) -> None:
+        """
+        Initialize roster generator.
+        
+        Args:
+            config: Template configuration; its output is the roster root folder
+            structure: Question structure shared by every student
+            workers: Number of worker processes (defaults to CPU count)
+            quiet: Suppress per-chunk progress lines
+            io_stats: Merge every worker's filesystem statistics into these
+            options: Keyword options for LaTeXFileGenerator.generate_project
+            link_styles: Deploy repeated style files as hardlinks
+            style_dir: Ship the .sty files in this directory instead of the bundled ones
+            log: Destination for progress lines and warnings (default: text on stdout/stderr)
+            preamble_format: Precompile the preamble into a format for this
+                TeX engine and ship it with every project
+            dedup_store: Keep each distinct file once in this content-addressed
+                store and hardlink the students' files to it
+        """
+        self.config = config
+        self.structure = structure
+        self.workers = workers or os.cpu_count() or 1
+        self.quiet = quiet
+        self.io_stats = io_stats
+        self.options = options or {}
+        self.link_styles = link_styles
+        self.style_dir = style_dir
+        self.log = log or StreamLogSink()
+        self.preamble_format = preamble_format
+        self.dedup_store = dedup_store
+    
+    def prepare_format(self) -> None:
+        """
+        Build the preamble format before the workers start, if one was requested.
+        
+        Every student shares the preamble, so the workers then all find the
+        format in the cache instead of each building it at once.
+        
+        Raises:
+            ValueError: If the format cannot be built
+        """
+        if not self.preamble_format:
+            return
+        generator = LaTeXFileGenerator(
+            self.config, styles=StyleCache(style_dir=self.style_dir),
+            formats=FormatCache(self.preamble_format)
+        )
+        try:
+            plan = generator.render_plan(self.structure)
+        except Exception as error:
+            raise ValueError(str(error))
+        generator.formats.ensure_plan(plan)
+    
+    def build_jobs(self, students: List[Dict[str, str]]) -> List[Tuple[Dict[str, str], Structure]]:
+        """
+        Build one generation job per student.
+        
+        Args:
+            students: Per-student configuration overrides
+        
+        Returns:
+            List of (config, structure) tuples
+        
+        Raises:
+            ValueError: If two students would share an output folder
+        """
+        root = Path(self.config["output"])
+        jobs = []
+        seen_folders = set()
+        
+        for student in students:
+            config = self.config.copy()
+            config.update(student)
+            if "output" not in student:
+                config["output"] = str(root / student_folder_name(student))
+            
+            folder = str(Path(config["output"]).resolve())
+            if folder in seen_folders:
+                raise ValueError(f"Student {student['pin']}: Output folder {folder} is used twice")
+            seen_folders.add(folder)
+            jobs.append((config, self.structure))
+        
+        return jobs
+    
+    def run(self, students: List[Dict[str, str]]) -> Dict[str, Union[int, float, List[str]]]:
+        """
+        Generate every student's project and collect a summary.
+        
+        Args:
+            students: Per-student configuration overrides
+        
+        Returns:
+            Summary with project, file and error counts and timings
+        """
+        jobs = self.build_jobs(students)
+        
+        # Batch students into chunks so process start-up and pickling costs
+        # are amortised over many small projects
+        chunk_size = max(1, min(MAX_CHUNK_SIZE, len(jobs) // (self.workers * TASKS_PER_WORKER)))
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+        
+        errors = []
+        outputs = []
+        projects = 0
+        files = 0
+        skipped = 0
+        styles = {"linked": 0, "cloned": 0, "written": 0, "bytes_saved": 0, "bytes_cloned": 0}
+        formats: Dict[str, int] = {}
+        store: Optional[Dict] = None
+        done = 0
+        start = time.perf_counter()
+        
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(
+                    _generate_chunk, chunk, self.options,
+                    self.io_stats is not None, self.link_styles, self.style_dir,
+                    self.preamble_format, self.dedup_store
+                )
+                for chunk in chunks
+            ]
+            for future in as_completed(futures):
+                results, chunk_io, chunk_styles, chunk_formats, chunk_store = future.result()
+                if chunk_io:
+                    self.io_stats.merge(chunk_io)
+                for key, value in chunk_styles.items():
+                    styles[key] += value
+                if chunk_formats:
+                    for key, value in chunk_formats.items():
+                        formats[key] = formats.get(key, 0) + value
+                if chunk_store:
+                    store = merge_store_summaries(store, chunk_store)
+                for pin, folder, basename, files_written, files_skipped, error, warnings, notes in results:
+                    files += files_written
+                    skipped += files_skipped
+                    if not self.quiet:
+                        for note in notes:
+                            self.log.info(note)
+                    for warning in warnings:
+                        self.log.warning(f"{folder}: {warning}")
+                    if error:
+                        errors.append(f"Student {pin} ({folder}): {error}")
+                    else:
+                        projects += 1
+                        outputs.append((folder, basename))
+                    done += 1
+                
+                if not self.quiet:
+                    self.log.info(f"[{done}/{len(jobs)}] students processed, {len(errors)} failed")
+        
+        self.log.flush()
+        elapsed = time.perf_counter() - start
+        return {
+            "projects": projects,
+            "files": files,
+            "skipped": skipped,
+            "styles": styles,
+            "formats": formats or None,
+            "store": store,
+            "errors": errors,
+            "outputs": outputs,
+            "seconds": elapsed,
+            "files_per_second": files / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+def run_roster(
+    manifest_path: str,
+    roster_path: str,
+    workers: Optional[int] = None,
+    quiet: bool = False,
+    io_stats_path: Optional[str] = None,
+    options: Optional[Dict[str, bool]] = None,
+    link_styles: bool = False,
+    style_dir: Optional[str] = None,
+    log_format: str = LOG_FORMAT_TEXT,
+    compile_options: Optional[Dict[str, object]] = None,
+    preamble_format: Optional[str] = None,
+    dedup_store: Optional[str] = None
+) -> int:
+    """
+    Generate one project per student from a template manifest and a roster.
+    
+    Args:
+        manifest_path: Path to a JSON manifest describing a single job
+        roster_path: Path to the CSV or JSON roster
+        workers: Number of worker processes (defaults to CPU count)
+        quiet: Suppress per-chunk progress lines
+        io_stats_path: Write per-phase filesystem statistics as JSON to this file
+        options: Keyword options for LaTeXFileGenerator.generate_project
+        link_styles: Deploy repeated style files as hardlinks
+        style_dir: Ship the .sty files in this directory instead of the bundled ones
+        log_format: Progress output format, 'text' or 'jsonl' (see tma_generator.log)
+        compile_options: Compile every generated project afterwards with these
+            options (see tma_generator.compile.run_compile_stage)
+        preamble_format: Ship a precompiled preamble format for this TeX engine
+            with every project (see tma_generator.formats)
+        dedup_store: Hardlink every student's files to blobs in this
+            content-addressed store (see tma_generator.store)
+    
+    Returns:
+        Process exit code (0 if every student succeeded, and compiled if requested)
+    """
+    # A JSON report on stdout leaves every other message to stderr
+    reports = (io_stats_path, (compile_options or {}).get("report"))
+    log = make_log_sink(log_format, stderr_only="-" in reports)
+    try:
+        jobs = ManifestLoader.load(manifest_path)
+        if len(jobs) != 1:
+            raise ValueError("Roster mode needs a manifest describing a single job")
+        students = RosterLoader.load(roster_path)
+        config, structure = jobs[0]
+        generator = RosterGenerator(
+            config, structure, workers=workers, quiet=quiet,
+            io_stats=IOStats() if io_stats_path else None, options=options,
+            link_styles=link_styles, style_dir=style_dir, log=log,
+            preamble_format=preamble_format, dedup_store=dedup_store
+        )
+        generator.build_jobs(students)
+        generator.prepare_format()
+    except ValueError as error:
+        log.error(f"Roster Error: {error}")
+        log.flush()
+        return 2
+    
+    summary = generator.run(students)
+    exit_code = report_summary(summary, len(students), log=log)
+    
+    if generator.io_stats:
+        write_io_stats(generator.io_stats, io_stats_path, quiet=quiet, log=log)
+    if compile_options is not None:
+        exit_code = max(exit_code, run_compile_stage(
+            summary["outputs"], compile_options, quiet=quiet, log=log
+        ))
+    return exit_code
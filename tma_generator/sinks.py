@@ -0,0 +1,347 @@
+"""
+Output sinks for the TMA LaTeX Generator.
+
+A sink receives rendered files one at a time and decides where they go:
+loose files in a directory, or entries in a ZIP archive that is streamed
+as files are rendered, ready to upload to Overleaf.
+"""
+
+import shutil
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, List, Optional, Set
+
+from .iostats import FileOps
+from .plan import ANSWER_KINDS, KIND_STYLE, PlanEntry
+from .store import BlobStore
+from .styles import DEPLOY_WRITE, StyleCache
+
+if TYPE_CHECKING:
+    # Only for annotations: zipfile is imported when an archive is first written
+    import zipfile
+
+
+# Archive constants
+ZIP_EXTENSION = ".zip"
+# zipfile.ZIP_DEFLATED, without importing zipfile up front
+ZIP_DEFLATED = 8
+PARTIAL_SUFFIX = ".partial"
+
+
+class OutputSink:
+    """
+    Destination for rendered project files.
+    
+    Sinks are used as context managers: files are written with write() and
+    the output is finalised when the context exits without an error.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize sink counters."""
+        self.files_written = 0
+        self.bytes_written = 0
+    
+    @property
+    def location(self) -> str:
+        """Path of the directory or archive being written."""
+        raise NotImplementedError
+    
+    def write(self, entry: PlanEntry) -> None:
+        """
+        Write one rendered file.
+        
+        Args:
+            entry: Rendered file to write
+        """
+        raise NotImplementedError
+    
+    def close(self) -> None:
+        """Finalise the output."""
+    
+    def abort(self) -> None:
+        """Discard partial output after a failure."""
+    
+    def __enter__(self) -> "OutputSink":
+        """Enter the sink context."""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the sink, or abort it if the block raised."""
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class DirectorySink(OutputSink):
+    """
+    Write rendered files as loose files into an existing directory.
+    
+    In incremental mode, answer files (parts and subparts) that already
+    exist are never touched; structure and style files are rewritten. The
+    directory is listed once rather than checking every file separately.
+    
+    With skip_unchanged, a file whose existing content hashes the same as
+    the rendered content is not rewritten, so its mtime is left alone and
+    latexmk or Overleaf do not consider it dirty.
+    
+    Style files are deployed through a StyleCache when one is given, so
+    repeated copies across a run can be linked or cloned instead of written.
+    With a BlobStore, every file is instead a hardlink to the store's blob
+    of its content. An existing file is removed before it is rewritten, so
+    an update never writes through a link into other projects.
+    """
+    
+    def __init__(
+        self,
+        folder: str,
+        fs: Optional[FileOps] = None,
+        incremental: bool = False,
+        skip_unchanged: bool = False,
+        styles: Optional[StyleCache] = None,
+        store: Optional[BlobStore] = None
+    ) -> None:
+        """
+        Initialize directory sink.
+        
+        Args:
+            folder: Existing output directory
+            fs: Filesystem operations to use
+            incremental: Keep existing answer files instead of overwriting them
+            skip_unchanged: Do not rewrite files whose content is identical
+            styles: Style cache used to deploy style files
+            store: Content-addressed store to link every file from
+        """
+        super().__init__()
+        self.folder = Path(folder)
+        # Directory files are written to (see StagedDirectorySink)
+        self.target = self.folder
+        self.fs = fs or FileOps()
+        self.incremental = incremental
+        self.skip_unchanged = skip_unchanged
+        self.styles = styles
+        self.store = store
+        self.preserved: List[str] = []
+        self.skipped: List[str] = []
+        self._existing: Optional[Set[str]] = None
+    
+    @property
+    def existing(self) -> Set[str]:
+        """Names present in the directory before anything was written."""
+        if self._existing is None:
+            self._existing = set(self.fs.listdir(self.folder))
+        return self._existing
+    
+    @property
+    def location(self) -> str:
+        """Path of the output directory."""
+        return str(self.folder)
+    
+    def write(self, entry: PlanEntry) -> None:
+        """
+        Write one rendered file with a single open.
+        
+        Args:
+            entry: Rendered file to write
+        """
+        if self.incremental and entry.kind in ANSWER_KINDS and entry.path in self.existing:
+            self.preserved.append(entry.path)
+            return
+        if self.skip_unchanged and self._is_unchanged(entry):
+            self.skipped.append(entry.path)
+            return
+        replace = (
+            self.target == self.folder
+            and (self.incremental or self.skip_unchanged)
+            and entry.path in self.existing
+        )
+        if self.store is not None:
+            if replace:
+                self.fs.remove(self.target / entry.path)
+            self.store.materialize(entry, self.target / entry.path)
+            self.files_written += 1
+            return
+        if self.styles is not None and entry.kind == KIND_STYLE:
+            if self.styles.deploy(entry, self.target / entry.path, replace=replace) == DEPLOY_WRITE:
+                self.bytes_written += len(entry.data)
+            self.files_written += 1
+            return
+        
+        if replace:
+            self.fs.remove(self.target / entry.path)
+        with self.fs.open(self.target / entry.path, 'wb') as file:
+            file.write(entry.data)
+        self.files_written += 1
+        self.bytes_written += len(entry.data)
+    
+    def _is_unchanged(self, entry: PlanEntry) -> bool:
+        """
+        Check whether a file on disk already has the rendered content.
+        
+        The size is compared first, so the existing file is only read and
+        hashed when it could possibly match.
+        
+        Args:
+            entry: Rendered file
+            
+        Returns:
+            True if the existing file's hash matches the rendered content
+        """
+        if entry.path not in self.existing:
+            return False
+        
+        file_path = self.folder / entry.path
+        if self.fs.stat(file_path).st_size != len(entry.data):
+            return False
+        # Deferred so importing the package stays cheap
+        import hashlib
+        
+        return hashlib.sha256(self.fs.read_bytes(file_path)).hexdigest() == entry.digest
+
+
+class StagedDirectorySink(DirectorySink):
+    """
+    Update an existing directory only once every file has been written.
+    
+    Files are compared with, and kept in, the existing directory exactly as
+    by DirectorySink, but written into a separate staging directory. close()
+    moves them into place and abort() discards them, so a failed or
+    cancelled update leaves the existing directory as it was.
+    """
+    
+    def __init__(
+        self,
+        folder: str,
+        staging: str,
+        fs: Optional[FileOps] = None,
+        incremental: bool = False,
+        skip_unchanged: bool = False,
+        styles: Optional[StyleCache] = None,
+        store: Optional[BlobStore] = None
+    ) -> None:
+        """
+        Initialize staged directory sink.
+        
+        Args:
+            folder: Existing output directory
+            staging: Empty directory to write into until close()
+            fs: Filesystem operations to use
+            incremental: Keep existing answer files instead of overwriting them
+            skip_unchanged: Do not rewrite files whose content is identical
+            styles: Style cache used to deploy style files
+            store: Content-addressed store to link every file from
+        """
+        super().__init__(
+            folder, fs=fs, incremental=incremental,
+            skip_unchanged=skip_unchanged, styles=styles, store=store
+        )
+        self.target = Path(staging)
+        self.staged: List[str] = []
+    
+    @property
+    def location(self) -> str:
+        """Path of the output directory."""
+        return str(self.folder)
+    
+    def write(self, entry: PlanEntry) -> None:
+        """
+        Write one rendered file into the staging directory.
+        
+        Args:
+            entry: Rendered file to write
+        """
+        files_written = self.files_written
+        super().write(entry)
+        if self.files_written > files_written:
+            self.staged.append(entry.path)
+    
+    def close(self) -> None:
+        """Move every staged file into the output directory."""
+        for path in self.staged:
+            self.fs.replace(self.target / path, self.folder / path)
+        shutil.rmtree(self.target, ignore_errors=True)
+    
+    def abort(self) -> None:
+        """Discard the staged files, leaving the output directory untouched."""
+        shutil.rmtree(self.target, ignore_errors=True)
+
+
+class ZipSink(OutputSink):
+    """
+    Stream rendered files into a ZIP archive.
+    
+    Entries are compressed straight into the archive as they arrive, so no
+    project files are staged on disk. The archive is written under a
+    temporary name and only moved into place when the sink is closed.
+    """
+    
+    def __init__(
+        self,
+        archive_path: str,
+        compression: int = ZIP_DEFLATED,
+        fs: Optional[FileOps] = None
+    ) -> None:
+        """
+        Initialize ZIP sink.
+        
+        Args:
+            archive_path: Path of the archive to create (.zip is appended if missing)
+            compression: zipfile compression method
+            fs: Filesystem operations to use
+        """
+        super().__init__()
+        self.fs = fs or FileOps()
+        path = Path(archive_path).resolve()
+        if path.suffix.lower() != ZIP_EXTENSION:
+            path = path.with_name(path.name + ZIP_EXTENSION)
+        self.archive_path = path
+        self.partial_path = path.with_name(path.name + PARTIAL_SUFFIX)
+        self.compression = compression
+        self._file: Optional[IO] = None
+        self._archive: Optional["zipfile.ZipFile"] = None
+    
+    @property
+    def location(self) -> str:
+        """Path of the finished archive."""
+        return str(self.archive_path)
+    
+    def write(self, entry: PlanEntry) -> None:
+        """
+        Compress one rendered file into the archive.
+        
+        Args:
+            entry: Rendered file to write
+        """
+        if self._archive is None:
+            # Deferred so importing the package stays cheap
+            import zipfile
+            
+            self.fs.mkdir(self.archive_path.parent, parents=True, exist_ok=True)
+            self._file = self.fs.open(self.partial_path, 'wb')
+            self._archive = zipfile.ZipFile(self._file, 'w', self.compression)
+        self._archive.writestr(entry.path, entry.data)
+        self.files_written += 1
+        self.bytes_written += len(entry.data)
+    
+    def close(self) -> None:
+        """Finish the archive and move it into place."""
+        if self._archive is None:
+            return
+        self._close_archive()
+        self.fs.replace(self.partial_path, self.archive_path)
+    
+    def abort(self) -> None:
+        """Discard the partially written archive."""
+        if self._archive is None:
+            return
+        self._close_archive()
+        try:
+            self.fs.remove(self.partial_path)
+        except FileNotFoundError:
+            pass
+    
+    def _close_archive(self) -> None:
+        """Close the archive and its underlying file."""
+        self._archive.close()
+        self._file.close()
+        self._archive = None
+        self._file = None
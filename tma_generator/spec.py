@@ -0,0 +1,337 @@
+"""
+Structure spec files for the TMA LaTeX Generator.
+
+A spec file holds the question structure of one TMA, so course structures
+can be kept as files instead of being typed into the GUI. JSON, TOML and
+YAML are supported, all with the same shape::
+    
+    {"questions": [{"marks": 50, "parts": "a,b,c", "subparts": "a:i,ii"},
+                   {"marks": 50, "parts": ["a", "b"], "subparts": {"b": ["i", "ii"]}}]}
+
+or in TOML::
+    
+    [[questions]]
+    marks = 50
+    parts = "a,b,c"
+    subparts = "a:i,ii"
+
+Parsed specs are cached on disk keyed by path, modification time and size,
+so batch runs over many courses do not re-parse and re-validate specs that
+have not changed.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .structure import Part, Question, Structure
+
+
+# Spec file formats by extension
+SPEC_FORMATS = {".json": "json", ".toml": "toml", ".yaml": "yaml", ".yml": "yaml"}
+SPEC_KEYS = ("questions", "description")
+SPEC_QUESTION_KEYS = ("marks", "parts", "subparts")
+
+# On-disk parse cache; bump the version when the cached form changes
+SPEC_CACHE_VERSION = 1
+SPEC_CACHE_DIR_NAME = "tma-generator"
+
+
+def default_cache_dir(name: str = "specs") -> Path:
+    """
+    Directory used for one of the generator's on-disk caches.
+    
+    Args:
+        name: Cache name ('specs' for the spec parse cache)
+    
+    Returns:
+        $XDG_CACHE_HOME/tma-generator/<name>, or ~/.cache/... if unset
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / SPEC_CACHE_DIR_NAME / name
+
+
+class SpecCache:
+    """
+    On-disk cache of parsed and validated spec files.
+    
+    Each spec gets one small JSON file named after a hash of its resolved
+    path. An entry is only used if the spec's modification time and size
+    still match; anything unreadable is treated as a miss, and failures to
+    write the cache are ignored, so the cache can never break a run.
+    """
+    
+    def __init__(self, directory: Optional[str] = None) -> None:
+        """
+        Initialize spec cache.
+        
+        Args:
+            directory: Cache directory (default: default_cache_dir())
+        """
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.hits = 0
+        self.misses = 0
+    
+    def _entry_path(self, spec_path: Path) -> Path:
+        """Cache file for a resolved spec path."""
+        return self.directory / (hashlib.sha256(str(spec_path).encode('utf-8')).hexdigest() + ".json")
+    
+    @staticmethod
+    def _key(spec_path: Path, stat: os.stat_result) -> Dict[str, Any]:
+        """Values that must match for a cache entry to be valid."""
+        return {
+            "version": SPEC_CACHE_VERSION,
+            "path": str(spec_path),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+    
+    def get(self, spec_path: Path, stat: os.stat_result) -> Optional[Structure]:
+        """
+        Look up a parsed spec.
+        
+        Args:
+            spec_path: Resolved spec path
+            stat: Current stat of the spec file
+        
+        Returns:
+            Cached structure, or None on a miss
+        """
+        try:
+            with open(self._entry_path(spec_path), 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+            if entry.get("key") != self._key(spec_path, stat):
+                raise ValueError("stale entry")
+            structure = Structure(tuple(
+                Question(number, marks, tuple(Part(name, tuple(subparts)) for name, subparts in parts))
+                for number, marks, parts in entry["structure"]
+            ))
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return structure
+    
+    def put(self, spec_path: Path, stat: os.stat_result, structure: Structure) -> None:
+        """
+        Store a parsed spec.
+        
+        The entry is written under a temporary name and moved into place,
+        so concurrent runs never read a half-written entry.
+        
+        Args:
+            spec_path: Resolved spec path
+            stat: Stat of the spec file when it was read
+            structure: Parsed structure
+        """
+        entry_path = self._entry_path(spec_path)
+        temp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump({"key": self._key(spec_path, stat), "structure": structure.questions}, file)
+            os.replace(temp_path, entry_path)
+        except OSError:
+            pass
+
+
+class SpecLoader:
+    """Load question structures from JSON, TOML or YAML spec files."""
+    
+    @staticmethod
+    def load(spec_path: str, cache: Optional[SpecCache] = None) -> Structure:
+        """
+        Load, check and parse a spec file, using the parse cache if given.
+        
+        Args:
+            spec_path: Path to a .json, .toml, .yaml or .yml spec
+            cache: Parse cache to consult and update
+        
+        Returns:
+            Validated question structure
+        
+        Raises:
+            ValueError: If the spec cannot be read or is invalid
+        """
+        path = Path(spec_path).expanduser().resolve()
+        spec_format = SPEC_FORMATS.get(path.suffix.lower())
+        if spec_format is None:
+            raise ValueError(
+                f"Unsupported spec file type '{path.suffix}' for {spec_path} "
+                f"(use {', '.join(sorted(SPEC_FORMATS))})"
+            )
+        
+        try:
+            stat = path.stat()
+        except OSError as error:
+            raise ValueError(f"Could not read spec {spec_path}: {error}")
+        
+        if cache is not None:
+            structure = cache.get(path, stat)
+            if structure is not None:
+                return structure
+        
+        raw_questions = SpecLoader.read(spec_path)
+        try:
+            structure = Structure.parse(raw_questions)
+        except ValueError as error:
+            raise ValueError(f"{spec_path}: {error}")
+        
+        if cache is not None:
+            cache.put(path, stat, structure)
+        return structure
+    
+    @staticmethod
+    def read(spec_path: str) -> List[Tuple[Any, Any, Any]]:
+        """
+        Read a spec file and check its shape, without validating questions.
+        
+        Used by load(), and by validation reports that need every problem
+        rather than a parsed structure.
+        
+        Args:
+            spec_path: Path to a .json, .toml, .yaml or .yml spec
+        
+        Returns:
+            Raw (marks, parts, subparts) for each question
+        
+        Raises:
+            ValueError: If the spec cannot be read, parsed or has the wrong shape
+        """
+        path = Path(spec_path).expanduser()
+        spec_format = SPEC_FORMATS.get(path.suffix.lower())
+        if spec_format is None:
+            raise ValueError(
+                f"Unsupported spec file type '{path.suffix}' for {spec_path} "
+                f"(use {', '.join(sorted(SPEC_FORMATS))})"
+            )
+        
+        try:
+            text = path.read_text(encoding='utf-8')
+        except OSError as error:
+            raise ValueError(f"Could not read spec {spec_path}: {error}")
+        
+        data = SpecLoader.parse_text(text, spec_format, spec_path)
+        try:
+            return SpecLoader.check_schema(data)
+        except ValueError as error:
+            raise ValueError(f"{spec_path}: {error}")
+    
+    @staticmethod
+    def parse_text(text: str, spec_format: str, spec_path: str = "<spec>") -> Any:
+        """
+        Parse spec text in one of the supported formats.
+        
+        TOML needs Python 3.11 or the tomli package, YAML needs PyYAML; both
+        are imported only when such a spec is read.
+        
+        Args:
+            text: File content
+            spec_format: 'json', 'toml' or 'yaml'
+            spec_path: Path used in error messages
+        
+        Returns:
+            Parsed data
+        
+        Raises:
+            ValueError: If the text cannot be parsed or the parser is missing
+        """
+        if spec_format == "json":
+            parse = json.loads
+        elif spec_format == "toml":
+            try:
+                import tomllib
+            except ImportError:
+                try:
+                    import tomli as tomllib
+                except ImportError:
+                    raise ValueError(
+                        f"Reading {spec_path} needs Python 3.11+ or the tomli package (pip install tomli)"
+                    )
+            parse = tomllib.loads
+        else:
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError(f"Reading {spec_path} needs PyYAML (pip install pyyaml)")
+            parse = yaml.safe_load
+        
+        try:
+            return parse(text)
+        except Exception as error:
+            # JSON, TOML and YAML parsers each raise their own error types
+            raise ValueError(f"Could not parse spec {spec_path}: {error}")
+    
+    @staticmethod
+    def check_schema(data: Any) -> List[Tuple[Any, Any, Any]]:
+        """
+        Check the shape of parsed spec data.
+        
+        Args:
+            data: Parsed spec
+        
+        Returns:
+            Raw (marks, parts, subparts) for each question
+        
+        Raises:
+            ValueError: Naming the location of the first schema violation
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Spec must be a mapping with a 'questions' list")
+        unknown = set(data) - set(SPEC_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown keys: {', '.join(sorted(map(str, unknown)))}")
+        
+        return SpecLoader.check_questions(data.get("questions"))
+    
+    @staticmethod
+    def check_questions(questions: Any, name: str = "questions") -> List[Tuple[Any, Any, Any]]:
+        """
+        Check the shape of a parsed list of questions.
+        
+        Args:
+            questions: Parsed question list
+            name: Key the list was read from, used in error locations
+        
+        Returns:
+            Raw (marks, parts, subparts) for each question
+        
+        Raises:
+            ValueError: Naming the location of the first schema violation
+        """
+        if not isinstance(questions, list) or not questions:
+            raise ValueError(f"'{name}' must be a non-empty list")
+        
+        raw_questions = []
+        for index, question in enumerate(questions):
+            where = f"{name}[{index}]"
+            if not isinstance(question, dict):
+                raise ValueError(f"{where}: expected a mapping")
+            unknown = set(question) - set(SPEC_QUESTION_KEYS)
+            if unknown:
+                raise ValueError(f"{where}: Unknown keys: {', '.join(sorted(map(str, unknown)))}")
+            
+            marks = question.get("marks")
+            if marks is not None and (isinstance(marks, bool) or not isinstance(marks, (int, str))):
+                raise ValueError(f"{where}.marks: expected a whole number")
+            
+            parts = question.get("parts", "")
+            if not isinstance(parts, str) and not (
+                isinstance(parts, list) and all(isinstance(p, str) for p in parts)
+            ):
+                raise ValueError(f"{where}.parts: expected a string or a list of strings")
+            
+            subparts = question.get("subparts", "")
+            if isinstance(subparts, dict):
+                for part, names in subparts.items():
+                    if not isinstance(names, list) or not all(isinstance(s, (str, int)) for s in names):
+                        raise ValueError(f"{where}.subparts.{part}: expected a list of strings")
+            elif not isinstance(subparts, str):
+                raise ValueError(f"{where}.subparts: expected a string or a mapping of part to list")
+            
+            raw_questions.append((marks, parts, subparts))
+        
+        return raw_questions
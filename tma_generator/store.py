@@ -0,0 +1,162 @@
+"""
+Content-addressed output store for the TMA LaTeX Generator.
+
+Across a roster or batch run almost every generated file is the same in
+every project: only the main file differs, through \\myname and \\mypin.
+A BlobStore keeps each distinct file content once, as a read-only blob
+named after its SHA-256 digest, and materialises project folders as
+hardlinks to the blobs. Two thousand students then cost a few thousand
+inodes and a few megabytes instead of tens of thousands of files.
+
+Blobs are read-only, so an editor cannot write through a link into every
+project's copy: editors that save by writing a new file and renaming it
+work as usual, others refuse to overwrite the file. Regenerating a
+project always replaces its files instead of writing into them.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from .iostats import FileOps
+from .plan import PlanEntry
+
+
+# Store layout: <store>/objects/<first two hex digits>/<rest of the digest>
+STORE_OBJECTS = "objects"
+BLOB_MODE = 0o444
+
+
+class BlobStore:
+    """
+    Store of file contents keyed by SHA-256 digest.
+    
+    A blob is written under a temporary name and linked into place, so
+    concurrent worker processes never see a half-written blob; if two of
+    them write the same blob at once, one link wins and the other copy is
+    discarded.
+    """
+    
+    def __init__(self, directory: Union[str, Path], fs: Optional[FileOps] = None) -> None:
+        """
+        Initialize blob store.
+        
+        Args:
+            directory: Store directory (created on first use)
+            fs: Filesystem operations to use
+        """
+        self.directory = Path(directory).resolve()
+        self.fs = fs or FileOps()
+        self.files = 0
+        self.bytes = 0
+        self.blobs_written = 0
+        self.bytes_written = 0
+        # Digest -> size of every blob linked into a project by this store
+        self.blobs: Dict[str, int] = {}
+    
+    def blob_path(self, digest: str) -> Path:
+        """Path of the blob with a digest."""
+        return self.directory / STORE_OBJECTS / digest[:2] / digest[2:]
+    
+    def put(self, entry: PlanEntry) -> Path:
+        """
+        Store a file's content unless a blob with its digest exists.
+        
+        Args:
+            entry: Rendered file
+        
+        Returns:
+            Path of the blob
+        
+        Raises:
+            OSError: If the blob cannot be written
+        """
+        digest = entry.digest
+        path = self.blob_path(digest)
+        if digest in self.blobs or self.fs.exists(path):
+            return path
+        
+        self.fs.mkdir(path.parent, parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with self.fs.open(temp_path, 'wb') as file:
+            file.write(entry.data)
+        os.chmod(temp_path, BLOB_MODE)
+        try:
+            self.fs.link(temp_path, path)
+        except FileExistsError:
+            pass
+        else:
+            self.blobs_written += 1
+            self.bytes_written += len(entry.data)
+        finally:
+            self.fs.remove(temp_path)
+        return path
+    
+    def materialize(self, entry: PlanEntry, destination: Path) -> None:
+        """
+        Create a project file as a hardlink to the blob of its content.
+        
+        Args:
+            entry: Rendered file
+            destination: Path to create; must not exist
+        
+        Raises:
+            OSError: If the blob cannot be written or linked (e.g. the
+                store is on another filesystem than the project)
+        """
+        self.fs.link(self.put(entry), destination)
+        self.blobs[entry.digest] = len(entry.data)
+        self.files += 1
+        self.bytes += len(entry.data)
+    
+    def summary(self) -> Dict[str, Union[int, Dict[str, int]]]:
+        """
+        Count the files materialised and the blobs behind them.
+        
+        Returns:
+            Dictionary with files, bytes, blobs_written, bytes_written and
+            blobs (digest -> size of every blob used)
+        """
+        return {
+            "files": self.files,
+            "bytes": self.bytes,
+            "blobs_written": self.blobs_written,
+            "bytes_written": self.bytes_written,
+            "blobs": dict(self.blobs),
+        }
+
+
+def merge_store_summaries(
+    total: Optional[Dict[str, Union[int, Dict[str, int]]]],
+    summary: Dict[str, Union[int, Dict[str, int]]]
+) -> Dict[str, Union[int, Dict[str, int]]]:
+    """
+    Add one store summary (e.g. a worker's) to a running total.
+    
+    Args:
+        total: Running total, or None for the first summary
+        summary: Summary returned by BlobStore.summary()
+    
+    Returns:
+        Combined summary
+    """
+    if total is None:
+        return {**summary, "blobs": dict(summary["blobs"])}
+    for key in ("files", "bytes", "blobs_written", "bytes_written"):
+        total[key] += summary[key]
+    total["blobs"].update(summary["blobs"])
+    return total
+
+
+def dedup_ratio(summary: Dict[str, Union[int, Dict[str, int]]]) -> float:
+    """
+    Bytes materialised per byte of distinct content.
+    
+    Args:
+        summary: Summary returned by BlobStore.summary() or merge_store_summaries()
+    
+    Returns:
+        Deduplication ratio (1.0 when nothing was shared)
+    """
+    unique = sum(summary["blobs"].values())
+    return summary["bytes"] / unique if unique else 1.0
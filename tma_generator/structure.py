@@ -0,0 +1,202 @@
+"""
+Question structure model for the TMA LaTeX Generator.
+
+A TMA's question structure is parsed and validated once, from GUI fields
+or a manifest, into small immutable tuples. Validation, the structure
+summary, render planning and generation all read the same model, and
+because it is made of plain tuples it is hashable and can key caches
+directly.
+"""
+
+from typing import Dict, Iterable, Mapping, NamedTuple, Tuple, Union
+
+
+# Question defaults
+DEFAULT_QUESTION_MARKS = 25
+EXPECTED_TOTAL_MARKS = 100
+
+# Raw input for parts ("a,b,c" or a list) and subparts ("a:i,ii;c:1,2" or a mapping)
+RawParts = Union[str, Iterable[str]]
+RawSubparts = Union[str, Mapping[str, Iterable[str]]]
+
+
+def parse_subparts_string(subparts_text: str) -> Dict[str, Dict[str, bool]]:
+    """
+    Parse subparts specification string.
+    
+    Args:
+        subparts_text: String like "a:i,ii,iii;c:1,2,3"
+    
+    Returns:
+        Dictionary mapping parts to their subparts
+    """
+    subparts_dict = {}
+    
+    if not subparts_text:
+        return subparts_dict
+    
+    # Split by semicolon for different parts
+    for part_subparts in subparts_text.split(';'):
+        if ':' not in part_subparts:
+            continue
+        
+        part, subparts_str = part_subparts.split(':', 1)
+        part = part.strip()
+        
+        # Split subparts by comma
+        subparts = [s.strip() for s in subparts_str.split(',') if s.strip()]
+        subparts_dict[part] = {s: True for s in subparts}
+    
+    return subparts_dict
+
+
+class Part(NamedTuple):
+    """A question part and the names of its subparts, in input order."""
+    
+    name: str
+    subparts: Tuple[str, ...] = ()
+
+
+class Question(NamedTuple):
+    """A question with its marks and parts, in generation order."""
+    
+    number: int
+    marks: int
+    parts: Tuple[Part, ...]
+    
+    @property
+    def id(self) -> str:
+        """Question identifier used in summaries (e.g. 'Q1')."""
+        return f"Q{self.number}"
+    
+    @classmethod
+    def parse(
+        cls,
+        number: int,
+        marks: Union[str, int, None],
+        parts: RawParts,
+        subparts: RawSubparts = ""
+    ) -> "Question":
+        """
+        Build a question from raw input, validating it.
+        
+        Parts are compared case-insensitively when checking for duplicates
+        and matching subparts to parts, and are kept in alphabetical order,
+        the order in which they are generated.
+        
+        Args:
+            number: One-based question number
+            marks: Marks as entered (blank means the default)
+            parts: "a,b,c" or a list of part names
+            subparts: "a:i,ii;c:1,2" or a mapping of part name to subpart names
+        
+        Returns:
+            Validated question
+        
+        Raises:
+            ValueError: Listing every problem with the input, one per line
+        """
+        # Deferred: the validator builds on this module
+        from .validation import StructureValidator
+        
+        issues = []
+        question = StructureValidator().check_question(number, marks, parts, subparts, issues)
+        if question is None:
+            raise ValueError("\n".join(str(issue) for issue in issues if issue.severity == "error"))
+        return question
+
+
+class Structure(NamedTuple):
+    """The complete question structure of a TMA."""
+    
+    questions: Tuple[Question, ...]
+    
+    @property
+    def total_marks(self) -> int:
+        """Sum of the marks of every question."""
+        return sum(question.marks for question in self.questions)
+    
+    @classmethod
+    def parse(cls, questions: Iterable[Tuple[Union[str, int, None], RawParts, RawSubparts]]) -> "Structure":
+        """
+        Build a structure from raw (marks, parts, subparts) input per question.
+        
+        Every question is checked; use StructureValidator directly to get
+        warnings as well as errors.
+        
+        Args:
+            questions: Raw input for each question, in order
+        
+        Returns:
+            Validated structure
+        
+        Raises:
+            ValueError: Listing every error in every question, one per line
+        """
+        from .validation import StructureValidator
+        
+        return StructureValidator(expected_total=None).validate(questions).raise_for_errors()
+    
+    @classmethod
+    def from_dict(
+        cls,
+        structure: Dict[str, Dict[str, Union[int, Dict[str, Dict[str, bool]]]]]
+    ) -> "Structure":
+        """
+        Convert the nested dictionary form used by earlier versions.
+        
+        Args:
+            structure: {"Q1": {"marks": 25, "parts": {"a": {"subparts": {...}}}}}
+        
+        Returns:
+            Equivalent structure, with questions numbered in order
+        """
+        questions = []
+        ordered = sorted(structure, key=lambda x: int(x[1:]))
+        for number, q_id in enumerate(ordered, start=1):
+            q_data = structure[q_id]
+            parts = q_data.get('parts', {})
+            questions.append(Question(
+                number,
+                int(q_data.get('marks', DEFAULT_QUESTION_MARKS)),
+                tuple(
+                    Part(name, tuple(parts[name].get('subparts', {})))
+                    for name in sorted(parts)
+                )
+            ))
+        return cls(tuple(questions))
+    
+    def to_dict(self) -> Dict[str, Dict[str, Union[int, Dict[str, Dict[str, bool]]]]]:
+        """
+        Convert to the nested dictionary form used by earlier versions.
+        
+        Returns:
+            {"Q1": {"marks": 25, "parts": {"a": {"subparts": {...}}}}}
+        """
+        return {
+            question.id: {
+                'marks': question.marks,
+                'parts': {
+                    part.name: {'subparts': {name: True for name in part.subparts}}
+                    for part in question.parts
+                }
+            }
+            for question in self.questions
+        }
+
+
+def as_structure(
+    structure: Union[Structure, Dict[str, Dict[str, Union[int, Dict[str, Dict[str, bool]]]]]]
+) -> Structure:
+    """
+    Accept either a Structure or the older nested dictionary form.
+    
+    Args:
+        structure: Structure or nested dictionary
+    
+    Returns:
+        Structure
+    """
+    if isinstance(structure, Structure):
+        return structure
+    return Structure.from_dict(structure)
@@ -0,0 +1,184 @@
+"""
+Style file cache for the TMA LaTeX Generator.
+
+Every project ships the same style files. tma.sty and tma-extras.sty are
+bundled as package data and loaded into memory once per process, so the
+output does not depend on the working directory. A StyleCache hashes
+them once per run, and deploys later copies from the first copy written
+to disk: by hardlink when enabled, otherwise with an in-kernel
+copy_file_range, and by a plain write when neither is supported. Only
+hardlinks save space: copy_file_range spares the copy a trip through
+Python, but on most filesystems (ext4, tmpfs) it still writes a full copy
+of the data, and may share extents only on some (e.g. Btrfs, XFS).
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .data import read_data
+from .iostats import FileOps
+from .plan import KIND_STYLE, PlanEntry
+
+
+# Style files bundled with the package, in the order they are written
+BUNDLED_STYLES = ("tma.sty", "tma-extras.sty")
+
+# Deployment methods, in order of preference
+DEPLOY_LINK = "link"
+DEPLOY_CLONE = "clone"
+DEPLOY_WRITE = "write"
+
+
+@lru_cache(maxsize=None)
+def load_bundled_styles() -> Tuple[PlanEntry, ...]:
+    """
+    Load the bundled style files, reading them only once per process.
+    
+    Returns:
+        Style file plan entries
+    
+    Raises:
+        OSError: If a bundled style file is missing
+    """
+    return tuple(PlanEntry(name, read_data(name), KIND_STYLE) for name in BUNDLED_STYLES)
+
+
+class StyleCache:
+    """
+    Content-addressed cache of the style files shipped with every project.
+    
+    Files are keyed by their SHA-256 digest. The first time a digest is
+    deployed it is written normally; that file then becomes the source for
+    every later deployment of the same content in the run.
+    
+    Hardlinked copies share their content, so an edit to tma.sty in one
+    project would show up in all of them. Linking is therefore opt-in;
+    an existing destination is always removed first, so rewriting a
+    project never writes through a link into other projects.
+    """
+    
+    def __init__(
+        self,
+        fs: Optional[FileOps] = None,
+        link: bool = False,
+        style_dir: Optional[str] = None
+    ) -> None:
+        """
+        Initialize an empty cache.
+        
+        Args:
+            fs: Filesystem operations to use
+            link: Deploy repeated copies as hardlinks
+            style_dir: Ship the .sty files in this directory instead of the
+                bundled ones
+        """
+        self.fs = fs or FileOps()
+        self.link = link
+        self.style_dir = style_dir
+        self._entries: Optional[List[PlanEntry]] = None
+        self._digests: Dict[str, str] = {}
+        self._sources: Dict[str, Path] = {}
+        self.deployed: Dict[str, int] = {DEPLOY_LINK: 0, DEPLOY_CLONE: 0, DEPLOY_WRITE: 0}
+        # Bytes not stored again thanks to hardlinks, and bytes copied in-kernel
+        self.bytes_saved = 0
+        self.bytes_cloned = 0
+    
+    def entries(self) -> List[PlanEntry]:
+        """
+        Style files to ship with a project, loaded and hashed on first use.
+        
+        Returns:
+            Style file plan entries
+        
+        Raises:
+            OSError: If a style file cannot be read
+        """
+        if self._entries is None:
+            if self.style_dir is None:
+                self._entries = list(load_bundled_styles())
+            else:
+                self._entries = [
+                    PlanEntry(sty_file.name, self.fs.read_bytes(sty_file), KIND_STYLE)
+                    for sty_file in self.fs.glob(self.style_dir, "*.sty")
+                ]
+            self._digests = {entry.path: entry.digest for entry in self._entries}
+        return self._entries
+    
+    def digest(self, entry: PlanEntry) -> str:
+        """
+        SHA-256 digest of a style entry, computed once per cached file.
+        
+        Args:
+            entry: Style file plan entry
+        
+        Returns:
+            Hex digest
+        """
+        digest = self._digests.get(entry.path)
+        if digest is None:
+            digest = self._digests[entry.path] = entry.digest
+        return digest
+    
+    def deploy(self, entry: PlanEntry, destination: Path, replace: bool = False) -> str:
+        """
+        Place a style file at a destination, reusing an earlier copy if possible.
+        
+        Args:
+            entry: Style file plan entry
+            destination: Path to create
+            replace: The destination already exists and must be replaced
+        
+        Returns:
+            Deployment method used (DEPLOY_LINK, DEPLOY_CLONE or DEPLOY_WRITE)
+        
+        Raises:
+            OSError: If the file cannot be written at all
+        """
+        if replace:
+            self.fs.remove(destination)
+        
+        digest = self.digest(entry)
+        source = self._sources.get(digest)
+        method = DEPLOY_WRITE
+        
+        if source is not None and self.link:
+            try:
+                self.fs.link(source, destination)
+                method = DEPLOY_LINK
+            except OSError:
+                pass
+        if source is not None and method == DEPLOY_WRITE:
+            try:
+                self.fs.copy_file_range(source, destination)
+                method = DEPLOY_CLONE
+            except OSError:
+                pass
+        if method == DEPLOY_WRITE:
+            with self.fs.open(destination, 'wb') as file:
+                file.write(entry.data)
+            self._sources.setdefault(digest, destination)
+        elif method == DEPLOY_LINK:
+            self.bytes_saved += len(entry.data)
+        else:
+            # A real copy on most filesystems, so nothing is counted as saved
+            self.bytes_cloned += len(entry.data)
+        
+        self.deployed[method] += 1
+        return method
+    
+    def summary(self) -> Dict[str, int]:
+        """
+        Counts of each deployment method, the bytes saved by hardlinks and
+        the bytes copied in-kernel.
+        
+        Returns:
+            Dictionary with linked, cloned, written, bytes_saved and bytes_cloned
+        """
+        return {
+            "linked": self.deployed[DEPLOY_LINK],
+            "cloned": self.deployed[DEPLOY_CLONE],
+            "written": self.deployed[DEPLOY_WRITE],
+            "bytes_saved": self.bytes_saved,
+            "bytes_cloned": self.bytes_cloned,
+        }
@@ -0,0 +1,246 @@
+"""
+File templates for the TMA LaTeX Generator.
+
+The main document, question, part and subpart files are rendered from
+template files. A template is plain LaTeX with {{field}} placeholders and
+{{#name}}...{{/name}} sections, which repeat for every item of a list
+field and are skipped when the field is empty. Templates are parsed once
+per process and compiled into render functions, so generating thousands
+of projects never re-parses them.
+
+Departments can override any template by putting a file of the same name
+(main.tex, question.tex, part.tex, subparts.tex, subpart.tex) in their own
+template directory; the bundled templates are used for the rest.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from .data import read_data
+
+
+# Template names and the directory holding the bundled templates
+TEMPLATE_MAIN = "main"
+TEMPLATE_QUESTION = "question"
+TEMPLATE_PART = "part"
+TEMPLATE_SUBPARTS = "subparts"
+TEMPLATE_SUBPART = "subpart"
+TEMPLATE_NAMES = (
+    TEMPLATE_MAIN, TEMPLATE_QUESTION, TEMPLATE_PART, TEMPLATE_SUBPARTS, TEMPLATE_SUBPART
+)
+TEMPLATE_EXTENSION = ".tex"
+TEMPLATE_DATA_DIR = "templates"
+
+# {{field}}, {{#section}} or {{/section}}; LaTeX braces around a tag are
+# left alone, so \input{{{id}}} renders as \input{q1a}
+TAG_PATTERN = re.compile(r"\{\{([#/]?)(\w+)\}\}")
+
+Context = Dict[str, object]
+RenderFunction = Callable[[Context], str]
+
+
+def _compile_nodes(source: str, name: str) -> RenderFunction:
+    """
+    Compile template source into a render function.
+    
+    Args:
+        source: Template text
+        name: Template name used in error messages
+    
+    Returns:
+        Function rendering a context dictionary to text
+    
+    Raises:
+        ValueError: If sections are not properly nested
+    """
+    # Stack of (section name, nodes) while sections are open
+    stack: List[Tuple[Optional[str], List[Union[str, RenderFunction]]]] = [(None, [])]
+    position = 0
+    
+    for match in TAG_PATTERN.finditer(source):
+        nodes = stack[-1][1]
+        if match.start() > position:
+            nodes.append(source[position:match.start()])
+        position = match.end()
+        
+        marker, field = match.groups()
+        if marker == "#":
+            stack.append((field, []))
+        elif marker == "/":
+            if stack[-1][0] != field:
+                raise ValueError(f"Template '{name}': unexpected {match.group(0)}")
+            body = stack.pop()[1]
+            stack[-1][1].append(_section(field, _join(body), name))
+        else:
+            stack[-1][1].append(_field(field, name))
+    
+    if len(stack) > 1:
+        raise ValueError(f"Template '{name}': {{{{#{stack[-1][0]}}}}} is never closed")
+    if position < len(source):
+        stack[0][1].append(source[position:])
+    return _join(stack[0][1])
+
+
+def _join(nodes: List[Union[str, RenderFunction]]) -> RenderFunction:
+    """Build a render function concatenating literal text and rendered nodes."""
+    if all(isinstance(node, str) for node in nodes):
+        text = "".join(nodes)
+        return lambda context: text
+    
+    return lambda context: "".join(
+        node if isinstance(node, str) else node(context) for node in nodes
+    )
+
+
+def _field(field: str, name: str) -> RenderFunction:
+    """Build a render function substituting one field."""
+    def render(context: Context) -> str:
+        try:
+            return str(context[field])
+        except KeyError:
+            raise ValueError(f"Template '{name}': unknown field '{field}'")
+    return render
+
+
+def _section(field: str, body: RenderFunction, name: str) -> RenderFunction:
+    """Build a render function for a {{#field}} section."""
+    def render(context: Context) -> str:
+        try:
+            value = context[field]
+        except KeyError:
+            raise ValueError(f"Template '{name}': unknown section '{field}'")
+        if isinstance(value, (list, tuple)):
+            return "".join(body({**context, **item}) for item in value)
+        return body(context) if value else ""
+    return render
+
+
+class Template:
+    """A template compiled into a render function."""
+    
+    __slots__ = ("name", "source", "_render")
+    
+    def __init__(self, name: str, source: str) -> None:
+        """
+        Compile a template.
+        
+        A single trailing newline is ignored, since most editors add one.
+        
+        Args:
+            name: Template name
+            source: Template text
+        
+        Raises:
+            ValueError: If sections are not properly nested
+        """
+        if source.endswith("\n"):
+            source = source[:-1]
+        self.name = name
+        self.source = source
+        self._render = _compile_nodes(source, name)
+    
+    def render(self, context: Context) -> str:
+        """
+        Render the template.
+        
+        Args:
+            context: Field values; list fields hold one dict per section item
+        
+        Returns:
+            Rendered text
+        
+        Raises:
+            ValueError: If the template uses a field that was not supplied
+        """
+        return self._render(context)
+    
+    @property
+    def fields(self) -> FrozenSet[str]:
+        """Names of every field and section the template uses."""
+        return frozenset(match.group(2) for match in TAG_PATTERN.finditer(self.source))
+
+
+class TemplateSet:
+    """The templates used to render one project, by name."""
+    
+    def __init__(self, templates: Dict[str, Template]) -> None:
+        """
+        Initialize template set.
+        
+        Args:
+            templates: Compiled templates keyed by name
+        """
+        self.templates = templates
+    
+    def render(self, name: str, context: Context) -> str:
+        """
+        Render one of the templates.
+        
+        Args:
+            name: Template name (e.g. TEMPLATE_MAIN)
+            context: Field values
+        
+        Returns:
+            Rendered text
+        """
+        return self.templates[name].render(context)
+    
+    def fields(self, names: Iterable[str]) -> FrozenSet[str]:
+        """
+        Collect the fields used by some of the templates.
+        
+        Args:
+            names: Template names (e.g. TEMPLATE_PART)
+        
+        Returns:
+            Names of every field and section any of them uses
+        """
+        return frozenset().union(*(self.templates[name].fields for name in names))
+
+
+@lru_cache(maxsize=None)
+def _bundled_source(name: str) -> str:
+    """Read a bundled template once per process."""
+    return read_data(TEMPLATE_DATA_DIR, name + TEMPLATE_EXTENSION).decode('utf-8')
+
+
+@lru_cache(maxsize=None)
+def _load_templates(directory: Optional[str]) -> TemplateSet:
+    """Load and compile a template set; cached by directory."""
+    templates = {}
+    for name in TEMPLATE_NAMES:
+        override = Path(directory) / (name + TEMPLATE_EXTENSION) if directory else None
+        if override is not None and override.is_file():
+            source = override.read_text(encoding='utf-8')
+        else:
+            source = _bundled_source(name)
+        templates[name] = Template(name, source)
+    return TemplateSet(templates)
+
+
+def load_templates(directory: Optional[str] = None) -> TemplateSet:
+    """
+    Get the compiled templates for a template directory.
+    
+    Each directory is loaded and compiled only once per process.
+    
+    Args:
+        directory: Department template directory; templates it does not
+            contain fall back to the bundled ones (default: bundled only)
+    
+    Returns:
+        Compiled template set
+    
+    Raises:
+        ValueError: If the directory does not exist or a template is malformed
+        OSError: If a template cannot be read
+    """
+    if not directory:
+        return _load_templates(None)
+    
+    path = Path(directory).expanduser().resolve()
+    if not path.is_dir():
+        raise ValueError(f"Template directory not found: {directory}")
+    return _load_templates(str(path))
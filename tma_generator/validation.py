@@ -0,0 +1,422 @@
+"""
+Question structure validation for the TMA LaTeX Generator.
+
+The validator checks every question in one linear pass and reports every
+error and warning it finds, each with its location, instead of stopping at
+the first problem. It has no GUI dependencies: the desktop app, manifests,
+spec files and the --validate command line option all use it.
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .structure import (
+    DEFAULT_QUESTION_MARKS,
+    EXPECTED_TOTAL_MARKS,
+    Part,
+    Question,
+    RawParts,
+    RawSubparts,
+    Structure,
+    parse_subparts_string,
+)
+
+
+# Issue severities
+SEVERITY_ERROR = "error"
+SEVERITY_WARNING = "warning"
+
+# Part names that make safe file names and \input arguments
+SAFE_PART_NAME = re.compile(r"^[A-Za-z0-9]+$")
+
+RawQuestion = Tuple[Union[str, int, None], RawParts, RawSubparts]
+
+
+class Issue(NamedTuple):
+    """A validation error or warning and where it was found."""
+    
+    severity: str
+    location: str
+    message: str
+    
+    def __str__(self) -> str:
+        """Issue as shown to users, e.g. 'Question 2, part b: ...'."""
+        return f"{self.location}: {self.message}" if self.location else self.message
+
+
+class ValidationReport:
+    """
+    All issues found in a structure, and the structure itself if valid.
+    
+    Warnings do not stop generation; errors do.
+    """
+    
+    def __init__(self, issues: List[Issue], structure: Optional[Structure]) -> None:
+        """
+        Initialize report.
+        
+        Args:
+            issues: Errors and warnings in input order
+            structure: Parsed structure, or None if there were errors
+        """
+        self.issues = issues
+        self.structure = structure
+    
+    @property
+    def errors(self) -> List[Issue]:
+        """Issues that prevent generation."""
+        return [issue for issue in self.issues if issue.severity == SEVERITY_ERROR]
+    
+    @property
+    def warnings(self) -> List[Issue]:
+        """Issues worth reporting that do not prevent generation."""
+        return [issue for issue in self.issues if issue.severity == SEVERITY_WARNING]
+    
+    @property
+    def ok(self) -> bool:
+        """True if there are no errors."""
+        return self.structure is not None
+    
+    def raise_for_errors(self) -> Structure:
+        """
+        Get the structure, raising if there were errors.
+        
+        Returns:
+            Validated structure
+        
+        Raises:
+            ValueError: Listing every error, one per line
+        """
+        if self.structure is None:
+            raise ValueError("\n".join(str(issue) for issue in self.errors))
+        return self.structure
+    
+    def to_dict(self) -> Dict:
+        """
+        Summarise the report for JSON output.
+        
+        Returns:
+            Dictionary with ok, error and warning counts and every issue
+        """
+        return {
+            "ok": self.ok,
+            "errors": len(self.errors),
+            "warnings": len(self.warnings),
+            "issues": [issue._asdict() for issue in self.issues],
+        }
+
+
+class StructureValidator:
+    """
+    Validate raw question input in a single pass.
+    
+    Each question is checked independently with dictionaries and sets, so
+    the cost is linear in the number of questions, parts and subparts.
+    """
+    
+    def __init__(self, expected_total: Optional[int] = EXPECTED_TOTAL_MARKS) -> None:
+        """
+        Initialize validator.
+        
+        Args:
+            expected_total: Total marks to warn about if not met (None to skip)
+        """
+        self.expected_total = expected_total
+    
+    def validate(self, questions: Iterable[RawQuestion]) -> ValidationReport:
+        """
+        Validate every question and the structure as a whole.
+        
+        Args:
+            questions: Raw (marks, parts, subparts) for each question, in order
+        
+        Returns:
+            Report with every issue, and the structure if there were no errors
+        """
+        issues: List[Issue] = []
+        parsed: List[Question] = []
+        failed = False
+        
+        for number, (marks, parts, subparts) in enumerate(questions, start=1):
+            question = self.check_question(number, marks, parts, subparts, issues)
+            if question is None:
+                failed = True
+            else:
+                parsed.append(question)
+        
+        return self.finish(issues, parsed, failed)
+    
+    def finish(self, issues: List[Issue], parsed: List[Question], failed: bool) -> ValidationReport:
+        """
+        Add the whole-structure checks and build the report.
+        
+        Args:
+            issues: Issues found in the individual questions
+            parsed: Questions without errors, numbered in order
+            failed: Whether any question had errors
+        
+        Returns:
+            Report with every issue, and the structure if there were no errors
+        """
+        if not parsed and not failed:
+            issues.append(Issue(SEVERITY_ERROR, "", "No questions specified."))
+            failed = True
+        
+        total_marks = sum(question.marks for question in parsed)
+        if not failed and self.expected_total is not None and total_marks != self.expected_total:
+            issues.append(Issue(
+                SEVERITY_WARNING, "Structure",
+                f"Total marks are {total_marks} (should be {self.expected_total})."
+            ))
+        
+        return ValidationReport(issues, None if failed else Structure(tuple(parsed)))
+    
+    def check_question(
+        self,
+        number: int,
+        marks: Union[str, int, None],
+        parts: RawParts,
+        subparts: RawSubparts,
+        issues: List[Issue],
+        location: Optional[str] = None
+    ) -> Optional[Question]:
+        """
+        Check one question, appending its issues.
+        
+        Parts are compared case-insensitively when checking for duplicates
+        and matching subparts to parts, and are kept in alphabetical order,
+        the order in which they are generated.
+        
+        Args:
+            number: One-based question number
+            marks: Marks as entered (blank means the default)
+            parts: "a,b,c" or a list of part names
+            subparts: "a:i,ii;c:1,2" or a mapping of part name to subpart names
+            issues: List to append errors and warnings to
+            location: Location of question-level issues (default: "Question <number>");
+                part-level issues are located at "<location>, part <name>"
+        
+        Returns:
+            The question, or None if it has errors
+        """
+        if location is None:
+            location = f"Question {number}"
+        part_prefix = f"{location}, part " if location else "part "
+        first_issue = len(issues)
+        
+        def error(message: str, where: str = location) -> None:
+            issues.append(Issue(SEVERITY_ERROR, where, message))
+        
+        marks_text = str(marks).strip() if marks is not None else ""
+        marks_value = DEFAULT_QUESTION_MARKS
+        try:
+            marks_value = int(marks_text) if marks_text else DEFAULT_QUESTION_MARKS
+        except ValueError:
+            error(f"Marks must be a valid number (got '{marks_text}').")
+        else:
+            if marks_value <= 0:
+                error(f"Marks must be a positive number (got '{marks_text}').")
+        
+        if isinstance(parts, str):
+            parts = parts.split(',')
+        part_names = [str(p).strip() for p in parts if str(p).strip()]
+        if not part_names:
+            error("No parts specified. Please add at least one part (e.g., 'a,b,c,d').")
+        
+        by_key: Dict[str, str] = {}
+        duplicates: Dict[str, None] = {}
+        for name in part_names:
+            key = name.lower()
+            if key in by_key:
+                duplicates[key] = None
+            else:
+                by_key[key] = name
+                if not SAFE_PART_NAME.match(name):
+                    issues.append(Issue(
+                        SEVERITY_WARNING, part_prefix + name,
+                        "Part names should be letters or digits only; "
+                        "other characters may break file names and \\input."
+                    ))
+        if duplicates:
+            error(f"Duplicate parts found: {', '.join(duplicates)}. Each part should be unique.")
+        
+        if isinstance(subparts, str):
+            subparts_map = {
+                part: list(names) for part, names in parse_subparts_string(subparts.strip()).items()
+            }
+        else:
+            subparts_map = {
+                str(part).strip(): [str(s).strip() for s in names if str(s).strip()]
+                for part, names in subparts.items()
+            }
+        
+        subparts_by_part: Dict[str, Tuple[str, ...]] = {}
+        for part, names in subparts_map.items():
+            if part.lower() not in by_key:
+                error(
+                    f"Subpart references part '{part}' which doesn't exist.\n"
+                    f"Available parts: {', '.join(part_names)}\n"
+                    f"Check your subparts format: 'part:sub1,sub2;part2:sub1,sub2'"
+                )
+            elif not names:
+                error(
+                    f"Part '{part}' has no subparts specified. "
+                    f"Either remove '{part}:' or add subparts like '{part}:i,ii,iii'.",
+                    part_prefix + part
+                )
+            else:
+                subparts_by_part[by_key[part.lower()]] = tuple(names)
+        
+        if any(issue.severity == SEVERITY_ERROR for issue in issues[first_issue:]):
+            return None
+        return Question(
+            number,
+            marks_value,
+            tuple(Part(name, subparts_by_part.get(name, ())) for name in sorted(part_names))
+        )
+
+
+class QuestionCheck(NamedTuple):
+    """Cached validation result of one question."""
+    
+    raw: RawQuestion
+    question: Optional[Question]
+    marks: int
+    issues: Tuple[Issue, ...]
+    
+    @property
+    def errors(self) -> List[Issue]:
+        """Issues that prevent generation."""
+        return [issue for issue in self.issues if issue.severity == SEVERITY_ERROR]
+
+
+class IncrementalValidator:
+    """
+    Keep per-question validation results up to date as questions are edited.
+    
+    Every question's result is cached with the raw input it was computed
+    from. Editing, inserting or removing a question re-checks only that
+    question and adjusts the running marks total and error count, so the
+    cost of an edit does not depend on the number of questions. Issue
+    locations are stored relative to their question ("" or "part b") and
+    numbered when a report is built, so removing a question never
+    invalidates the results of the others.
+    """
+    
+    def __init__(self, expected_total: Optional[int] = EXPECTED_TOTAL_MARKS) -> None:
+        """
+        Initialize incremental validator.
+        
+        Args:
+            expected_total: Total marks to warn about in report() (None to skip)
+        """
+        self.validator = StructureValidator(expected_total)
+        self.checks: List[QuestionCheck] = []
+        self.total_marks = 0
+        self.invalid = 0
+    
+    def __len__(self) -> int:
+        """Number of questions."""
+        return len(self.checks)
+    
+    def reset(self, questions: Iterable[RawQuestion]) -> None:
+        """
+        Check a new set of questions from scratch.
+        
+        Args:
+            questions: Raw (marks, parts, subparts) for each question, in order
+        """
+        self.checks = []
+        self.total_marks = 0
+        self.invalid = 0
+        for raw in questions:
+            self.insert(len(self.checks), raw)
+    
+    def insert(self, index: int, raw: RawQuestion) -> QuestionCheck:
+        """
+        Check a new question.
+        
+        Args:
+            index: Position of the question
+            raw: Raw (marks, parts, subparts)
+        
+        Returns:
+            Result for the question
+        """
+        check = self._check(raw)
+        self.checks.insert(index, check)
+        self._count(check, 1)
+        return check
+    
+    def remove(self, index: int) -> None:
+        """
+        Forget a removed question.
+        
+        Args:
+            index: Position of the question
+        """
+        self._count(self.checks.pop(index), -1)
+    
+    def update(self, index: int, raw: RawQuestion) -> QuestionCheck:
+        """
+        Re-check an edited question, unless its input is unchanged.
+        
+        Args:
+            index: Position of the question
+            raw: Raw (marks, parts, subparts) as now entered
+        
+        Returns:
+            Result for the question
+        """
+        check = self.checks[index]
+        if check.raw == tuple(raw):
+            return check
+        
+        self._count(check, -1)
+        check = self.checks[index] = self._check(raw)
+        self._count(check, 1)
+        return check
+    
+    def _check(self, raw: RawQuestion) -> QuestionCheck:
+        """Validate one question with locations relative to the question."""
+        marks, parts, subparts = raw
+        issues: List[Issue] = []
+        question = self.validator.check_question(0, marks, parts, subparts, issues, location="")
+        
+        if question is not None:
+            marks_value = question.marks
+        else:
+            # Count whatever marks were entered towards the running total
+            try:
+                marks_value = max(0, int(str(marks).strip() or DEFAULT_QUESTION_MARKS))
+            except ValueError:
+                marks_value = 0
+        return QuestionCheck(tuple(raw), question, marks_value, tuple(issues))
+    
+    def _count(self, check: QuestionCheck, sign: int) -> None:
+        """Add a result to (or remove it from) the running totals."""
+        self.total_marks += sign * check.marks
+        if check.question is None:
+            self.invalid += sign
+    
+    def report(self) -> ValidationReport:
+        """
+        Build a full report from the cached results.
+        
+        Returns:
+            Report with every issue located by question number, and the
+            structure if there were no errors
+        """
+        issues: List[Issue] = []
+        parsed: List[Question] = []
+        
+        for number, check in enumerate(self.checks, start=1):
+            location = f"Question {number}"
+            issues.extend(
+                issue._replace(location=f"{location}, {issue.location}" if issue.location else location)
+                for issue in check.issues
+            )
+            if check.question is not None:
+                parsed.append(check.question._replace(number=number))
+        
+        return self.validator.finish(issues, parsed, self.invalid > 0)
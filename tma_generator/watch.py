@@ -0,0 +1,299 @@
+"""
+Watch mode for the TMA LaTeX Generator.
+
+Watches a generated project and recompiles only the question whose files
+changed. Saved files are mapped to their question through the include
+graph of the project (main file -> q3.tex -> q3a.tex -> q3a_1.tex), read
+from the files themselves so edits to the structure are picked up, and
+the question is rebuilt with a focused \\includeonly build. Changes to the
+main file or a style file rebuild the whole document.
+
+The project folder is polled with one os.scandir() per interval, which
+costs microseconds for a few hundred files and works on every platform
+and on network drives. Editors often write a file several times per save
+(or save several files at once), so changes are collected until the
+folder has been quiet for a short settle time and then built together.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .compile import ENGINE_PDFLATEX, CompileResult
+from .core import QUESTION_PREFIX, TEX_EXTENSION
+from .focus import FocusCompiler, QUESTION_FILE_PATTERN
+from .log import LogSink, StreamLogSink
+from .preview import included_files
+
+
+# Polling and coalescing of saves
+POLL_INTERVAL_SECONDS = 0.25
+SETTLE_SECONDS = 0.3
+
+# Files whose changes trigger a build; the compile's own output never does
+WATCHED_SUFFIXES = (TEX_EXTENSION, ".sty")
+
+# File state: (modification time in ns, size)
+FileState = Tuple[int, int]
+
+
+def include_graph(folder: str, basename: str) -> Dict[str, str]:
+    """
+    Map every file a project's questions include to its question.
+    
+    Args:
+        folder: Project folder
+        basename: Main document basename (without .tex)
+    
+    Returns:
+        Path relative to the folder -> question file stem, e.g.
+        {'q3.tex': 'q3', 'q3a.tex': 'q3', 'q3a_1.tex': 'q3'}
+    
+    Raises:
+        OSError: If the main file cannot be read
+    """
+    root = Path(folder)
+    graph: Dict[str, str] = {}
+    stack: List[Tuple[str, str]] = [
+        (name, Path(name).stem)
+        for name in included_files((root / (basename + TEX_EXTENSION)).read_bytes())
+        if QUESTION_FILE_PATTERN.match(Path(name).stem)
+    ]
+    while stack:
+        name, question = stack.pop()
+        if name in graph:
+            continue
+        graph[name] = question
+        try:
+            data = (root / name).read_bytes()
+        except OSError:
+            continue
+        stack.extend((child, question) for child in included_files(data) if child not in graph)
+    return graph
+
+
+class BuildPlan(NamedTuple):
+    """What a batch of changed files needs rebuilt."""
+    
+    full: bool
+    questions: Tuple[str, ...]
+
+
+class ProjectWatcher:
+    """Recompile the questions of a project as their files are saved."""
+    
+    def __init__(
+        self,
+        compiler: FocusCompiler,
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+        settle: float = SETTLE_SECONDS,
+        quiet: bool = False,
+        log: Optional[LogSink] = None
+    ) -> None:
+        """
+        Initialize watcher.
+        
+        Args:
+            compiler: Focus compiler for the project
+            poll_interval: Seconds between scans of the project folder
+            settle: Quiet seconds after the last change before building
+            quiet: Only report failed builds
+            log: Destination for build results (default: text on stdout/stderr)
+        
+        Raises:
+            OSError: If the main file cannot be read
+        """
+        self.compiler = compiler
+        self.folder = compiler.folder
+        self.main_file = compiler.main_file.name
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self.quiet = quiet
+        self.log = log or StreamLogSink()
+        self.graph = include_graph(str(self.folder), compiler.basename)
+        self.builds = 0
+    
+    def snapshot(self) -> Dict[str, FileState]:
+        """
+        Read the state of every watched file.
+        
+        Returns:
+            Path relative to the folder -> (mtime_ns, size)
+        """
+        state = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if entry.name.endswith(WATCHED_SUFFIXES):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    state[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        # Included files in subfolders
+        for name in self.graph:
+            if "/" in name:
+                try:
+                    stat = os.stat(self.folder / name)
+                except OSError:
+                    continue
+                state[name] = (stat.st_mtime_ns, stat.st_size)
+        return state
+    
+    @staticmethod
+    def changed(before: Dict[str, FileState], after: Dict[str, FileState]) -> Set[str]:
+        """
+        Compare two snapshots.
+        
+        Args:
+            before: Earlier snapshot
+            after: Later snapshot
+        
+        Returns:
+            Paths created, modified or deleted in between
+        """
+        return {
+            name for name in before.keys() | after.keys() if before.get(name) != after.get(name)
+        }
+    
+    def plan(self, changed: Iterable[str]) -> BuildPlan:
+        """
+        Work out what to rebuild for a batch of changed files.
+        
+        The include graph is re-read first, so files added to a question
+        since the last build are mapped to it.
+        
+        Args:
+            changed: Changed paths relative to the project folder
+        
+        Returns:
+            Whether to rebuild the whole document, and otherwise the
+            questions to rebuild in document order
+        """
+        changed = set(changed)
+        if self.main_file in changed or any(name.endswith(".sty") for name in changed):
+            return BuildPlan(True, ())
+        try:
+            self.graph = include_graph(str(self.folder), self.compiler.basename)
+        except OSError:
+            return BuildPlan(True, ())
+        
+        questions = {self.graph[name] for name in changed if name in self.graph}
+        return BuildPlan(False, tuple(sorted(
+            questions, key=lambda question: int(question[len(QUESTION_PREFIX):])
+        )))
+    
+    def build(self, plan: BuildPlan) -> List[CompileResult]:
+        """
+        Rebuild what a plan needs and report each result.
+        
+        Args:
+            plan: Result of plan()
+        
+        Returns:
+            Result of each compile
+        """
+        results = []
+        if plan.full:
+            result = self.compiler.compiler.compile(str(self.folder), self.compiler.basename)
+            self._report(self.compiler.basename + ".pdf", result)
+            results.append(result)
+        for question in plan.questions:
+            try:
+                result = self.compiler.compile(question, log=None if self.quiet else self.log)
+            except (OSError, ValueError) as error:
+                self.log.warning(f"{question}: {error}")
+                continue
+            self._report(self.compiler.jobname(question) + ".pdf", result)
+            results.append(result)
+        self.builds += len(results)
+        self.log.flush()
+        return results
+    
+    def _report(self, pdf: str, result: CompileResult) -> None:
+        """Log one compile result."""
+        if result.ok:
+            if self.quiet:
+                return
+            pages = f"{result.pages} pages" if result.pages is not None else "no PDF"
+            self.log.info(f"{time.strftime('%H:%M:%S')} {pdf}: {pages} in {result.seconds:.2f}s")
+        else:
+            self.log.warning(f"{time.strftime('%H:%M:%S')} {pdf} FAILED "
+                             f"(exit code {result.returncode}): {result.error}")
+    
+    def run(
+        self,
+        stop: Optional[threading.Event] = None,
+        sleep: Callable[[float], object] = time.sleep
+    ) -> None:
+        """
+        Watch until stopped, building each settled batch of changes.
+        
+        Args:
+            stop: Event that ends the loop when set (default: run until interrupted)
+            sleep: Function used to wait between scans
+        """
+        stop = stop or threading.Event()
+        state = self.snapshot()
+        while not stop.is_set():
+            sleep(self.poll_interval)
+            current = self.snapshot()
+            changed = self.changed(state, current)
+            if not changed:
+                continue
+            
+            # Coalesce a burst of saves: wait until the folder is quiet
+            quiet_since = time.monotonic()
+            while not stop.is_set() and time.monotonic() - quiet_since < self.settle:
+                sleep(self.poll_interval)
+                latest = self.snapshot()
+                more = self.changed(current, latest)
+                if more:
+                    changed |= more
+                    current = latest
+                    quiet_since = time.monotonic()
+            state = current
+            
+            plan = self.plan(changed)
+            if plan.full or plan.questions:
+                self.build(plan)
+
+
+def run_watch(
+    folder: str,
+    engine: Optional[str] = None,
+    quiet: bool = False,
+    log: Optional[LogSink] = None
+) -> int:
+    """
+    Watch a generated project until interrupted, recompiling changed questions.
+    
+    Args:
+        folder: Project folder
+        engine: TeX engine (default: pdflatex)
+        quiet: Only report failed builds
+        log: Destination for build results (default: text on stdout/stderr)
+    
+    Returns:
+        Process exit code (0 when stopped with Ctrl+C, 2 if no compiler or
+        main file)
+    """
+    log = log or StreamLogSink()
+    try:
+        compiler = FocusCompiler(folder, engine=engine or ENGINE_PDFLATEX)
+        watcher = ProjectWatcher(compiler, quiet=quiet, log=log)
+    except (OSError, ValueError) as error:
+        log.error(f"Watch Error: {error}")
+        log.flush()
+        return 2
+    
+    questions = len(set(watcher.graph.values()))
+    log.info(f"Watching {folder} ({questions} questions); press Ctrl+C to stop")
+    log.flush()
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        log.info(f"Stopped watching after {watcher.builds} builds")
+        log.flush()
+    return 0